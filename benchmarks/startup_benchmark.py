@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Startup time regression benchmark.
+
+Imports testipy.run in a fresh interpreter several times and fails (exit code 1) if:
+  - any of the heavy modules, that must only be imported on first use, was imported
+  - the median import time is above --max-ms
+
+usage: python benchmarks/startup_benchmark.py [--runs 10] [--max-ms 400]
+"""
+
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+
+
+ROOT_FOLDER = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# modules only needed by some reporters, or when a test uses a browser, a DataFrame or a table
+LAZY_MODULES = ["pandas", "playwright", "tabulate", "pyfiglet", "mss", "flask", "xlsxwriter", "http.server"]
+
+_CODE = f"""
+import sys, json, time
+t = time.perf_counter()
+import testipy.run
+elapsed = time.perf_counter() - t
+print(json.dumps({{"elapsed": elapsed, "loaded": [m for m in {LAZY_MODULES!r} if m in sys.modules]}}))
+"""
+
+
+def measure_once() -> dict:
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([ROOT_FOLDER, os.environ.get("PYTHONPATH", "")]))
+    out = subprocess.run([sys.executable, "-c", _CODE], env=env, capture_output=True, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="testipy startup time benchmark")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--max-ms", type=float, default=400.0)
+    args = parser.parse_args()
+
+    results = [measure_once() for _ in range(args.runs)]
+    times_ms = [r["elapsed"] * 1000.0 for r in results]
+    loaded = sorted(set(m for r in results for m in r["loaded"]))
+    median_ms = statistics.median(times_ms)
+
+    print(f"import testipy.run: median {median_ms:.1f}ms, min {min(times_ms):.1f}ms, max {max(times_ms):.1f}ms ({args.runs} runs)")
+
+    failed = False
+    if loaded:
+        print(f"FAIL: imported at startup {loaded}")
+        failed = True
+    if median_ms > args.max_ms:
+        print(f"FAIL: median {median_ms:.1f}ms above {args.max_ms:.1f}ms")
+        failed = True
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -31,6 +31,7 @@ extras_require = {
     "dev": [
         "pre-commit>=2.21",
         "flake8>=3.9",
+        "pytest>=7.0",
     ]
 }
 
@@ -45,7 +46,7 @@ setuptools.setup(
     long_description_content_type="text/markdown",
     url="https://github.com/pjn2work/testipy",
     setup_requires=["wheel"],
-    packages=setuptools.find_namespace_packages(include=("*",)),
+    packages=setuptools.find_namespace_packages(include=("*",), exclude=("tests", "tests.*")),
     include_package_data=True,
     install_requires=install_requires,
     extras_require=extras_require,
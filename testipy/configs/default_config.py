@@ -1,6 +1,6 @@
 import os
 
-from testipy.configs.enums_data import STATE_PASSED, STATE_FAILED
+from testipy.configs.enums_data import STATE_PASSED, STATE_FAILED, STATE_FAILED_KNOWN_BUG
 
 # run.py
 default_project_name = "local"
@@ -10,6 +10,9 @@ default_foldername_separator = "_"
 tests_build_filename = "build.json"
 execution_log_filename = "testipy_exe.log"
 execution_prof_filename = "testipy_exe.prof"
+intro_cache_filename = "intro_{}.txt"
+startup_profile_filename = "testipy_startup.txt"
+startup_profile_json_filename = "testipy_startup.json"
 
 # read_tests.py
 my_app_path = os.path.dirname(os.path.dirname(__file__))
@@ -22,11 +25,58 @@ trim_prefix_suite = True
 trim_prefix_tests = True
 separator_package = "."
 separator_and_join_tags = "&"
+discovery_engine = "import"  # import or ast
+discovery_workers = 1
+
+# read_tests_cache.py
+default_cache_folder = os.path.join(os.path.expanduser("~"),  "testipy", "cache")
+discovery_cache_filename = "discovery_{}.cache"
 
 # execute_tests.py
 if_no_test_started_mark_as = STATE_PASSED
 count_as_failed_states = [STATE_FAILED]
 suite_threads = 1
+package_threads = 1
+suite_processes = 1
+suite_processes_start_method = "spawn"  # spawn, forkserver or fork
+suite_processes_recycle = 0  # suites a -sp worker process runs before it is replaced by a new one (0 is never)
+suite_processes_max_rss = 0  # MB of memory a -sp worker process can use, or it is replaced after its suite (killed if still running it), 0 is no limit
+async_concurrency = 100
+test_method_timeout = 0  # seconds, default @TIMEOUT of test methods (0 is no timeout)
+maxfail = 0  # failed tests after which the remaining ones are skipped (0 is never), --fail-fast is 1
+timeout_grace = 5.0  # seconds a timed out test method has to stop, before its suite is left behind (or its -sp worker killed)
+
+# suite_history.py
+suite_history_filename = "suite_durations.json"
+suite_history_folder = ""  # folder of suite_durations.json, to share it (ex: the tests folder, for -shard); empty is default_cache_folder, unless on the tests folder
+suite_history_weight = 0.5  # of the last run, when averaging with the recorded duration
+shard_report_filename = "shard_report.txt"
+test_method_duration_estimate = 1.0  # seconds, of a test method with no recorded duration, to order the suites to run
+
+# read_tests_rerun.py
+results_tests_filename = "results_tests.json"  # state of each test, to be read by -rerun-failed
+rerun_failed_states = [STATE_FAILED, STATE_FAILED_KNOWN_BUG]
+
+# result_cache.py
+result_cache = False  # skip the test methods unchanged since they passed, also with --cache-results, never with --no-cache
+result_cache_filename = "results_{}.json"
+result_cache_data_extensions = (".json", ".yaml", ".yml", ".csv", ".txt", ".xml", ".xlsx")  # files named on the suite file that are part of the fingerprint
+result_cache_never_tags = ["SETUP", "TEARDOWN"]  # test methods always called, other test methods may need what they do
+
+# test_impact.py
+test_impact_filename = "test_impact.json"  # files and functions called by each test method, saved with --record-impact, read by -affected-by
+
+# run_journal.py
+journal = False  # every event of the run appended to the journal of its results folder, to be continued with -resume, also with --journal
+journal_filename = "journal.bin"
+journal_sync_interval = 0.5  # most seconds an event waits on the journal before it is flushed and synced to disk
+journal_sync_events = 500  # or events waiting, whatever comes first
+
+# execute_tests_distributed.py
+distributed_port = 5757
+distributed_connect_timeout = 60  # seconds a worker keeps trying to connect to the coordinator
+distributed_worker_wait = 300  # seconds the coordinator waits with no workers connected, before failing the remaining suites
+distributed_task_attempts = 3  # times a suite is sent to a worker, when workers are lost
 
 # report_base.py
 separator_package_suite_test = "/"
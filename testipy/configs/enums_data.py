@@ -9,6 +9,9 @@ TAG_TESTNUMBER  = PREFIX_TAGS + "TN"
 TAG_DEPENDS     = PREFIX_TAGS + "DEPENDS"
 TAG_ON_SUCCESS  = PREFIX_TAGS + "ON_SUCCESS"
 TAG_ON_FAILURE  = PREFIX_TAGS + "ON_FAILURE"
+TAG_PARALLEL    = PREFIX_TAGS + "PARALLEL"
+TAG_TIMEOUT     = PREFIX_TAGS + "TIMEOUT"
+TAG_FIXTURES    = PREFIX_TAGS + "FIXTURES"
 
 STATE_PASSED            = "PASS"
 STATE_SKIPPED           = "SKIP"
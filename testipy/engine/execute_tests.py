@@ -1,23 +1,37 @@
 from __future__ import annotations
 import os
+import time
+import inspect
+import threading
 import traceback
+import contextlib
+import contextvars
 import concurrent.futures
 
-from typing import List, TYPE_CHECKING
+from collections import deque
+from typing import Callable, Deque, Dict, List, Set, Tuple, TYPE_CHECKING
 
 from testipy import get_exec_logger
 from testipy.configs import enums_data, default_config
 from testipy.lib_modules import common_methods as cm
 from testipy.lib_modules.common_methods import synchronized
+from testipy.lib_modules.async_runner import async_runner
+from testipy.lib_modules.watchdog import watchdog, raise_in_thread, clear_raised_in_this_thread
 from testipy.lib_modules.state_counter import StateCounter
 from testipy.lib_modules.textdecor import color_state
 from testipy.lib_modules.start_arguments import StartArguments
 from testipy.helpers.prettify import format_duration
 from testipy.helpers.handle_assertions import ExpectedError
+from testipy.helpers.errors import TestTimeoutError
+from testipy.helpers.fixtures import FixtureScope, SCOPE_PACKAGE, SCOPE_SUITE, session_fixtures
+from testipy.engine.suite_history import SuiteHistory, get_suite_key, get_method_key, get_suite_history_filename, get_expected_method_duration, sort_longest_first
 
 if TYPE_CHECKING:
-    from testipy.models import PackageAttr, SuiteAttr, TestMethodAttr, SuiteDetails, TestDetails
+    from testipy.models import PackageAttr, SuiteAttr, TestMethodAttr, PackageDetails, SuiteDetails, TestDetails
     from testipy.reporter.report_manager import ReportManager
+    from testipy.engine.result_cache import ResultCache
+    from testipy.engine.test_impact import ImpactRecorder
+    from testipy.engine.run_journal import RunJournal, ResumedRun
 
 
 _exec_logger = get_exec_logger()
@@ -25,11 +39,19 @@ _exec_logger = get_exec_logger()
 
 class ExecutionProgress:
 
-    def __init__(self, total_methods_to_call):
+    def __init__(self, total_methods_to_call, maxfail: int = 0, journal: RunJournal = None):
         self.total_methods_to_call = total_methods_to_call
         self.percent_completed = 0.0
         self.method_seq = 0
 
+        # each test method that ended (with all its tests) is recorded, for -resume
+        self.journal = journal
+
+        # -maxfail (--fail-fast), once reached the test methods not called yet are skipped with the stop_reason
+        self.maxfail = maxfail
+        self.total_failed = 0
+        self.stop_reason = ""
+
     @synchronized
     def inc(self):
         self.method_seq += 1
@@ -38,7 +60,7 @@ class ExecutionProgress:
         return self.method_seq * 100 / self.total_methods_to_call
 
     @synchronized
-    def method_progress(self, state: str, duration: float, total_failed: int, total: int, test_method_attr: TestMethodAttr, ros: str):
+    def method_progress(self, state: str, duration: float, total_failed: int, total: int, test_method_attr: TestMethodAttr, ros: str, sd: SuiteDetails = None):
         suite_attr: SuiteAttr = test_method_attr.suite_attr
         package_attr: PackageAttr = suite_attr.package
         _exec_logger.info("{:<26} {:3.0f}% {} ({}/{}) {}/{} - {}({}) | {}".format(
@@ -50,88 +72,493 @@ class ExecutionProgress:
             test_method_attr.method_name[len(default_config.prefix_tests):], test_method_attr.method_id,
             ros[:70]))
 
+        if self.journal is not None and sd is not None:
+            self.journal.end_method(test_method_attr, sd)
+
+        self.total_failed += total_failed
+        if self.maxfail and not self.stop_reason and self.total_failed >= self.maxfail:
+            self.stop_reason = get_stop_reason(self.maxfail)
+            _exec_logger.warning(f"Stopping, {self.total_failed} failed tests reached -maxfail {self.maxfail}, the remaining tests are skipped")
+
+
+class _SuiteRun:
+    """
+    A suite running on its own thread, supervised by the thread that started it (see Executer._execute_suite), that
+    stops waiting for it when its @TIMEOUT is over, or when a timed out test method doesn't stop after timeout_grace.
+    """
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.sd: SuiteDetails = None
+        self.watches: Set[_MethodWatch] = set()
+        self.started: Set[int] = set()
+        self.ended: Set[int] = set()
+        self.timeout_reason = ""
+        self.timed_out_at = 0.0
+        self.abandoned = False
+        self.error: BaseException = None
+
+    def start_cycle(self, sd: SuiteDetails):
+        with self.lock:
+            self.sd = sd
+            self.started.clear()
+            self.ended.clear()
+
+    # returns bool, if the suite ended (it was not left behind)
+    def end_cycle(self, rm: ReportManager, sd: SuiteDetails) -> bool:
+        with self.lock:
+            if self.abandoned:
+                return False
+            rm.end_suite(sd)
+            self.sd = None
+            return True
+
+    # returns bool, if the test method can be called (the suite was not left behind)
+    def start_method(self, test_method_attr: TestMethodAttr) -> bool:
+        with self.lock:
+            self.started.add(id(test_method_attr))
+            return not self.abandoned
+
+    # returns bool, if the test method can still report its state (the suite was not left behind)
+    def end_method(self, test_method_attr: TestMethodAttr) -> bool:
+        with self.lock:
+            self.ended.add(id(test_method_attr))
+            return not self.abandoned
+
+    def add_watch(self, watch: _MethodWatch):
+        with self.lock:
+            self.watches.add(watch)
+
+    def remove_watch(self, watch: _MethodWatch):
+        with self.lock:
+            self.watches.discard(watch)
+
+    # the test methods running fail, and the next ones will not be called
+    def expire(self, reason: str):
+        with self.lock:
+            self.timeout_reason = reason
+            self.timed_out_at = time.perf_counter()
+            watches = list(self.watches)
+        for watch in watches:
+            watch.handle.fire()
+
+    # returns bool, if a timed out test method (or the timed out suite) didn't stop after timeout_grace
+    def is_stuck(self) -> bool:
+        limit = time.perf_counter() - default_config.timeout_grace
+        with self.lock:
+            if self.timed_out_at and self.timed_out_at < limit:
+                return True
+            return any(watch.in_method and watch.handle.is_fired() and watch.handle.fired_at < limit for watch in self.watches)
+
+
+class _MethodWatch:
+    """
+    One call of a test method, watched with its @TIMEOUT (or -timeout). When the time is over, or the suite @TIMEOUT,
+    the tests of that call fail at once, and the call is cancelled: a coroutine is cancelled, and on a thread a
+    TestTimeoutError is raised when it runs python code again (not while blocked on C code, that's why its suite
+    is supervised).
+    """
+
+    def __init__(self, test_method_attr: TestMethodAttr, sd: SuiteDetails, rm: ReportManager, number_tests_created_before_call: int, timeout: float, suite_run: _SuiteRun):
+        self.test_method_attr = test_method_attr
+        self.sd = sd
+        self.rm = rm
+        self.number_tests_created_before_call = number_tests_created_before_call
+        self.suite_run = suite_run
+        self.thread_ident = threading.get_ident()
+        self.in_method = True
+        self.reason = ""
+        self._cancel_call: Callable = None
+        # if a TestTimeoutError was raised on the thread of the call, to be cleared on leave() if it didn't land yet
+        self._raised = False
+
+        self.handle = watchdog.watch(timeout or None, self._on_timeout)
+        if suite_run is not None:
+            suite_run.add_watch(self)
+
+    # to cancel the call instead of raising on its thread, called at once if already timed out
+    def set_cancel_call(self, cancel_call: Callable):
+        with self.handle.lock:
+            self._cancel_call = cancel_call
+            if self.handle.is_fired() and self.in_method:
+                cancel_call()
+
+    # called by the watchdog (or by expire), holding the handle lock
+    def _on_timeout(self):
+        self.reason = (self.suite_run and self.suite_run.timeout_reason) or f"Timeout after {self.handle.timeout:g}s"
+        ex = TestTimeoutError(self.reason)
+        method_id = self.test_method_attr.method_id
+
+        if self.number_tests_created_before_call == self.sd.get_total_tests_by_meid(method_id):
+            _ = self.rm.startTest(self.sd, self.test_method_attr, usecase="AUTO-CREATED")
+        for current_test in list(self.sd.get_tests_running_by_meid(method_id)):
+            self.rm.testFailed(current_test, reason_of_state=self.reason, exc_value=ex)
+
+        if self.in_method:
+            if self._cancel_call is not None:
+                self._cancel_call()
+            else:
+                self._raised = raise_in_thread(self.thread_ident, TestTimeoutError)
+
+    # on the event loop, so it's not cancelled after the test method ended
+    def cancel_task(self, task):
+        if self.in_method:
+            task.cancel()
+
+    # returns bool, if the call timed out, can be called more than once
+    def leave(self) -> bool:
+        try:
+            with self.handle.lock:
+                self.in_method = False
+                timed_out = not self.handle.cancel()
+                if self._raised:
+                    # the watchdog already fired, so it won't be raised again
+                    clear_raised_in_this_thread()
+        except TestTimeoutError:
+            # raised on this thread by the watchdog, just before
+            self.in_method = False
+            timed_out = True
+
+        if self.suite_run is not None:
+            self.suite_run.remove_watch(self)
+        return timed_out
+
+    # returns TestTimeoutError, with the reason, if the call timed out
+    def get_error(self) -> TestTimeoutError:
+        return TestTimeoutError(self.reason) if self.handle.is_fired() else None
+
 
 class Executer:
 
-    def __init__(self, full_path_tests_scripts_foldername, debug_testipy: bool = False):
+    def __init__(
+            self, full_path_tests_scripts_foldername, debug_testipy: bool = False, test_method_timeout: float = 0.0, maxfail: int = 0,
+            result_cache: ResultCache = None, impact_recorder: ImpactRecorder = None,
+            journal: RunJournal = None, resumed_run: ResumedRun = None
+    ):
         self._current_method_execution_id = 0
         self._total_failed_skipped = 0
         cm.TESTS_ROOT_FOLDER = full_path_tests_scripts_foldername
+        self._full_path_tests_scripts_foldername = full_path_tests_scripts_foldername
         self._debug_testipy = debug_testipy
 
+        # -timeout, for the test methods without @TIMEOUT
+        self.test_method_timeout = test_method_timeout
+        self._suite_runs: Dict[int, _SuiteRun] = dict()
+
+        # -maxfail, for the ExecutionProgress of each run
+        self.maxfail = maxfail
+
+        # seconds each suite and test method took, by their key, once for each time they ran (package cycles, storyboards)
+        self.durations: Dict[str, List[float]] = dict()
+        self._history: SuiteHistory = None
+
+        # --cache-results, the test methods that passed and are unchanged are not called
+        self.result_cache = result_cache
+
+        # --record-impact, the files and functions called by each test method
+        self.impact_recorder = impact_recorder
+
+        # the test methods that ended are recorded on the journal, and the ones that ended on the run being resumed
+        # (-resume) are not called, their tests are reported again
+        self.journal = journal
+        self.resumed_run = resumed_run
+
+        # package fixtures of each package cycle running, by the id of its PackageDetails, torn down when it ends
+        self._package_fixtures: Dict[int, FixtureScope] = dict()
+
     def get_total_failed_skipped(self) -> int:
         return self._total_failed_skipped
 
-    def _execute_parallel(self, rm: ReportManager, selected_tests: List[PackageAttr], dryrun_mode=True, debug_code=False, onlyonce=False, suite_threads=1):
-        ep = ExecutionProgress(_get_total_runs_of_selected_methods(selected_tests))
+    # returns dict, with the average seconds each suite and test method took
+    def get_average_durations(self) -> Dict[str, float]:
+        return {key: sum(key_durations) / len(key_durations) for key, key_durations in self.durations.items()}
+
+    @synchronized
+    def add_durations(self, durations: Dict[str, List[float]]):
+        for key, key_durations in durations.items():
+            self.durations.setdefault(key, []).extend(key_durations)
 
-        def _process_suite(suite_attr: SuiteAttr):
-            for _ in range(1 if onlyonce else suite_attr.ncycles):
-                sd = rm.startSuite(pd, suite_attr)
+    # returns SuiteHistory, with the durations recorded by the previous runs, only read when needed
+    @synchronized
+    def get_history(self) -> SuiteHistory:
+        if self._history is None:
+            self._history = SuiteHistory(get_suite_history_filename(self._full_path_tests_scripts_foldername))
+        return self._history
+
+    def _execute_suite(self, rm: ReportManager, pd: PackageDetails, suite_attr: SuiteAttr, dryrun_mode: bool, debug_code: bool, onlyonce: bool, ep: ExecutionProgress):
+        started = time.perf_counter()
+        with self._record_impact(get_suite_key(suite_attr)):
+            if self._has_timeout(suite_attr) and not dryrun_mode and not debug_code:
+                self._execute_suite_supervised(rm, pd, suite_attr, onlyonce, ep)
+            else:
+                self._execute_suite_cycles(rm, pd, suite_attr, dryrun_mode, debug_code, onlyonce, ep)
+        self.add_durations({get_suite_key(suite_attr): [time.perf_counter() - started]})
 
-                # initialize suite __init__()
-                try:
-                    suite_attr.app = suite_attr.suite_obj(**suite_attr.suite_kwargs)
-                    _error = None
-                except Exception as ex:
-                    _error = ex
+    # returns FixtureScope, of the package cycle, created for its first suite
+    @synchronized
+    def _get_package_fixtures(self, pd: PackageDetails) -> FixtureScope:
+        if id(pd) not in self._package_fixtures:
+            self._package_fixtures[id(pd)] = FixtureScope(SCOPE_PACKAGE, pd.get_name(), session_fixtures)
+        return self._package_fixtures[id(pd)]
+
+    def teardown_package_fixtures(self, pd: PackageDetails):
+        fixtures = self._package_fixtures.pop(id(pd), None)
+        if fixtures is not None:
+            fixtures.teardown()
+
+    # returns context manager, recording the calls made inside for that suite or test method key, with --record-impact
+    def _record_impact(self, key: str):
+        return self.impact_recorder.record(key) if self.impact_recorder is not None else contextlib.nullcontext()
+
+    # returns bool, if the suite or any of its test methods has a @TIMEOUT (or -timeout was given)
+    def _has_timeout(self, suite_attr: SuiteAttr) -> bool:
+        return bool(suite_attr.timeout or self.test_method_timeout or any(ma.timeout for ma in suite_attr.test_method_attr_list))
+
+    # the suite runs on its own thread, so this one can always stop waiting for it, and the run ends in bounded time
+    def _execute_suite_supervised(self, rm: ReportManager, pd: PackageDetails, suite_attr: SuiteAttr, onlyonce: bool, ep: ExecutionProgress):
+        run = self._suite_runs[id(suite_attr)] = _SuiteRun()
+
+        def _run_suite():
+            try:
+                self._execute_suite_cycles(rm, pd, suite_attr, False, False, onlyonce, ep)
+            except BaseException as ex:
+                run.error = ex
+
+        thread = threading.Thread(target=contextvars.copy_context().run, args=(_run_suite,), name=f"testipy-suite-{suite_attr.name}", daemon=True)
+        thread.start()
+        started = time.perf_counter()
+        time_limit = get_suite_time_limit(suite_attr, self.test_method_timeout)
+        try:
+            while thread.is_alive():
+                thread.join(0.2)
+                elapsed = time.perf_counter() - started
+                if suite_attr.timeout and not run.timeout_reason and elapsed >= suite_attr.timeout:
+                    run.expire(f"Suite timeout after {suite_attr.timeout:g}s")
+                # also when stuck on setup_suite or teardown_suite, that have no timeout of their own
+                if thread.is_alive() and (run.is_stuck() or time_limit and elapsed > time_limit + default_config.timeout_grace):
+                    self._abandon_suite(run, rm, ep)
+                    break
+        finally:
+            del self._suite_runs[id(suite_attr)]
+
+        if run.error is not None:
+            raise run.error
+
+    # the test methods of the suite that didn't end fail, and the suite ends, while its thread is left behind
+    def _abandon_suite(self, run: _SuiteRun, rm: ReportManager, ep: ExecutionProgress):
+        reason = f"Not run, suite left behind {default_config.timeout_grace:g}s after its timeout"
+        with run.lock:
+            run.abandoned = True
+            sd = run.sd
+            if sd is None:
+                return
+
+            for test_method_attr in sd.suite_attr.test_method_attr_list:
+                if id(test_method_attr) in run.ended:
+                    continue
+                if id(test_method_attr) not in run.started:
+                    ep.inc()
 
+                if sd.get_total_tests_by_meid(test_method_attr.method_id) == 0:
+                    _ = rm.startTest(sd, test_method_attr, usecase="AUTO-CREATED")
+                for current_test in list(sd.get_tests_running_by_meid(test_method_attr.method_id)):
+                    rm.testFailed(current_test, reason_of_state=reason, exc_value=TestTimeoutError(reason))
+                self._calculate_state_for_all_tests_under_this_method(sd, test_method_attr, TestTimeoutError(reason), ep)
+
+            rm.end_suite(sd)
+        _exec_logger.error(f"{sd.get_full_name()} left behind, its thread didn't stop {default_config.timeout_grace:g}s after its timeout")
+
+    def _execute_suite_cycles(self, rm: ReportManager, pd: PackageDetails, suite_attr: SuiteAttr, dryrun_mode: bool, debug_code: bool, onlyonce: bool, ep: ExecutionProgress):
+        run = self._suite_runs.get(id(suite_attr))
+        for _ in range(1 if onlyonce else suite_attr.ncycles):
+            sd = rm.startSuite(pd, suite_attr)
+            cm.set_current_package_folder(sd.get_package_folder())
+            if run is not None:
+                run.start_cycle(sd)
+
+            # initialize suite __init__() and setup_suite(), unless all its test methods will be skipped by -maxfail, or were resumed
+            _error = None
+            stopped = bool(ep.stop_reason) or (self.resumed_run is not None and self.resumed_run.has_suite(sd))
+            fixtures = FixtureScope(SCOPE_SUITE, sd.get_full_name(), self._get_package_fixtures(pd))
+            try:
+                if not stopped:
+                    # the suite module is imported first, so the fixtures it defines (or imports) are known
+                    suite_obj = suite_attr.suite_obj
+                    suite_attr.app = suite_obj(**{**fixtures.get_all(suite_attr.fixtures), **suite_attr.suite_kwargs})
+                    _call_suite_hook(suite_attr.app, "setup_suite", sd, rm)
+            except Exception as ex:
+                _error = ex
+
+            if suite_attr.parallel > 1 and not debug_code:
+                self._call_test_methods_parallel(sd, rm, dryrun_mode, debug_code, onlyonce, ep, _error)
+            else:
                 for test_method_attr in suite_attr.test_method_attr_list:
                     ep.inc()
                     self._call_test_method(test_method_attr, sd, rm, dryrun_mode, debug_code, onlyonce, ep, _error)
 
-                suite_attr.app = None
+            if _error is None and not stopped:
+                try:
+                    _call_suite_hook(suite_attr.app, "teardown_suite", sd, rm)
+                except Exception as ex:
+                    _exec_logger.error(f"{sd.get_full_name()} teardown_suite failed: {ex}")
+                    if debug_code:
+                        raise
+
+            suite_attr.app = None
+            fixtures.teardown()
 
+            cm.set_current_package_folder()
+            if run is None:
                 rm.end_suite(sd)
+            elif not run.end_cycle(rm, sd):
+                # already ended by _abandon_suite
+                return
+
+    # @PARALLEL suite, each test method starts as soon as all tests with the prios on its @DEPENDS (@ON_SUCCESS, @ON_FAILURE) have ended
+    # async test methods run on the event loop, the others on daemon threads (a test method left behind after its timeout
+    # doesn't keep the process alive), but never more than @PARALLEL at the same time
+    def _call_test_methods_parallel(self, sd: SuiteDetails, rm: ReportManager, dryrun_mode: bool, debug_code: bool, onlyonce: bool, ep: ExecutionProgress, _error: Exception):
+        suite_attr: SuiteAttr = sd.suite_attr
+        package_folder = sd.get_package_folder()
+        pending: Dict[int, TestMethodAttr] = {id(ma): ma for ma in suite_attr.test_method_attr_list}
+        waiting_for, dependents = _get_test_methods_dag(suite_attr)
+
+        def _process_test_method(test_method_attr: TestMethodAttr):
+            cm.set_current_package_folder(package_folder)
+            ep.inc()
+            try:
+                self._call_test_method(test_method_attr, sd, rm, dryrun_mode, debug_code, onlyonce, ep, _error)
+            finally:
+                cm.set_current_package_folder()
+
+        async def _process_async_test_method(test_method_attr: TestMethodAttr):
+            cm.set_current_package_folder(package_folder)
+            ep.inc()
+            await self._call_test_method_async(test_method_attr, sd, rm, dryrun_mode, debug_code, onlyonce, ep, _error)
+
+        running: Dict[concurrent.futures.Future, TestMethodAttr] = dict()
+        # the longest first, so the last ones to start are the shortest ones
+        history = self.get_history()
+        ready: Deque[TestMethodAttr] = deque(sorted(
+            (ma for ma in pending.values() if waiting_for[id(ma)] == 0),
+            key=lambda ma: -get_expected_method_duration(ma, history)))
+
+        def _submit_ready():
+            while ready and len(running) < suite_attr.parallel:
+                test_method_attr = ready.popleft()
+                del pending[id(test_method_attr)]
+                if _is_async_test_method(suite_attr.app, test_method_attr):
+                    future = async_runner.submit(_process_async_test_method(test_method_attr))
+                else:
+                    future = _submit_to_daemon_thread(_process_test_method, test_method_attr)
+                running[future] = test_method_attr
+
+        _submit_ready()
+        while running or pending:
+            if not running and not ready:
+                # can't happen, circular @DEPENDS are refused when the tests are read (DependencyGraph.check_cycles)
+                waiting_str = ", ".join(f"{ma.method_name}(prio {ma.prio})" for ma in pending.values())
+                raise RuntimeError(f"Internal error on {sd.get_full_name()}, test methods waiting on each other: {waiting_str}")
+
+            done, _ = concurrent.futures.wait(running, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                test_method_attr = running.pop(future)
+                future.result()
+
+                for dependent in dependents.get(id(test_method_attr), []):
+                    waiting_for[id(dependent)] -= 1
+                    if waiting_for[id(dependent)] == 0 and id(dependent) in pending:
+                        ready.append(dependent)
+
+            _submit_ready()
+
+    def _execute_package_suites(
+            self, rm: ReportManager, pd: PackageDetails, package_attr: PackageAttr,
+            dryrun_mode: bool, debug_code: bool, onlyonce: bool, suite_threads: int, ep: ExecutionProgress
+    ):
+        if suite_threads > 1:
+            suite_attr_list = sort_longest_first(package_attr.suite_attr_list, self.get_history())
+            with concurrent.futures.ThreadPoolExecutor(max_workers=suite_threads) as executor:
+                tasks = {executor.submit(self._execute_suite, rm, pd, suite_attr, dryrun_mode, debug_code, onlyonce, ep): suite_attr for suite_attr in suite_attr_list}
+                concurrent.futures.wait(tasks)
+        else:
+            for suite_attr in package_attr.suite_attr_list:
+                self._execute_suite(rm, pd, suite_attr, dryrun_mode, debug_code, onlyonce, ep)
 
-        for package_attr in selected_tests:
-            for _ in range(1 if onlyonce else package_attr.ncycles):
+    # packages run in parallel, so the cwd is not changed, each suite has its own package folder instead
+    def _execute_parallel_packages(
+            self, rm: ReportManager, selected_tests: List[PackageAttr],
+            dryrun_mode=True, debug_code=False, onlyonce=False, suite_threads=1, package_threads=1
+    ):
+        ep = ExecutionProgress(_get_total_runs_of_selected_methods(selected_tests), self.maxfail, self.journal)
 
-                self._change_cwd_to_package(package_attr.package_name)
+        def _process_package(package_attr: PackageAttr):
+            for _ in range(1 if onlyonce else package_attr.ncycles):
                 pd = rm.startPackage(package_attr)
+                self._execute_package_suites(rm, pd, package_attr, dryrun_mode, debug_code, onlyonce, suite_threads, ep)
+                self.teardown_package_fixtures(pd)
+                rm.end_package(pd)
 
-                with concurrent.futures.ThreadPoolExecutor(max_workers=suite_threads) as executor:
-                    tasks = {executor.submit(_process_suite, suite_attr): suite_attr for suite_attr in package_attr.suite_attr_list}
-                    concurrent.futures.wait(tasks)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=package_threads) as executor:
+            tasks = {executor.submit(_process_package, package_attr): package_attr for package_attr in selected_tests}
+            concurrent.futures.wait(tasks)
 
-                rm.end_package(pd)
+    def _execute_processes(self, rm: ReportManager, selected_tests: List[PackageAttr], dryrun_mode=True, debug_code=False, onlyonce=False, suite_processes=1):
+        from testipy.engine.execute_tests_process import SuiteProcessPool
 
-    def _execute_sequential(self, rm: ReportManager, selected_tests: List[PackageAttr], dryrun_mode=True, debug_code=False, onlyonce=False):
-        ep = ExecutionProgress(_get_total_runs_of_selected_methods(selected_tests))
+        ep = ExecutionProgress(_get_total_runs_of_selected_methods(selected_tests), self.maxfail, self.journal)
 
-        for package_attr in selected_tests:
-            for _ in range(1 if onlyonce else package_attr.ncycles):
+        with SuiteProcessPool(rm, suite_processes, self._debug_testipy, self.result_cache, self.impact_recorder, self.resumed_run) as pool:
+            for package_attr in selected_tests:
+                for _ in range(1 if onlyonce else package_attr.ncycles):
 
-                self._change_cwd_to_package(package_attr.package_name)
-                pd = rm.startPackage(package_attr)
+                    self._change_cwd_to_package(package_attr.package_name)
+                    pd = rm.startPackage(package_attr)
 
-                for suite_attr in package_attr.suite_attr_list:
-                    for _ in range(1 if onlyonce else suite_attr.ncycles):
+                    self._inc_failed(pool.execute_package(pd, package_attr, dryrun_mode, onlyonce, ep, sort_longest_first(package_attr.suite_attr_list, self.get_history())))
 
-                        sd = rm.startSuite(pd, suite_attr)
+                    rm.end_package(pd)
 
-                        # initialize suite __init__()
-                        try:
-                            suite_attr.app = suite_attr.suite_obj(**suite_attr.suite_kwargs)
-                            _error = None
-                        except Exception as ex:
-                            _error = ex
+        self.add_durations(pool.durations)
 
-                        for test_method_attr in suite_attr.test_method_attr_list:
-                            ep.inc()
-                            self._call_test_method(test_method_attr, sd, rm, dryrun_mode, debug_code, onlyonce, ep, _error)
+    def _execute_distributed(self, rm: ReportManager, selected_tests: List[PackageAttr], dryrun_mode=True, onlyonce=False, coordinator_address=""):
+        from testipy.engine.execute_tests_distributed import SuiteCoordinator, get_coordinator_key
 
-                        suite_attr.app = None
+        ep = ExecutionProgress(_get_total_runs_of_selected_methods(selected_tests), self.maxfail, self.journal)
 
-                        rm.end_suite(sd)
+        coordinator_key = get_coordinator_key(rm.get_ap())
+        with SuiteCoordinator(rm, coordinator_address, coordinator_key, self._debug_testipy,
+                              self.result_cache, self.impact_recorder, self.resumed_run) as coordinator:
+            self._inc_failed(coordinator.execute(selected_tests, dryrun_mode, onlyonce, ep))
+
+        self.add_durations(coordinator.durations)
+
+    def _execute_sequential(self, rm: ReportManager, selected_tests: List[PackageAttr], dryrun_mode=True, debug_code=False, onlyonce=False, suite_threads=1):
+        ep = ExecutionProgress(_get_total_runs_of_selected_methods(selected_tests), self.maxfail, self.journal)
+
+        for package_attr in selected_tests:
+            for _ in range(1 if onlyonce else package_attr.ncycles):
+
+                self._change_cwd_to_package(package_attr.package_name)
+                pd = rm.startPackage(package_attr)
+
+                self._execute_package_suites(rm, pd, package_attr, dryrun_mode, debug_code, onlyonce, suite_threads, ep)
+                self.teardown_package_fixtures(pd)
 
                 rm.end_package(pd)
 
-    def execute(self, rm: ReportManager, selected_tests: List[PackageAttr], dryrun_mode=True, debug_code=False, onlyonce=False, suite_threads=1):
-        if suite_threads > 1:
-            self._execute_parallel(rm, selected_tests, dryrun_mode, debug_code, onlyonce, suite_threads)
+    def execute(
+            self, rm: ReportManager, selected_tests: List[PackageAttr], dryrun_mode=True, debug_code=False, onlyonce=False,
+            suite_threads=1, suite_processes=1, package_threads=1, coordinator_address=""
+    ):
+        if coordinator_address:
+            self._execute_distributed(rm, selected_tests, dryrun_mode, onlyonce, coordinator_address)
+        elif suite_processes > 1 or _is_recycling_processes(rm.get_sa()):
+            self._execute_processes(rm, selected_tests, dryrun_mode, debug_code, onlyonce, suite_processes)
+        elif package_threads > 1:
+            self._execute_parallel_packages(rm, selected_tests, dryrun_mode, debug_code, onlyonce, suite_threads, package_threads)
         else:
-            self._execute_sequential(rm, selected_tests, dryrun_mode, debug_code, onlyonce)
+            self._execute_sequential(rm, selected_tests, dryrun_mode, debug_code, onlyonce, suite_threads)
 
     def _auto_close_single_test(self, rm: ReportManager, current_test: TestDetails, had_exception: Exception = None):
         if had_exception:
@@ -173,61 +600,171 @@ class Executer:
         duration = results.get_sum_time_laps()
         method_state, method_ros = results.get_state_by_severity()
 
-        ep.method_progress(method_state, duration, total_failed, total, test_method_attr, method_ros or "!")
-
-    def _call_test_method(self, test_method_attr: TestMethodAttr, sd: SuiteDetails, rm: ReportManager, dryrun_mode: bool, debug_code: bool, onlyonce: bool, ep: ExecutionProgress, _error: Exception):
-        had_exception = None
+        ep.method_progress(method_state, duration, total_failed, total, test_method_attr, method_ros or "!", sd)
 
+    # returns bool, if the test method will not be called (--dryrun, ended on the resumed run, -maxfail reached, suite init failed,
+    # suite timed out, @ON_SUCCESS or @ON_FAILURE not met, cached PASS)
+    def _skip_test_method(self, test_method_attr: TestMethodAttr, sd: SuiteDetails, rm: ReportManager, dryrun_mode: bool, _error: Exception, ep: ExecutionProgress) -> bool:
+        run = self._suite_runs.get(id(sd.suite_attr))
         if dryrun_mode:
             # if "--dryrun" was passed then will skip all tests execution
             rm.testSkipped(rm.startTest(sd, test_method_attr, usecase="dryrun"), reason_of_state="DRYRUN")
+        elif self.resumed_run is not None and self.resumed_run.replay_test_method(test_method_attr, sd, rm):
+            # its tests were reported again, as they ended on the run being resumed
+            pass
+        elif ep.stop_reason:
+            rm.testSkipped(rm.startTest(sd, test_method_attr, usecase="AUTO-CREATED"), reason_of_state=ep.stop_reason)
         elif _error:
             rm.testSkipped(rm.startTest(sd, test_method_attr, usecase="AUTO-CREATED"), reason_of_state=f"Init suite failed: {_error}", exc_value=_error)
             if self._debug_testipy:
                 raise _error
+        elif run is not None and run.timeout_reason:
+            rm.testFailed(rm.startTest(sd, test_method_attr, usecase="AUTO-CREATED"), reason_of_state=f"Not run, {run.timeout_reason}",
+                          exc_value=TestTimeoutError(run.timeout_reason))
         elif nok := _get_nok_on_success_or_on_failure(sd, test_method_attr):
             # get @ON_FAILURE or @ON_SUCCESS dependency
             rm.testSkipped(rm.startTest(sd, test_method_attr, usecase="AUTO-CREATED"), reason_of_state=nok)
+        elif self.result_cache is not None and (passed_at := self.result_cache.get_passed(test_method_attr)):
+            rm.testPassed(rm.startTest(sd, test_method_attr, usecase="CACHED"), reason_of_state=f"Cached PASS, unchanged since {passed_at}")
         else:
+            return False
+        return True
+
+    def _on_test_method_exception(
+            self, ex: Exception, test_method_attr: TestMethodAttr, sd: SuiteDetails, rm: ReportManager,
+            number_tests_created_before_call: int, debug_code: bool
+    ):
+        self._auto_close_all_open_tests_for_that_method(rm=rm, sd=sd, test_method_attr=test_method_attr,
+                                                        number_tests_created_before_call=number_tests_created_before_call, had_exception=ex)
+
+        # if "--debug_code" was given, then will stop all execution
+        if debug_code:
+            package_name = sd.package.name
+            suite_filename = sd.suite_attr.filename
+            suite_name = sd.suite_attr.suite_name
+            test_method_name = test_method_attr.method_name
+            test_method_id = test_method_attr.method_id
+            stack_trace = _get_stacktrace_string_for_tests(ex)
+
+            _exec_logger.critical(f"- {package_name}/{suite_filename} - {suite_name}.{test_method_name}({test_method_id}) needs review because: {ex}\n{stack_trace}")
+            raise ex
+
+    # returns _MethodWatch, for one call of the test method
+    def _watch_test_method(self, test_method_attr: TestMethodAttr, sd: SuiteDetails, rm: ReportManager, number_tests_created_before_call: int) -> _MethodWatch:
+        timeout = test_method_attr.timeout or self.test_method_timeout
+        return _MethodWatch(test_method_attr, sd, rm, number_tests_created_before_call, timeout, self._suite_runs.get(id(sd.suite_attr)))
+
+    # returns bool, if the test method can be called (its suite was not left behind by _abandon_suite)
+    def _start_test_method(self, test_method_attr: TestMethodAttr, sd: SuiteDetails) -> bool:
+        run = self._suite_runs.get(id(sd.suite_attr))
+        return run is None or run.start_method(test_method_attr)
+
+    # records if all tests of the test method passed, for the next runs with --cache-results
+    def _add_result_to_cache(self, test_method_attr: TestMethodAttr, sd: SuiteDetails, had_exception: Exception):
+        if self.result_cache is not None:
+            states = {current_test.get_state() for current_test in sd.get_tests_by_meid(test_method_attr.method_id)}
+            self.result_cache.add_result(test_method_attr, had_exception is None and states == {enums_data.STATE_PASSED})
+
+    def _end_test_method(self, test_method_attr: TestMethodAttr, sd: SuiteDetails, had_exception: Exception, ep: ExecutionProgress):
+        sd.set_current_test_method_attr(None)
+
+        run = self._suite_runs.get(id(sd.suite_attr))
+        if run is None or run.end_method(test_method_attr):
+            self._calculate_state_for_all_tests_under_this_method(sd, test_method_attr, had_exception, ep)
+
+    def _call_test_method(self, test_method_attr: TestMethodAttr, sd: SuiteDetails, rm: ReportManager, dryrun_mode: bool, debug_code: bool, onlyonce: bool, ep: ExecutionProgress, _error: Exception):
+        had_exception = None
+        if not self._start_test_method(test_method_attr, sd):
+            return
+
+        if not self._skip_test_method(test_method_attr, sd, rm, dryrun_mode, _error, ep):
+            started = time.perf_counter()
             for attempt in range(1 if onlyonce else test_method_attr.ncycles):
                 number_tests_created_before_call = sd.get_total_tests_by_meid(test_method_attr.method_id)
                 sd.set_current_test_method_attr(test_method_attr)
+                watch = self._watch_test_method(test_method_attr, sd, rm, number_tests_created_before_call)
                 try:
                     # -->> call the test method <<--
-                    _ = getattr(sd.suite_attr.app, test_method_attr.method_name)(sd, rm, ncycles=test_method_attr.ncycles, param=test_method_attr.param)
-
+                    method = getattr(sd.suite_attr.app, test_method_attr.method_name)
+                    with self._record_impact(get_method_key(test_method_attr)):
+                        if inspect.iscoroutinefunction(method):
+                            future = async_runner.submit(async_runner.limited(method(sd, rm, ncycles=test_method_attr.ncycles, param=test_method_attr.param)))
+                            watch.set_cancel_call(future.cancel)
+                            future.result()
+                        else:
+                            _ = method(sd, rm, ncycles=test_method_attr.ncycles, param=test_method_attr.param)
+
+                    if watch.leave():
+                        raise watch.get_error()
                     self._auto_close_all_open_tests_for_that_method(rm=rm, sd=sd, test_method_attr=test_method_attr, number_tests_created_before_call=number_tests_created_before_call)
                 except KeyboardInterrupt:
                     raise KeyboardInterrupt("User stopped execution with CTRL+C")
                 except ExpectedError as ex:
+                    watch.leave()
                     self._auto_close_all_open_tests_for_that_method(rm=rm, sd=sd, test_method_attr=test_method_attr, number_tests_created_before_call=number_tests_created_before_call, had_exception=ex)
                 except Exception as ex:
-                    self._auto_close_all_open_tests_for_that_method(rm=rm, sd=sd, test_method_attr=test_method_attr, number_tests_created_before_call=number_tests_created_before_call, had_exception=ex)
+                    if watch.leave():
+                        ex = watch.get_error()
+                    self._on_test_method_exception(ex, test_method_attr, sd, rm, number_tests_created_before_call, debug_code)
+                    if had_exception is None:
+                        had_exception = ex
+            self.add_durations({get_method_key(test_method_attr): [time.perf_counter() - started]})
+            self._add_result_to_cache(test_method_attr, sd, had_exception)
 
-                    # if "--debug_code" was given, then will stop all execution
-                    if debug_code:
-                        package_name = sd.package.name
-                        suite_filename = sd.suite_attr.filename
-                        suite_name = sd.suite_attr.suite_name
-                        test_method_name = test_method_attr.method_name
-                        test_method_id = test_method_attr.method_id
-                        stack_trace = _get_stacktrace_string_for_tests(ex)
+        self._end_test_method(test_method_attr, sd, had_exception, ep)
 
-                        _exec_logger.critical(f"- {package_name}/{suite_filename} - {suite_name}.{test_method_name}({test_method_id}) needs review because: {ex}\n{stack_trace}")
-                        raise ex
+    # same as _call_test_method, for an async test method running on the event loop, without using a thread
+    async def _call_test_method_async(
+            self, test_method_attr: TestMethodAttr, sd: SuiteDetails, rm: ReportManager,
+            dryrun_mode: bool, debug_code: bool, onlyonce: bool, ep: ExecutionProgress, _error: Exception
+    ):
+        import asyncio
 
+        had_exception = None
+        if not self._start_test_method(test_method_attr, sd):
+            return
+
+        if not self._skip_test_method(test_method_attr, sd, rm, dryrun_mode, _error, ep):
+            started = time.perf_counter()
+            task = asyncio.current_task()
+            for attempt in range(1 if onlyonce else test_method_attr.ncycles):
+                number_tests_created_before_call = sd.get_total_tests_by_meid(test_method_attr.method_id)
+                sd.set_current_test_method_attr(test_method_attr)
+                watch = self._watch_test_method(test_method_attr, sd, rm, number_tests_created_before_call)
+                watch.set_cancel_call(lambda: task.get_loop().call_soon_threadsafe(watch.cancel_task, task))
+                try:
+                    # -->> await the test method <<--
+                    method = getattr(sd.suite_attr.app, test_method_attr.method_name)
+                    with self._record_impact(get_method_key(test_method_attr)):
+                        await async_runner.limited(method(sd, rm, ncycles=test_method_attr.ncycles, param=test_method_attr.param))
+
+                    watch.leave()
+                    self._auto_close_all_open_tests_for_that_method(rm=rm, sd=sd, test_method_attr=test_method_attr,
+                                                                    number_tests_created_before_call=number_tests_created_before_call)
+                except ExpectedError as ex:
+                    watch.leave()
+                    self._auto_close_all_open_tests_for_that_method(rm=rm, sd=sd, test_method_attr=test_method_attr,
+                                                                    number_tests_created_before_call=number_tests_created_before_call, had_exception=ex)
+                except (Exception, asyncio.CancelledError) as ex:
+                    if watch.leave():
+                        ex = watch.get_error()
+                        if hasattr(task, "uncancel"):
+                            task.uncancel()
+                    elif isinstance(ex, asyncio.CancelledError):
+                        raise
+                    self._on_test_method_exception(ex, test_method_attr, sd, rm, number_tests_created_before_call, debug_code)
                     if had_exception is None:
                         had_exception = ex
+            self.add_durations({get_method_key(test_method_attr): [time.perf_counter() - started]})
+            self._add_result_to_cache(test_method_attr, sd, had_exception)
 
-        sd.set_current_test_method_attr(None)
-
-        self._calculate_state_for_all_tests_under_this_method(sd, test_method_attr, had_exception, ep)
+        self._end_test_method(test_method_attr, sd, had_exception, ep)
 
     def _change_cwd_to_package(self, package_name):
-        package_name = package_name.replace(default_config.separator_package, os.path.sep)
-        os.chdir(os.path.join(cm.TESTS_ROOT_FOLDER, package_name))
+        os.chdir(cm.get_package_folder(package_name))
         _exec_logger.debug(f"Current folder {os.getcwd()}")
 
+    @synchronized
     def _inc_failed(self, qty=1):
         self._total_failed_skipped += qty
 
@@ -247,6 +784,75 @@ def _get_nok_on_success_or_on_failure(sd: SuiteDetails, test_method_attr: TestMe
     return ""
 
 
+def _is_async_test_method(app, test_method_attr: TestMethodAttr) -> bool:
+    return inspect.iscoroutinefunction(getattr(app, test_method_attr.method_name, None))
+
+
+# calls the optional setup_suite(sd, rm) or teardown_suite(sd, rm) of the suite, that can also be async
+def _call_suite_hook(app, hook_name: str, sd: SuiteDetails, rm: ReportManager):
+    hook = getattr(app, hook_name, None)
+    if hook is None:
+        return
+
+    if inspect.iscoroutinefunction(hook):
+        async_runner.run(async_runner.limited(hook(sd, rm)))
+    else:
+        hook(sd, rm)
+
+
+# returns (dict, dict), with the number of tests each test method is waiting for, and the tests waiting for each one
+# tests with the same prio, that depend on their own prio, only wait for the ones before them (like when running one by one)
+def _get_test_methods_dag(suite_attr: SuiteAttr) -> Tuple[Dict[int, int], Dict[int, List[TestMethodAttr]]]:
+    graph = suite_attr.dependency_graph
+    position = {id(ma): i for i, ma in enumerate(suite_attr.test_method_attr_list)}
+    waiting_for: Dict[int, int] = dict()
+    dependents: Dict[int, List[TestMethodAttr]] = dict()
+
+    for test_method_attr in suite_attr.test_method_attr_list:
+        dependencies = [ma for ma in graph.get_dependencies(test_method_attr)
+                        if ma.prio != test_method_attr.prio or position[id(ma)] < position[id(test_method_attr)]]
+        waiting_for[id(test_method_attr)] = len(dependencies)
+        for ma in dependencies:
+            dependents.setdefault(id(ma), []).append(test_method_attr)
+
+    return waiting_for, dependents
+
+
+# returns bool, if the suites run on worker processes that are recycled (-sp-recycle, -sp-max-rss), even with -sp 1
+def _is_recycling_processes(sa: StartArguments) -> bool:
+    return bool(sa.suite_processes_recycle or sa.suite_processes_max_rss)
+
+
+# returns str, the reason of the tests skipped after -maxfail was reached
+def get_stop_reason(maxfail: int) -> str:
+    return f"Not run, the run stopped after {maxfail} failed tests (-maxfail)"
+
+
+# returns float, with the most seconds the suite can take by its @TIMEOUT, or by the timeouts of all its test methods (0 if no limit)
+def get_suite_time_limit(suite_attr: SuiteAttr, test_method_timeout: float) -> float:
+    if suite_attr.timeout:
+        return suite_attr.timeout
+
+    timeouts = [(ma.timeout or test_method_timeout) * ma.ncycles for ma in suite_attr.test_method_attr_list]
+    if not timeouts or not all(timeouts):
+        return 0.0
+    return sum(timeouts) * suite_attr.ncycles
+
+
+# returns future, of func running on a new daemon thread
+def _submit_to_daemon_thread(func: Callable, *args) -> concurrent.futures.Future:
+    future = concurrent.futures.Future()
+
+    def _run():
+        try:
+            future.set_result(func(*args))
+        except BaseException as ex:
+            future.set_exception(ex)
+
+    threading.Thread(target=_run, name="testipy-method", daemon=True).start()
+    return future
+
+
 def _get_total_runs_of_selected_methods(selected_tests: List[PackageAttr]) -> int:
     total = 0
     for package_attr in selected_tests:
@@ -264,9 +870,50 @@ def _get_stacktrace_string_for_tests(ex: Exception) -> str:
     return tb
 
 
-def run_selected_tests(sa: StartArguments, selected_tests: List[PackageAttr], rm: ReportManager) -> int:
-    runner = Executer(sa.full_path_tests_scripts_foldername, sa.debug_testipy)
-
-    runner.execute(rm, selected_tests, sa.dryrun, sa.debugcode, sa.onlyonce, sa.suite_threads)
+def run_selected_tests(sa: StartArguments, selected_tests: List[PackageAttr], rm: ReportManager, journal: RunJournal = None, resumed_run: ResumedRun = None) -> int:
+    result_cache = None
+    if sa.result_cache and not sa.dryrun:
+        from testipy.engine.result_cache import ResultCache, get_result_cache_filename
+        result_cache = ResultCache(get_result_cache_filename(sa.full_path_tests_scripts_foldername, sa.environment_name), sa.environment_name)
+
+    impact_recorder = None
+    if sa.record_impact and not sa.dryrun:
+        from testipy.engine.test_impact import ImpactRecorder
+        impact_recorder = ImpactRecorder(sa.full_path_tests_scripts_foldername)
+
+    runner = Executer(sa.full_path_tests_scripts_foldername, sa.debug_testipy, sa.timeout, sa.maxfail, result_cache, impact_recorder, journal, resumed_run)
+    async_runner.set_concurrency_limit(sa.async_concurrency)
+
+    if impact_recorder is not None:
+        impact_recorder.start()
+    try:
+        runner.execute(rm, selected_tests, sa.dryrun, sa.debugcode, sa.onlyonce, sa.suite_threads, sa.suite_processes, sa.package_threads, sa.coordinator_address)
+    finally:
+        session_fixtures.teardown()
+        if impact_recorder is not None:
+            impact_recorder.stop()
+
+    if not sa.dryrun:
+        _save_suite_history(sa, runner.get_average_durations())
+    if result_cache is not None:
+        result_cache.save()
+        _exec_logger.debug(f"Result {result_cache}")
+    if impact_recorder is not None:
+        impact_recorder.save(os.path.join(sa.full_path_results_folder_runtime, default_config.test_impact_filename))
 
     return runner.get_total_failed_skipped()
+
+
+# records how long each suite took, to balance shards (-shard) of the next runs
+def _save_suite_history(sa: StartArguments, durations: Dict[str, float]):
+    if not durations:
+        return
+
+    if sa.shard_total > 1:
+        # all shards must read the same history, so each one saves its durations with its results, to be merged
+        history = SuiteHistory(os.path.join(sa.full_path_results_folder_runtime, default_config.suite_history_filename))
+    else:
+        history = SuiteHistory(get_suite_history_filename(sa.full_path_tests_scripts_foldername))
+
+    history.update(durations)
+    history.save()
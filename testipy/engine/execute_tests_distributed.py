@@ -0,0 +1,458 @@
+from __future__ import annotations
+import os
+import sys
+import hmac
+import time
+import pickle
+import socket
+import struct
+import itertools
+import threading
+
+from collections import deque
+from queue import Queue, Empty
+from typing import Deque, Dict, List, Tuple, Union, TYPE_CHECKING
+
+from testipy import get_exec_logger, __version__
+from testipy.configs import default_config
+from testipy.models import PackageAttr, SuiteAttr, PackageDetails
+from testipy.engine.read_tests_plan import suite_to_dict
+from testipy.engine.execute_tests_process import _init_worker, _execute_suite_on_worker, _PackageEventsReplay, EVENT_DONE
+from testipy.reporter.report_manager import ReportManager
+
+if TYPE_CHECKING:
+    from testipy.lib_modules.args_parser import ArgsParser
+    from testipy.engine.execute_tests import ExecutionProgress
+    from testipy.engine.result_cache import ResultCache
+    from testipy.engine.test_impact import ImpactRecorder
+    from testipy.engine.run_journal import ResumedRun
+
+
+_exec_logger = get_exec_logger()
+
+_HEADER = struct.Struct("!I")
+_CHALLENGE_SIZE = 32
+_DIGEST = "sha256"
+
+# the same key must be given to the coordinator and its workers, with -coordinator-key or on this environment variable
+COORDINATOR_KEY_ENV = "TESTIPY_COORDINATOR_KEY"
+
+# messages from the worker: ("hello", worker_name, version), then the events of its suites (see execute_tests_process.py)
+# messages from the coordinator: ("init", ap, sa, debug_testipy, result_cache, resumed_run), ("task", task_id, package_dict, suite_dict, dryrun_mode, onlyonce), ("bye", reason)
+MSG_HELLO = "hello"
+MSG_INIT = "init"
+MSG_TASK = "task"
+MSG_BYE = "bye"
+
+ROLE_COORDINATOR = b"coordinator"
+ROLE_WORKER = b"worker"
+
+
+# <editor-fold desc="--- Messages over TCP ---">
+# returns (str, int), from "host:port", "host" or ":port"
+def parse_address(address: str, default_host: str = "localhost") -> Tuple[str, int]:
+    host, _, port = address.rpartition(":") if ":" in address else (address, "", "")
+    return host or default_host, int(port or default_config.distributed_port)
+
+
+# returns bytes, the key shared by the coordinator and its workers, raises ValueError if not given
+def get_coordinator_key(ap: ArgsParser) -> bytes:
+    key = ap.get_option("-coordinator-key", "") or os.environ.get(COORDINATOR_KEY_ENV, "")
+    if not key:
+        raise ValueError(f"A distributed run needs the same -coordinator-key (or {COORDINATOR_KEY_ENV}) on the coordinator and its workers.")
+    return key.encode()
+
+
+def _send_bytes(sock: socket.socket, data: bytes):
+    sock.sendall(_HEADER.pack(len(data)) + data)
+
+
+def _send_msg(sock: socket.socket, msg: Tuple):
+    _send_bytes(sock, pickle.dumps(msg))
+
+
+def _recv_exactly(sock: socket.socket, size: int) -> Union[bytes, None]:
+    chunks = []
+    while size > 0:
+        chunk = sock.recv(min(size, 1 << 20))
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+# returns bytes, or None if the connection was closed (or the frame is over max_size)
+def _recv_bytes(sock: socket.socket, max_size: int = 0) -> Union[bytes, None]:
+    header = _recv_exactly(sock, _HEADER.size)
+    if header is None:
+        return None
+    size = _HEADER.unpack(header)[0]
+    if max_size and size > max_size:
+        return None
+    return _recv_exactly(sock, size)
+
+
+# returns tuple, or None if the connection was closed, only after _authenticate, as pickle can run any code
+def _recv_msg(sock: socket.socket) -> Union[Tuple, None]:
+    data = _recv_bytes(sock)
+    return None if data is None else pickle.loads(data)
+
+
+def _get_answer(key: bytes, role: bytes, challenge: bytes) -> bytes:
+    return hmac.new(key, role + challenge, _DIGEST).digest()
+
+
+# returns bool, if the peer proved it has the same key, each end sends a random challenge and checks the answer of the
+# other one, before any pickled message; the answer has the role of who answers, so a challenge can't be sent back to be answered
+def _authenticate(sock: socket.socket, key: bytes, role: bytes, peer_role: bytes) -> bool:
+    challenge = os.urandom(_CHALLENGE_SIZE)
+    _send_bytes(sock, challenge)
+    peer_challenge = _recv_bytes(sock, max_size=_CHALLENGE_SIZE)
+    if peer_challenge is None or len(peer_challenge) != _CHALLENGE_SIZE:
+        return False
+
+    _send_bytes(sock, _get_answer(key, role, peer_challenge))
+    answer = _recv_bytes(sock, max_size=hmac.new(key, digestmod=_DIGEST).digest_size)
+    return answer is not None and hmac.compare_digest(answer, _get_answer(key, peer_role, challenge))
+# </editor-fold>
+
+
+# <editor-fold desc="--- Worker node ---">
+class _CoordinatorQueue:
+    """
+    Used by the worker as the queue of execute_tests_process.py, so all suite events go to the coordinator.
+    Tests of @PARALLEL suites send events from several threads.
+    """
+
+    def __init__(self, sock: socket.socket):
+        self.sock = sock
+        self._lock = threading.Lock()
+
+    def put(self, msg: Tuple):
+        with self._lock:
+            _send_msg(self.sock, msg)
+
+
+def _connect(host: str, port: int, timeout: float) -> socket.socket:
+    started = time.time()
+    while True:
+        try:
+            sock = socket.create_connection((host, port))
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+            return sock
+        except OSError as ex:
+            if time.time() - started > timeout:
+                raise ConnectionError(f"Could not connect to coordinator {host}:{port}, {ex}")
+            time.sleep(1.0)
+
+
+# returns int, 0 when the coordinator ended, runs the suites the coordinator sends, one at a time
+def run_worker(address: str, key: bytes, tests_folder: str = "") -> int:
+    host, port = parse_address(address)
+    worker_name = f"{socket.gethostname()}:{os.getpid()}"
+
+    with _connect(host, port, default_config.distributed_connect_timeout) as sock:
+        if not _authenticate(sock, key, ROLE_WORKER, ROLE_COORDINATOR):
+            _exec_logger.critical(f"Worker {worker_name} refused by coordinator {host}:{port}: not the same -coordinator-key")
+            return 1
+        _send_msg(sock, (MSG_HELLO, worker_name, __version__))
+
+        msg = _recv_msg(sock)
+        if msg is None or msg[0] != MSG_INIT:
+            _exec_logger.critical(f"Worker {worker_name} refused by coordinator {host}:{port}: {msg[1] if msg else 'connection closed'}")
+            return 1
+        _, ap, sa, debug_testipy, result_cache, resumed_run = msg
+
+        # the tests may be on another folder on this machine
+        if tests_folder:
+            sa.full_path_tests_scripts_foldername = os.path.abspath(tests_folder)
+        os.chdir(sa.full_path_tests_scripts_foldername)
+        sys.path.insert(0, sa.full_path_tests_scripts_foldername)
+
+        _init_worker(_CoordinatorQueue(sock), ap, sa, debug_testipy, result_cache=result_cache, resumed_run=resumed_run)
+        _exec_logger.info(f"Worker {worker_name} connected to coordinator {host}:{port}")
+
+        while (msg := _recv_msg(sock)) is not None and msg[0] == MSG_TASK:
+            _, task_id, package_dict, suite_dict, dryrun_mode, onlyonce = msg
+            try:
+                _execute_suite_on_worker(task_id, package_dict, suite_dict, dryrun_mode, onlyonce)
+            except Exception as ex:
+                # the coordinator already got the error with the done event
+                _exec_logger.error(f"Suite {suite_dict.get('name')} stopped: {ex}")
+
+    _exec_logger.info(f"Worker {worker_name} ended")
+    return 0
+# </editor-fold>
+
+
+# <editor-fold desc="--- Coordinator node ---">
+class _PackageRun:
+    def __init__(self, package_attr: PackageAttr, total_suites: int):
+        self.package_attr = package_attr
+        self.remaining_suites = total_suites
+        self.pd: PackageDetails = None
+        self.replay: _PackageEventsReplay = None
+
+
+class _SuiteTask:
+    def __init__(self, task_id: int, package_run: _PackageRun, suite_attr: SuiteAttr):
+        self.task_id = task_id
+        self.package_run = package_run
+        self.suite_attr = suite_attr
+        self.attempts = 0
+        self.events: List[Tuple] = []
+
+
+class _WorkerConnection:
+    def __init__(self, conn_id: int, sock: socket.socket, address: str):
+        self.conn_id = conn_id
+        self.sock = sock
+        self.address = address
+        self.name = address
+        self.ready = False
+        self.task: Union[_SuiteTask, None] = None
+
+
+class SuiteCoordinator:
+    """
+    Hands out the suites of all selected packages to the workers connected over TCP (testipy worker), one suite
+    at a time to each worker as it gets free. Workers can join at any time.
+    The events of each suite are kept until the suite ends, and then replayed on the ReportManager given, like
+    with -sp, so if a worker is lost its suite is sent again to another one, and reported only once.
+    """
+
+    def __init__(
+            self, rm: ReportManager, address: str, key: bytes, debug_testipy: bool = False,
+            result_cache: ResultCache = None, impact_recorder: ImpactRecorder = None, resumed_run: ResumedRun = None
+    ):
+        self.rm = rm
+        self.host, self.port = parse_address(address)
+        self.key = key
+        self.debug_testipy = debug_testipy
+        self.result_cache = result_cache
+        self.impact_recorder = impact_recorder
+        self.resumed_run = resumed_run
+
+        self._server: socket.socket = None
+        self._accept_thread: threading.Thread = None
+        self._stopping = threading.Event()
+        self._inbox: Queue = Queue()
+        self._conn_ids = itertools.count(1)
+        self._task_ids = itertools.count(1)
+        self._workers: Dict[int, _WorkerConnection] = dict()
+        self._last_worker_seen = time.time()
+        self.durations: Dict[str, List[float]] = dict()
+
+    def __enter__(self) -> SuiteCoordinator:
+        self._server = socket.create_server((self.host, self.port))
+        self._server.settimeout(0.5)
+        self.port = self._server.getsockname()[1]
+        self._accept_thread = threading.Thread(target=self._accept_loop, name="testipy-coordinator", daemon=True)
+        self._accept_thread.start()
+        _exec_logger.info(f"Coordinator waiting for workers on {self.host}:{self.port}")
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._stopping.set()
+        for worker in list(self._workers.values()):
+            self._close_worker(worker, "run ended")
+        self._accept_thread.join()
+        self._server.close()
+
+    # <editor-fold desc="--- Connections (on their own threads) ---">
+    def _accept_loop(self):
+        while not self._stopping.is_set():
+            try:
+                sock, addr = self._server.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+            worker = _WorkerConnection(next(self._conn_ids), sock, f"{addr[0]}:{addr[1]}")
+            threading.Thread(target=self._read_loop, args=(worker,), name=f"testipy-worker-{worker.conn_id}", daemon=True).start()
+
+    def _read_loop(self, worker: _WorkerConnection):
+        try:
+            # a peer that doesn't answer is not kept waiting for
+            worker.sock.settimeout(default_config.distributed_connect_timeout)
+            authenticated = _authenticate(worker.sock, self.key, ROLE_COORDINATOR, ROLE_WORKER)
+            worker.sock.settimeout(None)
+            if not authenticated:
+                _exec_logger.warning(f"Worker {worker.address} refused: not the same -coordinator-key")
+                worker.sock.close()
+                return
+        except OSError as ex:
+            _exec_logger.warning(f"Worker {worker.address} refused: {ex}")
+            worker.sock.close()
+            return
+
+        self._inbox.put(("connected", worker, None))
+        try:
+            while (msg := _recv_msg(worker.sock)) is not None:
+                self._inbox.put(("msg", worker, msg))
+            reason = "connection closed"
+        except Exception as ex:
+            reason = f"{type(ex).__name__}: {ex}"
+        self._inbox.put(("lost", worker, reason))
+    # </editor-fold>
+
+    # returns int, with the total failed tests of all suites
+    def execute(self, selected_tests: List[PackageAttr], dryrun_mode: bool, onlyonce: bool, ep: ExecutionProgress) -> int:
+        total_failed = 0
+        tasks: Deque[_SuiteTask] = deque()
+        for package_attr in selected_tests:
+            for _ in range(1 if onlyonce else package_attr.ncycles):
+                package_run = _PackageRun(package_attr, len(package_attr.suite_attr_list))
+                tasks.extend(_SuiteTask(next(self._task_ids), package_run, suite_attr) for suite_attr in package_attr.suite_attr_list)
+
+        running = 0
+        while tasks or running:
+            if ep.stop_reason:
+                # -maxfail reached, the suites not sent yet will not run, the ones running end as usual
+                while tasks:
+                    self._skip_task(tasks.popleft(), ep)
+
+            self._assign_tasks(tasks, dryrun_mode, onlyonce, ep)
+
+            if not self._workers and tasks and time.time() - self._last_worker_seen > default_config.distributed_worker_wait:
+                _exec_logger.critical(f"No workers connected for {default_config.distributed_worker_wait}s, the remaining {len(tasks)} suites fail")
+                while tasks:
+                    total_failed += self._fail_task(tasks.popleft(), "No workers connected to the coordinator", ep)
+                continue
+
+            try:
+                event, worker, msg = self._inbox.get(timeout=0.5)
+            except Empty:
+                continue
+
+            if event == "connected":
+                self._workers[worker.conn_id] = worker
+            elif event == "lost":
+                total_failed += self._on_worker_lost(worker, msg, tasks, ep)
+            elif msg[0] == MSG_HELLO:
+                self._on_hello(worker, *msg[1:])
+            elif worker.task is not None and msg[1] == worker.task.task_id:
+                worker.task.events.append(msg)
+                if msg[0] == EVENT_DONE:
+                    total_failed += self._end_task(worker.task)
+                    worker.task = None
+
+            if self._workers:
+                self._last_worker_seen = time.time()
+
+            running = sum(1 for worker in self._workers.values() if worker.task is not None)
+
+        return total_failed
+
+    def _on_hello(self, worker: _WorkerConnection, worker_name: str, version: str):
+        if version != __version__:
+            self._close_worker(worker, f"version {version} is not the coordinator version {__version__}")
+            return
+
+        worker.name = f"{worker_name} ({worker.address})"
+        if self._send(worker, (MSG_INIT, self.rm.get_ap(), self.rm.get_sa(), self.debug_testipy, self.result_cache, self.resumed_run)):
+            worker.ready = True
+            _exec_logger.info(f"Worker {worker.name} connected")
+
+    # returns int, with the failed tests of the suite, if it was not sent again to another worker
+    def _on_worker_lost(self, worker: _WorkerConnection, reason: str, tasks: Deque[_SuiteTask], ep: ExecutionProgress) -> int:
+        self._workers.pop(worker.conn_id, None)
+        worker.sock.close()
+        task, worker.task = worker.task, None
+        if task is None:
+            return 0
+
+        if task.attempts < default_config.distributed_task_attempts:
+            _exec_logger.warning(f"Worker {worker.name} lost ({reason}), suite {task.suite_attr.name} will run on another worker")
+            task.events.clear()
+            tasks.appendleft(task)
+            return 0
+
+        _exec_logger.critical(f"Worker {worker.name} lost ({reason}), suite {task.suite_attr.name} already ran {task.attempts} times")
+        return self._fail_task(task, f"Worker lost with {reason}", ep)
+
+    def _assign_tasks(self, tasks: Deque[_SuiteTask], dryrun_mode: bool, onlyonce: bool, ep: ExecutionProgress):
+        tests_folder = self.rm.get_sa().full_path_tests_scripts_foldername
+
+        for worker in list(self._workers.values()):
+            if not tasks:
+                return
+            if not worker.ready or worker.task is not None:
+                continue
+
+            task = tasks.popleft()
+            package_run = self._start_package_run(task.package_run, ep)
+            package_dict = dict(package_name=package_run.package_attr.package_name, package_id=package_run.package_attr.package_id,
+                                ncycles=package_run.package_attr.ncycles, cycle_number=package_run.pd.get_cycle())
+
+            task.attempts += 1
+            worker.task = task
+            if not self._send(worker, (MSG_TASK, task.task_id, package_dict, suite_to_dict(task.suite_attr, tests_folder), dryrun_mode, onlyonce)):
+                # lost, the "lost" event will send it again
+                continue
+            _exec_logger.debug(f"Suite {task.suite_attr.name} sent to worker {worker.name}")
+
+    # returns bool, if sent, or else the worker connection is closed
+    def _send(self, worker: _WorkerConnection, msg: Tuple) -> bool:
+        try:
+            _send_msg(worker.sock, msg)
+            return True
+        except OSError as ex:
+            _exec_logger.warning(f"Failed to send to worker {worker.name}, {ex}")
+            worker.sock.close()
+            return False
+
+    def _close_worker(self, worker: _WorkerConnection, reason: str):
+        try:
+            _send_msg(worker.sock, (MSG_BYE, reason))
+            worker.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        worker.ready = False
+
+    def _start_package_run(self, package_run: _PackageRun, ep: ExecutionProgress) -> _PackageRun:
+        if package_run.pd is None:
+            package_run.pd = self.rm.startPackage(package_run.package_attr)
+            package_run.replay = _PackageEventsReplay(self.rm, package_run.pd, ep, self.durations, self.result_cache, self.impact_recorder)
+        return package_run
+
+    # returns int, with the failed tests of the suite, replaying all its events on the ReportManager
+    def _end_task(self, task: _SuiteTask) -> int:
+        replay = task.package_run.replay
+        failed_before = replay.total_failed
+
+        replay.add_task(task.task_id, task.suite_attr)
+        for event in task.events:
+            replay.replay(event)
+        task.events.clear()
+
+        self._end_package_suite(task.package_run)
+        return replay.total_failed - failed_before
+
+    # returns int, with the failed tests of the suite, that didn't run
+    def _fail_task(self, task: _SuiteTask, reason_of_state: str, ep: ExecutionProgress) -> int:
+        replay = self._start_package_run(task.package_run, ep).replay
+        failed_before = replay.total_failed
+
+        replay.add_task(task.task_id, task.suite_attr)
+        replay.close_task(task.task_id, reason_of_state)
+
+        self._end_package_suite(task.package_run)
+        return replay.total_failed - failed_before
+
+    def _skip_task(self, task: _SuiteTask, ep: ExecutionProgress):
+        replay = self._start_package_run(task.package_run, ep).replay
+
+        replay.add_task(task.task_id, task.suite_attr)
+        replay.skip_task(task.task_id, ep.stop_reason)
+
+        self._end_package_suite(task.package_run)
+
+    def _end_package_suite(self, package_run: _PackageRun):
+        package_run.remaining_suites -= 1
+        if package_run.remaining_suites == 0:
+            self.rm.end_package(package_run.pd)
+# </editor-fold>
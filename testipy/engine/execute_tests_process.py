@@ -0,0 +1,615 @@
+from __future__ import annotations
+import os
+import time
+import signal
+import itertools
+import threading
+import multiprocessing
+import multiprocessing.connection
+import concurrent.futures
+
+from collections import deque
+from multiprocessing.util import Finalize
+from typing import Deque, Dict, List, Set, Tuple, Union, TYPE_CHECKING
+
+from testipy import get_exec_logger
+from testipy.configs import enums_data, default_config
+from testipy.helpers.errors import get_picklable_exception
+from testipy.helpers.fixtures import session_fixtures
+from testipy.models import PackageAttr, SuiteAttr, TestMethodAttr, PackageDetails, SuiteDetails, TestDetails
+from testipy.engine.execute_tests import Executer, get_suite_time_limit, get_stop_reason
+from testipy.engine.read_tests_plan import suite_to_dict, suite_from_dict
+from testipy.reporter.report_interfaces import ReportInterface
+from testipy.reporter.report_manager import ReportManager
+from testipy.lib_modules.async_runner import async_runner
+
+if TYPE_CHECKING:
+    from testipy.engine.execute_tests import ExecutionProgress
+    from testipy.lib_modules.args_parser import ArgsParser
+    from testipy.lib_modules.start_arguments import StartArguments
+    from testipy.engine.result_cache import ResultCache
+    from testipy.engine.test_impact import ImpactRecorder
+    from testipy.engine.run_journal import ResumedRun
+
+
+_exec_logger = get_exec_logger()
+
+# event sent by the worker when the suite task ends: ("done", task_id, total_failed, error, durations, result_changes, footprints, rss)
+EVENT_DONE = "done"
+# event sent by the worker when the suite task starts: ("started", task_id, pid)
+EVENT_STARTED = "started"
+
+
+# <editor-fold desc="--- Worker process ---">
+class _WorkerContext:
+    queue = None
+    ap: ArgsParser = None
+    sa: StartArguments = None
+    debug_testipy: bool = False
+    stop_flag = None
+    result_cache: ResultCache = None
+    impact_recorder: ImpactRecorder = None
+    resumed_run: ResumedRun = None
+
+
+# queue is where the events are put, or the Connection of the worker own Pipe to the parent process
+def _init_worker(queue, ap: ArgsParser, sa: StartArguments, debug_testipy: bool, stop_flag=None, result_cache: ResultCache = None, resumed_run: ResumedRun = None):
+    _WorkerContext.queue = _PipeSender(queue) if isinstance(queue, multiprocessing.connection.Connection) else queue
+    _WorkerContext.ap = ap
+    _WorkerContext.sa = sa
+    _WorkerContext.debug_testipy = debug_testipy
+    _WorkerContext.stop_flag = stop_flag
+    _WorkerContext.result_cache = result_cache
+    _WorkerContext.resumed_run = resumed_run
+    if sa.record_impact and not sa.dryrun:
+        from testipy.engine.test_impact import ImpactRecorder
+        _WorkerContext.impact_recorder = ImpactRecorder(sa.full_path_tests_scripts_foldername)
+        _WorkerContext.impact_recorder.start()
+    async_runner.set_concurrency_limit(sa.async_concurrency)
+    # the session fixtures of the worker are shared by all its suites, until it ends (or is recycled)
+    Finalize(None, session_fixtures.teardown, exitpriority=10)
+
+
+class _PipeSender:
+    """
+    Sends the events of a worker process on its own Pipe, from any of its threads. No lock is shared with other
+    processes, so a worker killed while sending only breaks its own Pipe.
+    """
+
+    def __init__(self, conn: multiprocessing.connection.Connection):
+        self.conn = conn
+        self._lock = threading.Lock()
+
+    def put(self, msg: Tuple):
+        with self._lock:
+            self.conn.send(msg)
+
+
+def _send(event: str, task_id: int, *args):
+    _WorkerContext.queue.put((event, task_id) + args)
+
+
+class _ParentEventsReporter(ReportInterface):
+    """
+    Reporter of the ReportManager running the suite on a worker process, sends everything to the parent process,
+    where the events are replayed on the parent ReportManager, and its reporters.
+    """
+
+    def __init__(self, task_id: int):
+        super().__init__("parent_events")
+        self.task_id = task_id
+
+    def _startup_(self, selected_tests: List[PackageAttr]):
+        pass
+
+    def _teardown_(self, end_state: str):
+        pass
+
+    # the package is started and ended by the parent process
+    def start_package(self, pd: PackageDetails):
+        pass
+
+    def end_package(self, pd: PackageDetails):
+        pass
+
+    def start_suite(self, sd: SuiteDetails):
+        _send("start_suite", self.task_id, sd.get_name())
+
+    def end_suite(self, sd: SuiteDetails):
+        _send("end_suite", self.task_id)
+
+    def start_test(self, current_test: TestDetails):
+        _send("start_test", self.task_id, current_test.get_test_id(), current_test.test_method_attr.method_id,
+              current_test.get_name(), current_test.get_usecase(), current_test.get_comment())
+
+    def test_info(self, current_test: TestDetails, info: str, level: str, attachment: Dict = None, true_html: bool = False):
+        _send("test_info", self.task_id, current_test.get_test_id(), info, level, attachment, true_html)
+
+    def test_step(
+            self, current_test: TestDetails, state: str, reason_of_state: str = "", description: str = "",
+            take_screenshot: bool = False, qty: int = 1, exc_value: BaseException = None
+    ):
+        _send("test_step", self.task_id, current_test.get_test_id(), state, reason_of_state, description,
+              take_screenshot, qty, get_picklable_exception(exc_value))
+
+    def end_test(self, current_test: TestDetails, state: str, reason_of_state: str, exc_value: BaseException = None):
+        _send("end_test", self.task_id, current_test.get_test_id(), state, reason_of_state, get_picklable_exception(exc_value))
+
+    def save_file(self, current_test: TestDetails, data, filename) -> Dict:
+        _send("save_file", self.task_id, current_test.get_test_id(), data, filename)
+
+    def copy_file(self, current_test: TestDetails, orig_filename, dest_filename, data) -> Dict:
+        _send("copy_file", self.task_id, current_test.get_test_id(), orig_filename, dest_filename, data)
+
+    def show_status(self, message: str):
+        _send("show_status", self.task_id, message)
+
+    def show_alert_message(self, message: str):
+        _send("show_alert_message", self.task_id, message)
+
+    # reporters of the parent process can't answer to a worker process
+    def input_prompt_message(self, message: str, default_value: str = ""):
+        pass
+
+
+class _ParentExecutionProgress:
+
+    def __init__(self, task_id: int):
+        self.task_id = task_id
+
+    # set by the parent process when -maxfail was reached
+    @property
+    def stop_reason(self) -> str:
+        stop_flag = _WorkerContext.stop_flag
+        return get_stop_reason(_WorkerContext.sa.maxfail) if stop_flag is not None and stop_flag.value else ""
+
+    def inc(self):
+        _send("inc", self.task_id)
+
+    # the parent process records it on the journal, with its own SuiteDetails
+    def method_progress(self, state: str, duration: float, total_failed: int, total: int, test_method_attr: TestMethodAttr, ros: str, sd: SuiteDetails = None):
+        _send("method_progress", self.task_id, state, duration, total_failed, total, test_method_attr.method_id, ros)
+
+
+# returns int, with the bytes of memory used by that process, or this one (resident set size), or 0 if unknown
+def _get_rss(pid: int = 0) -> int:
+    try:
+        with open(f"/proc/{pid or 'self'}/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+
+    try:
+        import psutil
+        return psutil.Process(pid or None).memory_info().rss
+    except Exception:
+        return 0
+
+
+def _execute_suite_on_worker(task_id: int, package_dict: Dict, suite_dict: Dict, dryrun_mode: bool, onlyonce: bool):
+    sa = _WorkerContext.sa
+    total_failed, error, durations, result_changes, footprints = 0, "", dict(), dict(), dict()
+    _send(EVENT_STARTED, task_id, os.getpid())
+    try:
+        executer = Executer(sa.full_path_tests_scripts_foldername, _WorkerContext.debug_testipy, sa.timeout,
+                            result_cache=_WorkerContext.result_cache, impact_recorder=_WorkerContext.impact_recorder,
+                            resumed_run=_WorkerContext.resumed_run)
+
+        package_attr = PackageAttr(package_dict["package_name"], ncycles=package_dict["ncycles"])
+        package_attr.package_id = package_dict["package_id"]
+        suite_attr = suite_from_dict(package_attr, suite_dict, sa.full_path_tests_scripts_foldername)
+
+        rm = ReportManager(_WorkerContext.ap, sa)
+        rm.add_reporter("parent_events", _ParentEventsReporter(task_id))
+
+        executer._change_cwd_to_package(package_attr.package_name)
+        pd = rm.startPackage(package_attr)
+        pd.cycle_number = package_dict["cycle_number"]
+
+        # the package runs on several processes, so its fixtures are torn down when each of its suites ends
+        try:
+            executer._execute_suite(rm, pd, suite_attr, dryrun_mode, False, onlyonce, _ParentExecutionProgress(task_id))
+        finally:
+            executer.teardown_package_fixtures(pd)
+            rm.close_webdriver()
+
+        total_failed = executer.get_total_failed_skipped()
+        durations = executer.durations
+        if _WorkerContext.result_cache is not None:
+            result_changes = _WorkerContext.result_cache.pop_changes()
+        if _WorkerContext.impact_recorder is not None:
+            footprints = _WorkerContext.impact_recorder.pop_footprints()
+    except BaseException as ex:
+        error = f"{type(ex).__name__}: {ex}"
+        raise
+    finally:
+        _send(EVENT_DONE, task_id, total_failed, error, durations, result_changes, footprints, _get_rss())
+# </editor-fold>
+
+
+# <editor-fold desc="--- Parent process ---">
+class _PackageEventsReplay:
+    """
+    Replays the events sent by the worker processes on the parent ReportManager, so the PackageDetails/SuiteDetails/
+    TestDetails (and their StateCounter) are rebuilt on the parent, and all reporters receive them as usual.
+    """
+
+    def __init__(
+            self, rm: ReportManager, pd: PackageDetails, ep: ExecutionProgress, durations: Dict[str, List[float]],
+            result_cache: ResultCache = None, impact_recorder: ImpactRecorder = None
+    ):
+        self.rm = rm
+        self.pd = pd
+        self.ep = ep
+        self.total_failed = 0
+        self.durations = durations
+        self.result_cache = result_cache
+        self.impact_recorder = impact_recorder
+
+        self._suite_attr_by_task: Dict[int, SuiteAttr] = dict()
+        self._sd_by_task: Dict[int, SuiteDetails] = dict()
+        self._tests_by_task: Dict[int, Dict[int, TestDetails]] = dict()
+        self._test_method_by_id: Dict[int, Dict[int, TestMethodAttr]] = dict()
+
+        # process id of the worker running each task, and when it must be done by (0 if no time limit)
+        self.workers: Dict[int, Tuple[int, float]] = dict()
+        # memory used by the worker when each task ended, for -sp-max-rss
+        self.workers_rss: Dict[int, int] = dict()
+        # why the worker of each task was killed, for its crash
+        self.kill_reasons: Dict[int, str] = dict()
+        # test methods of each task counted on the progress (started), and the ones that ended
+        self._started_methods: Dict[int, int] = dict()
+        self._ended_methods: Dict[int, Set[int]] = dict()
+
+    def add_task(self, task_id: int, suite_attr: SuiteAttr):
+        self._suite_attr_by_task[task_id] = suite_attr
+        self._tests_by_task[task_id] = dict()
+        self._test_method_by_id[task_id] = {tma.method_id: tma for tma in suite_attr.test_method_attr_list}
+        self._started_methods[task_id] = 0
+        self._ended_methods[task_id] = set()
+
+    def replay(self, event: Tuple):
+        event_name, task_id, args = event[0], event[1], event[2:]
+
+        # from a task of a previous package, after its process crashed
+        if task_id not in self._suite_attr_by_task:
+            return
+
+        try:
+            getattr(self, f"_on_{event_name}")(task_id, *args)
+        except Exception as ex:
+            _exec_logger.critical(f"Internal error replaying {event_name} from suite process: {ex}")
+            if self.rm.is_debugcode():
+                raise
+
+    # the suite process crashed (or never ran it), so its tests that didn't end fail
+    def close_task(self, task_id: int, reason_of_state: str):
+        self._end_task(task_id, enums_data.STATE_FAILED, reason_of_state)
+
+    # the suite will not run (-maxfail reached), so all its tests are skipped
+    def skip_task(self, task_id: int, reason_of_state: str):
+        self._end_task(task_id, enums_data.STATE_SKIPPED, reason_of_state)
+
+    # the test methods of the task that didn't end on a worker end here, with that state, and are counted on the
+    # progress (and the journal) as if they ran, so both are the same as when a suite runs on this process
+    def _end_task(self, task_id: int, state: str, reason_of_state: str):
+        suite_attr = self._suite_attr_by_task[task_id]
+        sd = self._sd_by_task.pop(task_id, None) or self.rm.startSuite(self.pd, suite_attr)
+
+        for current_test in self._tests_by_task[task_id].values():
+            if not current_test.test_state:
+                self.rm.end_test(current_test, state, reason_of_state)
+                self.total_failed += state in default_config.count_as_failed_states
+
+        for _ in range(len(suite_attr.test_method_attr_list) - self._started_methods[task_id]):
+            self.ep.inc()
+
+        # the test methods not reached (or whose events were lost with the process) get a test
+        for test_method_attr in suite_attr.test_method_attr_list:
+            method_id = test_method_attr.method_id
+            if method_id in self._ended_methods[task_id]:
+                continue
+
+            sd.set_current_test_method_attr(test_method_attr)
+            if sd.get_total_tests_by_meid(method_id) == 0:
+                self.rm.end_test(self.rm.startTest(sd, test_method_attr, usecase="AUTO-CREATED"), state, reason_of_state)
+                self.total_failed += state in default_config.count_as_failed_states
+
+            tests = sd.get_tests_by_meid(method_id)
+            total_failed = sum(current_test.test_state in default_config.count_as_failed_states for current_test in tests)
+            self.ep.method_progress(state, 0.0, total_failed, len(tests), test_method_attr, reason_of_state, sd)
+
+        sd.set_current_test_method_attr(None)
+        self.rm.end_suite(sd)
+
+    def get_suite_name(self, task_id: int) -> str:
+        return self._suite_attr_by_task[task_id].name
+
+    def _get_test(self, task_id: int, test_id: int) -> TestDetails:
+        return self._tests_by_task[task_id][test_id]
+
+    def _on_started(self, task_id: int, pid: int):
+        time_limit = get_suite_time_limit(self._suite_attr_by_task[task_id], self.rm.get_sa().timeout)
+        # the worker leaves a stuck suite behind after timeout_grace, so this is only if the whole process is stuck
+        self.workers[task_id] = (pid, time.perf_counter() + time_limit + 2 * default_config.timeout_grace if time_limit else 0.0)
+
+    def _on_start_suite(self, task_id: int, suite_name: str):
+        self._sd_by_task[task_id] = self.rm.startSuite(self.pd, self._suite_attr_by_task[task_id], suite_name)
+        self._tests_by_task[task_id] = dict()
+
+    def _on_end_suite(self, task_id: int):
+        sd = self._sd_by_task.pop(task_id)
+        sd.set_current_test_method_attr(None)
+        self.rm.end_suite(sd)
+
+    def _on_start_test(self, task_id: int, test_id: int, method_id: int, test_name: str, usecase: str, description: str):
+        sd = self._sd_by_task[task_id]
+
+        # None if the test was not started by a test method
+        test_method_attr = self._test_method_by_id[task_id].get(method_id)
+        sd.set_current_test_method_attr(test_method_attr)
+
+        self._tests_by_task[task_id][test_id] = self.rm.startTest(sd, test_method_attr, test_name, usecase, description)
+
+    def _on_test_info(self, task_id: int, test_id: int, info: str, level: str, attachment: Dict, true_html: bool):
+        self.rm.test_info(self._get_test(task_id, test_id), info, level, attachment, true_html)
+
+    def _on_test_step(self, task_id: int, test_id: int, state: str, reason_of_state: str, description: str, take_screenshot: bool, qty: int, exc_value: BaseException):
+        self.rm.test_step(self._get_test(task_id, test_id), state, reason_of_state, description, take_screenshot, qty, exc_value)
+
+    def _on_end_test(self, task_id: int, test_id: int, state: str, reason_of_state: str, exc_value: BaseException):
+        self.rm.end_test(self._get_test(task_id, test_id), state, reason_of_state, exc_value)
+
+    def _on_save_file(self, task_id: int, test_id: int, data, filename: str):
+        self.rm.reporters_save_file(self._get_test(task_id, test_id), data, filename)
+
+    def _on_copy_file(self, task_id: int, test_id: int, orig_filename: str, dest_filename: str, data):
+        self.rm.reporters_copy_file(self._get_test(task_id, test_id), orig_filename, dest_filename, data)
+
+    def _on_show_status(self, task_id: int, message: str):
+        self.rm.show_status(message)
+
+    def _on_show_alert_message(self, task_id: int, message: str):
+        self.rm.show_alert_message(message)
+
+    def _on_inc(self, task_id: int):
+        self._started_methods[task_id] += 1
+        self.ep.inc()
+
+    def _on_method_progress(self, task_id: int, state: str, duration: float, total_failed: int, total: int, method_id: int, ros: str):
+        self._ended_methods[task_id].add(method_id)
+        self.ep.method_progress(state, duration, total_failed, total, self._test_method_by_id[task_id][method_id], ros, self._sd_by_task.get(task_id))
+
+    def _on_done(
+            self, task_id: int, total_failed: int, error: str, durations: Dict[str, List[float]],
+            result_changes: Dict[str, Union[Dict, None]], footprints: Dict[str, Dict[str, Set[str]]], rss: int
+    ):
+        self.workers.pop(task_id, None)
+        self.workers_rss[task_id] = rss
+        self.total_failed += total_failed
+        for key, key_durations in durations.items():
+            self.durations.setdefault(key, []).extend(key_durations)
+        if self.result_cache is not None:
+            self.result_cache.add_changes(result_changes)
+        if self.impact_recorder is not None:
+            self.impact_recorder.add_footprints(footprints)
+        if error:
+            _exec_logger.critical(f"Suite {self.get_suite_name(task_id)} stopped on its process: {error}")
+            if task_id in self._sd_by_task:
+                self.close_task(task_id, f"Suite process stopped with {error}")
+
+
+class _PoolWorker:
+    """
+    One worker process of the SuiteProcessPool, on its own executor, sending its events on its own Pipe, so if it
+    crashes (or is killed) only the suite it was running fails, and it is replaced by a new one.
+    """
+
+    def __init__(self, ctx, initargs: Tuple):
+        self.reader, self._writer = ctx.Pipe(duplex=False)
+        self.executor = concurrent.futures.ProcessPoolExecutor(max_workers=1, mp_context=ctx, initializer=_init_worker, initargs=(self._writer,) + initargs)
+        self.pid = 0
+        self.suites = 0
+        self.task_id = 0
+        self.future: concurrent.futures.Future = None
+
+    def submit(self, task_id: int, args: Tuple):
+        self.task_id = task_id
+        self.future = self.executor.submit(_execute_suite_on_worker, task_id, *args)
+        # its process was started with the other end of the Pipe, so the reader gets EOF as soon as it ends
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def close(self, wait: bool = False):
+        self.executor.shutdown(wait=wait, cancel_futures=not wait)
+        self.reader.close()
+        if self._writer is not None:
+            self._writer.close()
+
+    # returns str, the error of the process that ended while running a suite
+    def get_crash_error(self) -> str:
+        try:
+            ex = self.future.exception(timeout=default_config.timeout_grace)
+        except concurrent.futures.TimeoutError:
+            ex = None
+        return str(ex) if ex is not None else f"process {self.pid} ended"
+
+
+class SuiteProcessPool:
+    """
+    Runs the suites of each package on worker processes (-sp), so CPU bound suites are not limited by the GIL.
+    Each worker imports the suite module and runs it with its own ReportManager, that sends all events to this
+    process, where they are replayed on the ReportManager (with all reporters) given.
+    A worker is replaced by a new process after running -sp-recycle suites, or when its memory (RSS) after a suite
+    is over -sp-max-rss, so long runs are not affected by suites that leak memory.
+    """
+
+    def __init__(
+            self, rm: ReportManager, suite_processes: int, debug_testipy: bool = False,
+            result_cache: ResultCache = None, impact_recorder: ImpactRecorder = None, resumed_run: ResumedRun = None
+    ):
+        self.rm = rm
+        self.suite_processes = suite_processes
+        self.debug_testipy = debug_testipy
+        self.result_cache = result_cache
+        self.impact_recorder = impact_recorder
+        self.resumed_run = resumed_run
+        self.recycle = rm.get_sa().suite_processes_recycle
+        self.max_rss = rm.get_sa().suite_processes_max_rss
+
+        self._ctx = multiprocessing.get_context(default_config.suite_processes_start_method)
+        # read by the workers without a lock, as a worker can be killed at any time
+        self._stop_flag = None
+        self._workers: List[_PoolWorker] = []
+        self._task_ids = itertools.count(1)
+        self.durations: Dict[str, List[float]] = dict()
+
+    def __enter__(self) -> SuiteProcessPool:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._shutdown(wait=exc_type is None)
+
+    # returns _PoolWorker, not running a suite, or a new one if there are less than suite_processes, or None
+    def _get_free_worker(self) -> Union[_PoolWorker, None]:
+        for worker in self._workers:
+            if not worker.task_id:
+                return worker
+
+        if len(self._workers) < self.suite_processes:
+            if self._stop_flag is None:
+                self._stop_flag = self._ctx.RawValue("b", 0)
+            worker = _PoolWorker(self._ctx, (self.rm.get_ap(), self.rm.get_sa(), self.debug_testipy, self._stop_flag, self.result_cache, self.resumed_run))
+            self._workers.append(worker)
+            return worker
+
+        return None
+
+    # the process of the worker ends (once done), and a new one is started when needed
+    def _remove_worker(self, worker: _PoolWorker, wait: bool = False):
+        self._workers.remove(worker)
+        worker.close(wait)
+
+    def _shutdown(self, wait: bool = True):
+        for worker in list(self._workers):
+            self._remove_worker(worker, wait)
+
+    # returns int, with the total failed tests of all suites of the package, submitted by the order given
+    def execute_package(
+            self, pd: PackageDetails, package_attr: PackageAttr, dryrun_mode: bool, onlyonce: bool, ep: ExecutionProgress,
+            suite_attr_list: List[SuiteAttr] = None
+    ) -> int:
+        tests_folder = self.rm.get_sa().full_path_tests_scripts_foldername
+        package_dict = dict(package_name=package_attr.package_name, package_id=package_attr.package_id,
+                            ncycles=package_attr.ncycles, cycle_number=pd.get_cycle())
+
+        replay = _PackageEventsReplay(self.rm, pd, ep, self.durations, self.result_cache, self.impact_recorder)
+        tasks: Deque[Tuple[int, Tuple]] = deque()
+        for suite_attr in suite_attr_list or package_attr.suite_attr_list:
+            task_id = next(self._task_ids)
+            replay.add_task(task_id, suite_attr)
+            tasks.append((task_id, (package_dict, suite_to_dict(suite_attr, tests_folder), dryrun_mode, onlyonce)))
+
+        self._run_package(replay, tasks)
+
+        return replay.total_failed
+
+    # each suite is sent to a free worker, as soon as there is one
+    def _run_package(self, replay: _PackageEventsReplay, tasks: Deque[Tuple[int, Tuple]]):
+        running: Dict[int, _PoolWorker] = dict()
+        # killing on its own thread, as reading an event cut by a stopped process blocks until its Pipe ends
+        done = threading.Event()
+        killer = threading.Thread(target=self._kill_overdue_workers, args=(replay, done), name="SuiteProcessPoolKiller", daemon=True)
+        killer.start()
+
+        try:
+            while tasks or running:
+                if replay.ep.stop_reason:
+                    self._stop_tasks(replay, tasks)
+
+                while tasks and (worker := self._get_free_worker()) is not None:
+                    task_id, args = tasks.popleft()
+                    worker.submit(task_id, args)
+                    running[task_id] = worker
+
+                workers_by_reader = {worker.reader: worker for worker in self._workers}
+                for reader in multiprocessing.connection.wait(list(workers_by_reader), timeout=0.2):
+                    self._read_events(workers_by_reader[reader], replay, running)
+        finally:
+            done.set()
+            killer.join()
+
+    # replays the events the worker sent, until there are no more, or its Pipe ended (the process crashed, or was killed)
+    def _read_events(self, worker: _PoolWorker, replay: _PackageEventsReplay, running: Dict[int, _PoolWorker]):
+        while worker.task_id:
+            try:
+                if not worker.reader.poll():
+                    return
+                event = worker.reader.recv()
+            except Exception:
+                # a process that died never sends its last event, and the one it was sending can be cut
+                task_id = worker.task_id
+                error = replay.kill_reasons.pop(task_id, "") or worker.get_crash_error()
+                _exec_logger.critical(f"Suite {replay.get_suite_name(task_id)} process crashed: {error}")
+                replay.close_task(task_id, f"Suite process crashed: {error}")
+                replay.workers.pop(task_id, None)
+                del running[task_id]
+                self._remove_worker(worker)
+                return
+
+            replay.replay(event)
+            if event[0] == EVENT_STARTED:
+                worker.pid = event[2]
+            elif event[0] == EVENT_DONE:
+                del running[worker.task_id]
+                worker.task_id = 0
+                worker.suites += 1
+                self._recycle_worker(worker, replay.workers_rss.pop(event[1], 0))
+
+        # a free worker has nothing to send, so its Pipe only gets ready when its process ended
+        if worker in self._workers and worker.reader.poll():
+            _exec_logger.warning(f"Worker process {worker.pid} ended while free")
+            self._remove_worker(worker)
+
+    # the worker is replaced by a new process, after -sp-recycle suites, or if its memory is over -sp-max-rss
+    def _recycle_worker(self, worker: _PoolWorker, rss: int):
+        if self.recycle and worker.suites >= self.recycle:
+            reason = f"after {worker.suites} suites"
+        elif self.max_rss and rss > self.max_rss * 1024 * 1024:
+            reason = f"using {rss / (1024 * 1024):.0f}MB, over {self.max_rss}MB"
+        else:
+            return
+
+        _exec_logger.info(f"Recycling worker process {worker.pid} {reason}")
+        self._remove_worker(worker)
+
+    # -maxfail reached, the suites not sent to a worker are skipped, and the running ones skip their remaining test methods
+    def _stop_tasks(self, replay: _PackageEventsReplay, tasks: Deque[Tuple[int, Tuple]]):
+        if self._stop_flag is not None:
+            self._stop_flag.value = 1
+        while tasks:
+            task_id, _ = tasks.popleft()
+            replay.skip_task(task_id, replay.ep.stop_reason)
+
+    # the worker of a task way past its time limit, or using more memory than -sp-max-rss while running it, is killed,
+    # so only its task crashes (its Pipe ends), and a suite that leaks memory can't grow without limit
+    def _kill_overdue_workers(self, replay: _PackageEventsReplay, done: threading.Event):
+        while not done.wait(0.2):
+            now = time.perf_counter()
+            for task_id, (pid, deadline) in list(replay.workers.items()):
+                if deadline and now > deadline:
+                    reason = "didn't stop after its timeout"
+                elif self.max_rss and (rss := _get_rss(pid)) > self.max_rss * 1024 * 1024:
+                    reason = f"using {rss / (1024 * 1024):.0f}MB, over -sp-max-rss {self.max_rss}MB"
+                else:
+                    continue
+
+                if replay.workers.pop(task_id, None) is not None:
+                    _exec_logger.critical(f"Suite {replay.get_suite_name(task_id)} {reason}, killing its process {pid}")
+                    replay.kill_reasons[task_id] = f"killed, {reason}"
+                    try:
+                        os.kill(pid, getattr(signal, "SIGKILL", signal.SIGTERM))
+                    except OSError:
+                        pass
+# </editor-fold>
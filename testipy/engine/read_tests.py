@@ -1,33 +1,30 @@
-import inspect
 import os
-import sys
+import concurrent.futures
 
-from typing import List, Dict
+from itertools import repeat
+from typing import List, Dict, Tuple
 
 from testipy import get_exec_logger
 from testipy.configs import enums_data, default_config
-from testipy.lib_modules import py_inspector, common_methods as cm
+from testipy.lib_modules import common_methods as cm
 from testipy.lib_modules.args_parser import ArgsParser
+from testipy.lib_modules.startup_profiler import startup_profiler
 from testipy.helpers import load_config
 from testipy.models.attr import (
+    DependencyGraph,
     PackageAttr,
     SuiteAttr,
     TestMethodAttr,
-    get_package_by_name,
+    get_packages_by_name,
     mark_packages_suites_methods_ids,
     show_test_structure,
     sort_test_structure,
 )
-from testipy.engine.read_tests_utils import (
-    TYPE_DOC,
-    ConfigFilters,
-    get_doc_dict,
-    is_auto_include_test_tag,
-    is_valid_level,
-    is_valid_tag,
-    is_valid_tag_features,
-    is_valid_tag_testnumber,
-)
+from testipy.engine.read_tests_cache import DiscoveryCache, get_discovery_cache_filename
+from testipy.engine.read_tests_metadata import FileMetadata, SuiteMetadata, MethodMetadata, read_file_metadata, read_file_metadata_in_worker
+from testipy.engine.read_tests_plan import save_plan, load_plan
+from testipy.engine.read_tests_selection import TestSelection
+from testipy.engine.read_tests_utils import TYPE_DOC, ConfigFilters
 
 
 _exec_logger = get_exec_logger()
@@ -39,7 +36,19 @@ def get_selected_tests(full_path_tests_scripts_foldername: str,
                        include_test_tag=[], exclude_test_tag=[],
                        level_filter=([],[],[],[]),
                        include_feature=[], exclude_feature=[],
-                       include_testnumber=[], exclude_testnumber=[]) -> List[PackageAttr]:
+                       include_testnumber=[], exclude_testnumber=[],
+                       discovery_cache: DiscoveryCache = None,
+                       discovery_engine: str = default_config.discovery_engine,
+                       discovery_workers: int = default_config.discovery_workers,
+                       select_expression: str = "") -> List[PackageAttr]:
+
+    # all selection options are compiled once, then applied to every suite and test method
+    selection = TestSelection(include_suite_tag=include_suite_tag, exclude_suite_tag=exclude_suite_tag,
+                              include_test_tag=include_test_tag, exclude_test_tag=exclude_test_tag,
+                              level_filter=level_filter,
+                              include_feature=include_feature, exclude_feature=exclude_feature,
+                              include_testnumber=include_testnumber, exclude_testnumber=exclude_testnumber,
+                              select_expression=select_expression)
 
     def __is_valid_package(package_name: str) -> bool:
         return not package_name.startswith(".") and not package_name.endswith("__pycache__") and (
@@ -48,176 +57,190 @@ def get_selected_tests(full_path_tests_scripts_foldername: str,
                 (not exclude_package and cm.validate_begins_with(package_name, include_package)) or
                 (cm.validate_begins_with(package_name, include_package) and not cm.validate_begins_with(package_name, exclude_package)))
 
-    def __is_valid_suite(obj, doc: TYPE_DOC, suite_name: str, filename: str) -> bool:
-        is_in_include_suite_tag = filename.split(".")[0] in include_suite_tag
-        is_not_in_exclude_suite_tag = filename.split(".")[0] not in exclude_suite_tag
-        return inspect.isclass(obj) and (
-            (is_in_include_suite_tag and is_not_in_exclude_suite_tag) or
-            is_valid_tag(suite_name, default_config.prefix_suite, doc, include_suite_tag, exclude_suite_tag)
-        )
-
-    def __is_valid_test_method(obj, doc: TYPE_DOC, method_name: str) -> bool:
-        return inspect.isfunction(obj) and is_valid_level(doc, level_filter) and (is_auto_include_test_tag(doc) or (
-                is_valid_tag(method_name, default_config.prefix_tests, doc, include_test_tag, exclude_test_tag) and
-                is_valid_tag_features(doc, include_feature, exclude_feature) and
-                is_valid_tag_testnumber(doc, include_testnumber, exclude_testnumber))
-        )
-
-    def __get_test_methods_list_from_suite_obj(suite_obj, suite_doc, suite_attr: SuiteAttr):
-        _test_methods: Dict[str, TestMethodAttr] = {}
-        _depends_prio_tests_to_auto_include = set()
+    def __is_valid_test_method(method_metadata: MethodMetadata, doc: TYPE_DOC, suite_mask: int) -> bool:
+        return method_metadata.is_function and selection.is_valid_test_method(method_metadata.method_name, doc, suite_mask)
+
+    def __get_test_methods_list_from_suite_metadata(suite_metadata: SuiteMetadata, suite_doc: TYPE_DOC, suite_attr: SuiteAttr):
+        suite_mask = selection.get_suite_mask(suite_metadata.suite_name, suite_doc)
+        _test_methods: List[TestMethodAttr] = []
         ConfigFilters.auto_included_tests = 0
 
         _dummy_package_attr = PackageAttr("dummy")
         _dummy_suite_attr = SuiteAttr(_dummy_package_attr, "dummy", "dummy")
 
-        def is_test_on_list(test_method_attr: TestMethodAttr) -> bool:
-            for ma in suite_attr.test_method_attr_list:
-                if ma.method_name == test_method_attr.method_name:
-                    return True
-            return False
+        for method_metadata in suite_metadata.method_metadata_list:
+            method_name = method_metadata.method_name
+            doc = dict(method_metadata.doc)
+            doc[enums_data.TAG_TESTNUMBER] = suite_doc[enums_data.TAG_TESTNUMBER] + doc[enums_data.TAG_TESTNUMBER]
+
+            curr_suite_attr = suite_attr if __is_valid_test_method(method_metadata, doc, suite_mask) else _dummy_suite_attr
 
-        for method_name, obj in inspect.getmembers(suite_obj):
-            if method_name.startswith(default_config.prefix_tests):
-                mname = method_name[len(default_config.prefix_tests):] if default_config.trim_prefix_tests else method_name
-                doc = get_doc_dict(obj, mname)
-                doc[enums_data.TAG_TESTNUMBER] = suite_doc[enums_data.TAG_TESTNUMBER] + doc[enums_data.TAG_TESTNUMBER]
+            # create new test and add to test_methods
+            test_method_attr = TestMethodAttr(
+                suite_attr=curr_suite_attr,
 
-                if __is_valid_test_method(obj, doc, method_name):
-                    # update auto include tests that have dependency to other tests, based on prio
-                    _depends_prio_tests_to_auto_include.update(doc[enums_data.TAG_DEPENDS])
-                    curr_suite_attr = suite_attr
-                else:
-                    curr_suite_attr = _dummy_suite_attr
+                method_name=method_name,
 
-                # create new test and add to test_methods
-                test_method_attr = TestMethodAttr(
-                    suite_attr=curr_suite_attr,
+                param=method_metadata.param,
+                ncycles=method_metadata.ncycles,
 
-                    method_name=method_name,
-                    method_obj=obj,
+                name=doc[enums_data.TAG_NAME],
+                comment=method_metadata.comment,
+                prio=doc[enums_data.TAG_PRIO],
+                level=doc[enums_data.TAG_LEVEL],
+                tags=doc[enums_data.TAG_TAG],
+                features=doc[enums_data.TAG_FEATURES],
+                test_number=doc[enums_data.TAG_TESTNUMBER],
 
-                    param=py_inspector.get_method_parameter_default_value(obj, "param", None),
-                    ncycles=py_inspector.get_method_parameter_default_value(obj, "ncycles", 1),
+                depends=doc[enums_data.TAG_DEPENDS],
+                on_success=doc[enums_data.TAG_ON_SUCCESS],
+                on_failure=doc[enums_data.TAG_ON_FAILURE],
+                timeout=doc[enums_data.TAG_TIMEOUT],
+            )
+            _test_methods.append(test_method_attr)
 
+        # include tests (methods) that selected tests depend on, based on prio
+        dependency_graph = DependencyGraph(_test_methods, where=f"{suite_attr.filename}/{suite_attr.suite_name}")
+        for test_method_attr in dependency_graph.get_closure(suite_attr.test_method_attr_list):
+            test_method_attr.suite_attr = suite_attr
+            suite_attr.add_test_method_attr(test_method_attr)
+            ConfigFilters.inc()
+
+        # no test was included apart from the auto-included + dependencies tests
+        if ConfigFilters.auto_included_tests == len(suite_attr.test_method_attr_list):
+            suite_attr.test_method_attr_list.clear()
+
+    def __get_files_metadata(files: List[str]) -> Dict[str, FileMetadata]:
+        files_metadata: Dict[str, FileMetadata] = dict()
+        use_ast = discovery_engine == "ast"
+
+        files_to_read = []
+        for fpn in files:
+            file_metadata = discovery_cache.get(fpn) if discovery_cache else None
+            if file_metadata is None:
+                files_to_read.append(fpn)
+            else:
+                files_metadata[fpn] = file_metadata
+
+        # read (import or parse) files in other processes, those that cannot be shared are read again here
+        if discovery_workers > 1 and len(files_to_read) > 1:
+            max_workers = min(discovery_workers, len(files_to_read))
+            chunksize = max(1, len(files_to_read) // (max_workers * 4))
+            with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
+                read_in_workers = executor.map(read_file_metadata_in_worker, files_to_read,
+                                               repeat(full_path_tests_scripts_foldername), repeat(use_ast),
+                                               chunksize=chunksize)
+                for fpn, file_metadata in zip(files_to_read, read_in_workers):
+                    if file_metadata is not None:
+                        files_metadata[fpn] = file_metadata
+
+        for fpn in files_to_read:
+            if fpn not in files_metadata:
+                files_metadata[fpn] = read_file_metadata(fpn, full_path_tests_scripts_foldername, use_ast=use_ast)
+            if discovery_cache:
+                discovery_cache.put(fpn, files_metadata[fpn])
+
+        return files_metadata
+
+    def __get_suites_list_from_file_with_test_methods(file_metadata: FileMetadata, fpn: str, filename: str, package: PackageAttr):
+        for suite_metadata in file_metadata.suite_metadata_list:
+            doc = dict(suite_metadata.doc)
+            if selection.is_valid_suite(suite_metadata.suite_name, doc, filename):
+                # Create a Suite object, its class is only imported if selected to run
+                suite_attr = SuiteAttr(
+                    package_attr=package,
+                    filename=filename,
+                    full_path_filename=fpn,
+                    suite_name=suite_metadata.suite_name,
+                    ncycles=1,
+                    test_method_attr_list=[],
+                    comment=suite_metadata.comment,
                     name=doc[enums_data.TAG_NAME],
-                    comment=py_inspector.get_comment(obj) or "",
                     prio=doc[enums_data.TAG_PRIO],
                     level=doc[enums_data.TAG_LEVEL],
                     tags=doc[enums_data.TAG_TAG],
                     features=doc[enums_data.TAG_FEATURES],
                     test_number=doc[enums_data.TAG_TESTNUMBER],
-
-                    depends=doc[enums_data.TAG_DEPENDS],
-                    on_success=doc[enums_data.TAG_ON_SUCCESS],
-                    on_failure=doc[enums_data.TAG_ON_FAILURE],
+                    parallel=doc[enums_data.TAG_PARALLEL],
+                    timeout=doc[enums_data.TAG_TIMEOUT],
+                    fixtures=doc[enums_data.TAG_FIXTURES]
                 )
-                _test_methods[method_name] = test_method_attr
-
-        # find tests (methods) that must be included because of dependency
-        changes_were_made = len(_depends_prio_tests_to_auto_include) > 0
-        while changes_were_made:
-            changes_were_made = False
-            for method_name, test_method_attr in _test_methods.items():
-                if test_method_attr.prio in _depends_prio_tests_to_auto_include:
-                    if not is_test_on_list(test_method_attr):
-                        test_method_attr.suite_attr = suite_attr
-                        suite_attr.test_method_attr_list.append(test_method_attr)
-                        _depends_prio_tests_to_auto_include.update(test_method_attr.depends)
-
-                        ConfigFilters.inc()
-                        changes_were_made = True
+                __get_test_methods_list_from_suite_metadata(suite_metadata, doc, suite_attr)
 
-        # no test was included apart from the auto-included + dependencies tests
-        if ConfigFilters.auto_included_tests == len(suite_attr.test_method_attr_list):
-            suite_attr.test_method_attr_list.clear()
+                if len(suite_attr.test_method_attr_list) == 0:
+                    package.remove_suite_attr(suite_attr)
 
-    def __get_suites_list_from_file_with_test_methods(fpn: str, filename: str, package: PackageAttr):
-        for suite_name, obj in py_inspector.get_members_from_file(fpn):
-            if suite_name.startswith(default_config.prefix_suite) and suite_name not in ["SuiteDetails"]:
-                sname = suite_name[len(default_config.prefix_suite):] if default_config.trim_prefix_suite else suite_name
-                doc = get_doc_dict(obj, sname)
-                if __is_valid_suite(obj, doc, suite_name, filename):
-                    # Create a Suite object
-                    suite_attr = SuiteAttr(
-                        package_attr=package,
-                        filename=filename,
-                        suite_name=suite_name,
-                        suite_obj=obj,
-                        ncycles=1,
-                        test_method_attr_list=[],
-                        comment=py_inspector.get_comment(obj) or "",
-                        name=doc[enums_data.TAG_NAME],
-                        prio=doc[enums_data.TAG_PRIO],
-                        level=doc[enums_data.TAG_LEVEL],
-                        tags=doc[enums_data.TAG_TAG],
-                        features=doc[enums_data.TAG_FEATURES],
-                        test_number=doc[enums_data.TAG_TESTNUMBER]
-                    )
-                    __get_test_methods_list_from_suite_obj(obj, doc, suite_attr)
-
-                    if len(suite_attr.test_method_attr_list) == 0:
-                        package.suite_attr_list.remove(suite_attr)
-
-    def __get_package_suite_test_methods_list(full_path_foldername: str, package_name: str = "") -> List[PackageAttr]:
-        packages_suites_methods_list: List[PackageAttr] = []
+    # returns list of (package_name, [full path .py files]) of all valid packages under that folder
+    def __get_package_files_list(full_path_foldername: str, package_name: str = "") -> List[Tuple[str, List[str]]]:
+        package_files_list: List[Tuple[str, List[str]]] = []
 
         vp = __is_valid_package(package_name)
-
-        if vp:
-            package_attr = PackageAttr(package_name=package_name, suite_attr_list=[], ncycles=1)
-            # add current package to PATH
-            sys.path.insert(0, full_path_foldername)
+        files: List[str] = []
 
         for filename in sorted(os.listdir(full_path_foldername)):
             fpn = os.path.join(full_path_foldername, filename)
 
             if os.path.isdir(fpn):
-                packages_suites_methods_list += __get_package_suite_test_methods_list(
+                package_files_list += __get_package_files_list(
                     fpn, package_name + default_config.separator_package + filename
                 )
 
             elif vp and os.path.isfile(fpn) and filename.endswith(".py"):
-                __get_suites_list_from_file_with_test_methods(fpn, filename, package_attr)
+                files.append(fpn)
 
-        if vp:
-            # remove current package from PATH
-            sys.path.remove(full_path_foldername)
-            if package_attr.suite_attr_list:
-                packages_suites_methods_list.append(package_attr)
+        if vp and files:
+            package_files_list.append((package_name, files))
 
-        return packages_suites_methods_list
+        return package_files_list
 
     #  -  -  -  -  -  -  -  -  main function starts here  -  -  -  -  -  -  -  -  #
     if not os.path.isdir(full_path_tests_scripts_foldername):
         raise NotADirectoryError(full_path_tests_scripts_foldername)
+    if discovery_engine not in ("import", "ast"):
+        raise ValueError(f"Unknown discovery engine {discovery_engine}, expected import or ast.")
 
     selected_tests: List[PackageAttr] = []
 
-    for name in sorted(os.listdir(full_path_tests_scripts_foldername)):
-        fpn = os.path.join(full_path_tests_scripts_foldername, name)
-        if os.path.isdir(fpn):
-            package_attr_list: List[PackageAttr] = __get_package_suite_test_methods_list(fpn, name)
-            if package_attr_list:
-                selected_tests += package_attr_list
+    # scan folders for packages and their test files
+    package_files_list: List[Tuple[str, List[str]]] = []
+    with startup_profiler.section("scan folders"):
+        for name in sorted(os.listdir(full_path_tests_scripts_foldername)):
+            fpn = os.path.join(full_path_tests_scripts_foldername, name)
+            if os.path.isdir(fpn):
+                package_files_list += __get_package_files_list(fpn, name)
+
+    # read all files, possibly in parallel
+    with startup_profiler.section(f"read test files ({discovery_engine}, {discovery_workers} workers)"):
+        files_metadata = __get_files_metadata([fpn for _, files in package_files_list for fpn in files])
+
+    # create packages/suites/tests by the scanned order
+    with startup_profiler.section("select tests"):
+        for package_name, files in package_files_list:
+            package_attr = PackageAttr(package_name=package_name, suite_attr_list=[], ncycles=1)
+            for fpn in files:
+                __get_suites_list_from_file_with_test_methods(files_metadata[fpn], fpn, os.path.basename(fpn), package_attr)
+
+            if package_attr.suite_attr_list:
+                selected_tests.append(package_attr)
 
-    selected_tests = mark_packages_suites_methods_ids(sort_test_structure(selected_tests))
+        selected_tests = mark_packages_suites_methods_ids(sort_test_structure(selected_tests))
 
     return selected_tests
 
 
 def filter_tests_by_storyboard(storyboard_json_files: List[str], all_tests: List[PackageAttr]) -> List[PackageAttr]:
     selected_tests: List[PackageAttr] = []
+    packages_by_name: Dict[str, PackageAttr] = get_packages_by_name(all_tests)
 
     for sb_json_file in storyboard_json_files:
         storyboard: Dict[str, Dict] = load_config(sb_json_file)
 
         for sb_package in storyboard["package_list"]:
             # get cloned package dict, based on package_of_storyboard, from all tests
-            current_package_attr: PackageAttr = get_package_by_name(all_tests, sb_package["package_name"])
+            package_attr: PackageAttr = packages_by_name.get(sb_package["package_name"])
 
-            if current_package_attr:
-                current_package_attr = current_package_attr.duplicate(clone_children=False)
+            if package_attr:
+                current_package_attr = package_attr.duplicate(clone_children=False)
                 selected_tests.append(current_package_attr)
 
                 # add storyboard package attributes, override values such as ncycle
@@ -227,13 +250,13 @@ def filter_tests_by_storyboard(storyboard_json_files: List[str], all_tests: List
 
                 # add all suites from package if none specified on storyboard
                 if not sb_package.get("suite_list"):
-                    sb_package["suite_list"] = [{"suite_name": suite.suite_name} for suite in current_package_attr.suite_attr_list]
+                    sb_package["suite_list"] = [{"suite_name": suite.suite_name} for suite in package_attr.suite_attr_list]
 
                 for sb_suite in sb_package["suite_list"]:
                     # get cloned suite dict, based on suite_of_storyboard, from all_tests->current_package
-                    current_suite_attr: SuiteAttr = current_package_attr.get_suite_by_name(sb_suite["suite_name"])
-                    if current_suite_attr:
-                        current_suite_attr = current_suite_attr.duplicate(current_package_attr, clone_children=False)
+                    suite_attr: SuiteAttr = package_attr.get_suite_by_name(sb_suite["suite_name"])
+                    if suite_attr:
+                        current_suite_attr = suite_attr.duplicate(current_package_attr, clone_children=False)
 
                         # add storyboard suite attributes, override values such as ncycle
                         for k, v in sb_suite.items():
@@ -245,11 +268,11 @@ def filter_tests_by_storyboard(storyboard_json_files: List[str], all_tests: List
 
                         # add all tests from suite if none specified on storyboard
                         if not sb_suite.get("test_list"):
-                            sb_suite["test_list"] = [{"test_name": test_method["method_name"]} for test_method in current_suite_attr.test_method_attr_list]
+                            sb_suite["test_list"] = [{"test_name": test_method.method_name} for test_method in suite_attr.test_method_attr_list]
 
                         # filter tests based on storyboard
                         for sb_test in sb_suite["test_list"]:
-                            current_method_attr: TestMethodAttr = current_suite_attr.get_test_method_by_name(sb_test["test_name"])
+                            current_method_attr: TestMethodAttr = suite_attr.get_test_method_by_name(sb_test["test_name"])
                             if current_method_attr:
                                 current_method_attr = current_method_attr.duplicate(current_suite_attr)
                                 # add storyboard test attributes, override values such as ncycle and param
@@ -264,20 +287,13 @@ def filter_tests_by_storyboard(storyboard_json_files: List[str], all_tests: List
     return selected_tests
 
 
-def read_files_to_get_selected_tests(ap: ArgsParser, storyboard_json_files: List[str], full_path_tests_scripts_foldername: str, verbose=False):
-    print(f"> Reading test files from {full_path_tests_scripts_foldername}")
-    cm.TESTS_ROOT_FOLDER = full_path_tests_scripts_foldername
-    all_tests = get_selected_tests(full_path_tests_scripts_foldername=full_path_tests_scripts_foldername,
-                                   include_package=ap.get_options_arguments("-ip"), exclude_package=ap.get_options_arguments("-ep"),
-                                   include_suite_tag=ap.get_options_arguments("-is"), exclude_suite_tag=ap.get_options_arguments("-es"),
-                                   include_test_tag=ap.get_options_arguments("-it"), exclude_test_tag=ap.get_options_arguments("-et"),
-                                   level_filter=(ap.get_options_arguments("-ilv"), ap.get_options_arguments("-elv"), ap.get_options_arguments("-alv"), ap.get_options_arguments("-blv")),
-                                   include_feature=ap.get_options_arguments("-if"), exclude_feature=ap.get_options_arguments("-ef"),
-                                   include_testnumber=ap.get_options_arguments("-itn"), exclude_testnumber=ap.get_options_arguments("-etn"))
+# returns int, number of processes to read test files, 0 means one per cpu
+def _get_discovery_workers(ap: ArgsParser) -> int:
+    workers = int(ap.get_option("-discovery-workers", str(default_config.discovery_workers)))
+    return workers if workers > 0 else (os.cpu_count() or 1)
 
-    if storyboard_json_files:
-        all_tests = filter_tests_by_storyboard(storyboard_json_files, all_tests)
 
+def _show_test_structure(all_tests: List[PackageAttr], verbose: bool):
     if verbose and all_tests:
         test_structure: str = show_test_structure(all_tests)
         print("="*160)
@@ -285,4 +301,51 @@ def read_files_to_get_selected_tests(ap: ArgsParser, storyboard_json_files: List
         print("="*160)
         _exec_logger.info(f"TestStructure: {test_structure}")
 
+
+def read_files_to_get_selected_tests(ap: ArgsParser, storyboard_json_files: List[str], full_path_tests_scripts_foldername: str, verbose=False):
+    cm.TESTS_ROOT_FOLDER = full_path_tests_scripts_foldername
+
+    # plan already has the selection resolved, so no test file is read
+    if plan_filename := ap.get_option("-load-plan"):
+        print(f"> Loading execution plan {plan_filename}")
+        with startup_profiler.section("load plan"):
+            all_tests = load_plan(plan_filename, full_path_tests_scripts_foldername)
+        _show_test_structure(all_tests, verbose)
+        return all_tests
+
+    print(f"> Reading test files from {full_path_tests_scripts_foldername}")
+    discovery_engine = ap.get_option("-discovery", default_config.discovery_engine)
+    with startup_profiler.section("load discovery cache"):
+        discovery_cache = None
+        if not ap.has_flag_or_option("--no-discovery-cache"):
+            discovery_cache = DiscoveryCache(get_discovery_cache_filename(full_path_tests_scripts_foldername, discovery_engine))
+    with startup_profiler.section("discovery"):
+        all_tests = get_selected_tests(full_path_tests_scripts_foldername=full_path_tests_scripts_foldername,
+                                       include_package=ap.get_options_arguments("-ip"), exclude_package=ap.get_options_arguments("-ep"),
+                                       include_suite_tag=ap.get_options_arguments("-is"), exclude_suite_tag=ap.get_options_arguments("-es"),
+                                       include_test_tag=ap.get_options_arguments("-it"), exclude_test_tag=ap.get_options_arguments("-et"),
+                                       level_filter=(ap.get_options_arguments("-ilv"), ap.get_options_arguments("-elv"),
+                                                     ap.get_options_arguments("-alv"), ap.get_options_arguments("-blv")),
+                                       include_feature=ap.get_options_arguments("-if"), exclude_feature=ap.get_options_arguments("-ef"),
+                                       include_testnumber=ap.get_options_arguments("-itn"), exclude_testnumber=ap.get_options_arguments("-etn"),
+                                       discovery_cache=discovery_cache,
+                                       discovery_engine=discovery_engine,
+                                       discovery_workers=_get_discovery_workers(ap),
+                                       select_expression=" | ".join(f"({expression})" for expression in ap.get_options_arguments("-select")))
+
+    if discovery_cache:
+        with startup_profiler.section("save discovery cache"):
+            discovery_cache.save()
+        _exec_logger.debug(f"Discovery {discovery_cache}")
+
+    if storyboard_json_files:
+        with startup_profiler.section("storyboard filtering"):
+            all_tests = filter_tests_by_storyboard(storyboard_json_files, all_tests)
+
+    if plan_filename := ap.get_option("-save-plan"):
+        with startup_profiler.section("save plan"):
+            save_plan(plan_filename, all_tests, full_path_tests_scripts_foldername)
+
+    _show_test_structure(all_tests, verbose)
+
     return all_tests
@@ -0,0 +1,149 @@
+import os
+import pickle
+import hashlib
+
+from typing import Dict, NamedTuple, Tuple, Union
+
+from testipy import __version__, get_exec_logger
+from testipy.configs import enums_data, default_config
+from testipy.engine.read_tests_metadata import FileMetadata
+
+
+_exec_logger = get_exec_logger()
+
+# increase when the metadata read from the files changes for the same source
+CACHE_FORMAT = 6
+
+
+class FileStamp(NamedTuple):
+    full_path_filename: str
+    mtime_ns: int
+    size: int
+    sha1: str
+
+
+class CacheEntry(NamedTuple):
+    mtime_ns: int
+    size: int
+    sha1: str
+    file_metadata: FileMetadata
+    # the other files with classes of its suites (or their bases), as when cached
+    source_stamps: Tuple[FileStamp, ...] = ()
+
+
+# returns str, sha1 of the file content
+def get_file_hash(full_path_filename: str) -> str:
+    with open(full_path_filename, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+# returns FileStamp, of the file as it is now
+def get_file_stamp(full_path_filename: str) -> FileStamp:
+    st = os.stat(full_path_filename)
+    return FileStamp(full_path_filename, st.st_mtime_ns, st.st_size, get_file_hash(full_path_filename))
+
+
+# returns FileStamp, the same or with the new mtime if only touched, or None if the file was changed (or removed)
+def _get_unchanged_stamp(stamp: FileStamp) -> Union[FileStamp, None]:
+    try:
+        st = os.stat(stamp.full_path_filename)
+        if stamp.mtime_ns == st.st_mtime_ns and stamp.size == st.st_size:
+            return stamp
+        if stamp.size == st.st_size and stamp.sha1 == get_file_hash(stamp.full_path_filename):
+            return stamp._replace(mtime_ns=st.st_mtime_ns)
+    except OSError:
+        pass
+    return None
+
+
+# returns str, with full path of the cache file for that tests folder and discovery engine
+def get_discovery_cache_filename(full_path_tests_scripts_foldername: str, discovery_engine: str = default_config.discovery_engine) -> str:
+    folder_hash = hashlib.sha1(os.path.abspath(full_path_tests_scripts_foldername).encode()).hexdigest()[:16]
+    return os.path.join(default_config.default_cache_folder, default_config.discovery_cache_filename.format(f"{folder_hash}_{discovery_engine}"))
+
+
+# returns tuple, with everything that changes how test files are parsed
+def _get_signature() -> tuple:
+    return (__version__, CACHE_FORMAT,
+            default_config.prefix_suite, default_config.prefix_tests,
+            default_config.trim_prefix_suite, default_config.trim_prefix_tests,
+            default_config.execute_test_with_no_doc, enums_data.PREFIX_TAGS)
+
+
+class DiscoveryCache:
+    """
+    Keeps the parsed metadata of each test file, so unchanged files don't need to be imported again.
+    A file is considered unchanged if its mtime and size are the same, or else if its content hash is the same, and
+    the same for the other files with classes of its suites (ex: a base suite imported from another module).
+    """
+
+    def __init__(self, cache_filename: str):
+        self.cache_filename = cache_filename
+        self._entries: Dict[str, CacheEntry] = dict()
+        self._changed = False
+        self.hits = 0
+        self.misses = 0
+
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.cache_filename, "rb") as f:
+                data = pickle.load(f)
+            if data.get("signature") == _get_signature():
+                self._entries = data["entries"]
+            else:
+                self._changed = True
+        except FileNotFoundError:
+            pass
+        except Exception as ex:
+            _exec_logger.warning(f"Ignoring discovery cache {self.cache_filename}, {ex}")
+
+    def get(self, full_path_filename: str) -> Union[FileMetadata, None]:
+        entry = self._entries.get(full_path_filename)
+        if entry is not None:
+            stamp = _get_unchanged_stamp(FileStamp(full_path_filename, entry.mtime_ns, entry.size, entry.sha1))
+            source_stamps = tuple(_get_unchanged_stamp(source_stamp) for source_stamp in entry.source_stamps)
+            if stamp is not None and all(source_stamps):
+                # touched but not changed, keeps the new mtimes
+                if stamp.mtime_ns != entry.mtime_ns or source_stamps != entry.source_stamps:
+                    self._entries[full_path_filename] = entry._replace(mtime_ns=stamp.mtime_ns, source_stamps=source_stamps)
+                    self._changed = True
+                self.hits += 1
+                return entry.file_metadata
+
+        self.misses += 1
+        return None
+
+    def put(self, full_path_filename: str, file_metadata: FileMetadata):
+        if not file_metadata.cacheable:
+            if self._entries.pop(full_path_filename, None) is not None:
+                self._changed = True
+            return
+
+        stamp = get_file_stamp(full_path_filename)
+        source_stamps = tuple(get_file_stamp(source_file) for source_file in file_metadata.source_files)
+        self._entries[full_path_filename] = CacheEntry(stamp.mtime_ns, stamp.size, stamp.sha1, file_metadata, source_stamps)
+        self._changed = True
+
+    def save(self):
+        # forget files that no longer exist
+        for full_path_filename in [fpn for fpn in self._entries if not os.path.isfile(fpn)]:
+            del self._entries[full_path_filename]
+            self._changed = True
+
+        if not self._changed:
+            return
+
+        try:
+            os.makedirs(os.path.dirname(self.cache_filename), exist_ok=True)
+            tmp_filename = f"{self.cache_filename}.{os.getpid()}.tmp"
+            with open(tmp_filename, "wb") as f:
+                pickle.dump({"signature": _get_signature(), "entries": self._entries}, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_filename, self.cache_filename)
+            self._changed = False
+        except Exception as ex:
+            _exec_logger.warning(f"Could not save discovery cache {self.cache_filename}, {ex}")
+
+    def __repr__(self):
+        return f"<DiscoveryCache {self.cache_filename}: {len(self._entries)} files, {self.hits} hits, {self.misses} misses>"
@@ -0,0 +1,302 @@
+import os
+import ast
+import sys
+import inspect
+import importlib.util
+
+from typing import List, Dict, NamedTuple, Any, Tuple, Union
+
+from testipy.configs import default_config
+from testipy.lib_modules import py_inspector
+from testipy.engine.read_tests_utils import TYPE_DOC, get_doc_dict, get_doc_dict_from_docstring
+
+
+TYPE_FUNCTION_NODE = Union[ast.FunctionDef, ast.AsyncFunctionDef]
+_FUNCTION_NODES = (ast.FunctionDef, ast.AsyncFunctionDef)
+
+
+class MethodMetadata(NamedTuple):
+    method_name: str
+    doc: TYPE_DOC
+    comment: str
+    ncycles: Any
+    param: Any
+    is_function: bool
+
+
+class SuiteMetadata(NamedTuple):
+    suite_name: str
+    doc: TYPE_DOC
+    comment: str
+    method_metadata_list: List[MethodMetadata]
+
+
+class FileMetadata(NamedTuple):
+    suite_metadata_list: List[SuiteMetadata]
+    cacheable: bool
+    # other .py files with classes of the suites (or their bases), that change the metadata too
+    source_files: Tuple[str, ...] = ()
+
+
+# returns bool, if the value can be rebuilt from its repr, so it is safe to store and share
+def is_literal(value) -> bool:
+    try:
+        return ast.literal_eval(repr(value)) == value
+    except Exception:
+        return False
+
+
+# returns list, with the .py files where the class and all its bases were defined, apart from full_path_filename
+def get_class_source_files(class_obj: type, full_path_filename: str) -> List[str]:
+    source_files = []
+    for cls in class_obj.__mro__:
+        module_file = getattr(sys.modules.get(cls.__module__), "__file__", None)
+        if module_file and module_file.endswith(".py"):
+            module_file = os.path.abspath(module_file)
+            if module_file != full_path_filename and module_file not in source_files:
+                source_files.append(module_file)
+    return source_files
+
+
+def get_suite_name_trimmed(suite_name: str) -> str:
+    return suite_name[len(default_config.prefix_suite):] if default_config.trim_prefix_suite else suite_name
+
+
+def get_method_name_trimmed(method_name: str) -> str:
+    return method_name[len(default_config.prefix_tests):] if default_config.trim_prefix_tests else method_name
+
+
+# returns FileMetadata with all suites and test methods found, by importing (executing) the .py file
+def read_file_metadata_by_import(full_path_filename: str, root_folder: str = "") -> FileMetadata:
+    suite_metadata_list: List[SuiteMetadata] = []
+    source_files: List[str] = []
+    cacheable = True
+
+    module_obj = py_inspector.import_module_from_file(full_path_filename, root_folder)
+    for suite_name, suite_obj in inspect.getmembers(module_obj):
+        if suite_name.startswith(default_config.prefix_suite) and suite_name not in ["SuiteDetails"] and inspect.isclass(suite_obj):
+            method_metadata_list: List[MethodMetadata] = []
+            source_files += [sf for sf in get_class_source_files(suite_obj, os.path.abspath(full_path_filename)) if sf not in source_files]
+
+            for method_name, method_obj in inspect.getmembers(suite_obj):
+                if method_name.startswith(default_config.prefix_tests):
+                    ncycles = py_inspector.get_method_parameter_default_value(method_obj, "ncycles", 1)
+                    param = py_inspector.get_method_parameter_default_value(method_obj, "param", None)
+                    cacheable = cacheable and is_literal(ncycles) and is_literal(param)
+
+                    method_metadata_list.append(MethodMetadata(
+                        method_name=method_name,
+                        doc=get_doc_dict(method_obj, get_method_name_trimmed(method_name)),
+                        comment=py_inspector.get_comment(method_obj) or "",
+                        ncycles=ncycles,
+                        param=param,
+                        is_function=inspect.isfunction(method_obj)
+                    ))
+
+            suite_metadata_list.append(SuiteMetadata(
+                suite_name=suite_name,
+                doc=get_doc_dict(suite_obj, get_suite_name_trimmed(suite_name)),
+                comment=py_inspector.get_comment(suite_obj) or "",
+                method_metadata_list=method_metadata_list
+            ))
+
+    return FileMetadata(suite_metadata_list, cacheable, tuple(source_files))
+
+
+class _CannotReadStatically(Exception):
+    pass
+
+
+def _is_suite_name(name: str) -> bool:
+    return name.startswith(default_config.prefix_suite) and name not in ["SuiteDetails"]
+
+
+# returns the source line (0 based) where inspect would say the class or function starts
+def _get_first_lineno(node: Union[ast.ClassDef, TYPE_FUNCTION_NODE]) -> int:
+    return (node.decorator_list[0].lineno if node.decorator_list else node.lineno) - 1
+
+
+# returns dict with all classes defined at module level, or raise if a suite can be defined/imported in a dynamic way
+def _get_module_classes(tree: ast.Module) -> Dict[str, ast.ClassDef]:
+    classes: Dict[str, ast.ClassDef] = dict()
+
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef):
+            classes[node.name] = node
+        elif isinstance(node, ast.ImportFrom):
+            for alias in node.names:
+                if alias.name == "*" or _is_suite_name(alias.asname or alias.name):
+                    raise _CannotReadStatically(f"suite imported from {node.module}")
+        else:
+            for child in ast.walk(node):
+                if isinstance(child, ast.ClassDef) and _is_suite_name(child.name):
+                    raise _CannotReadStatically(f"suite {child.name} defined inside a statement")
+                if isinstance(child, ast.Name) and isinstance(child.ctx, ast.Store) and _is_suite_name(child.id):
+                    raise _CannotReadStatically(f"suite {child.id} assigned")
+
+    return classes
+
+
+# returns list with the class and all its bases, in method resolution order (C3 linearization, as python does)
+def _get_class_chain(class_node: ast.ClassDef, classes: Dict[str, ast.ClassDef], _subclasses: Tuple[str, ...] = ()) -> List[ast.ClassDef]:
+    if class_node.decorator_list or class_node.keywords:
+        raise _CannotReadStatically(f"class {class_node.name} has decorators or keywords")
+
+    bases: List[ast.ClassDef] = []
+    for base in class_node.bases:
+        if isinstance(base, ast.Name) and base.id == "object":
+            continue
+        if not isinstance(base, ast.Name) or base.id not in classes or base.id in _subclasses + (class_node.name,):
+            raise _CannotReadStatically(f"class {class_node.name} has bases outside this file")
+        bases.append(classes[base.id])
+
+    base_chains = [_get_class_chain(base_node, classes, _subclasses + (class_node.name,)) for base_node in bases]
+    return [class_node] + _merge_chains(base_chains + [bases], class_node.name)
+
+
+# returns list, with the classes of all chains, each one only after its subclasses, keeping the order of each chain
+def _merge_chains(chains: List[List[ast.ClassDef]], class_name: str) -> List[ast.ClassDef]:
+    chains = [list(chain) for chain in chains if chain]
+    merged = []
+    while chains:
+        for chain in chains:
+            head = chain[0]
+            if not any(head in other[1:] for other in chains):
+                break
+        else:
+            raise _CannotReadStatically(f"class {class_name} has no consistent method resolution order")
+
+        merged.append(head)
+        chains = [chain[1:] if chain[0] is head else chain for chain in chains]
+        chains = [chain for chain in chains if chain]
+
+    return merged
+
+
+# returns dict with test methods, and the class where each one was defined
+def _get_test_methods(chain: List[ast.ClassDef]) -> Dict[str, Tuple[TYPE_FUNCTION_NODE, ast.ClassDef]]:
+    test_methods: Dict[str, Tuple[TYPE_FUNCTION_NODE, ast.ClassDef]] = dict()
+
+    # bases first, so methods redefined on subclasses will override them
+    for class_node in reversed(chain):
+        for node in class_node.body:
+            if isinstance(node, _FUNCTION_NODES):
+                if node.name.startswith(default_config.prefix_tests):
+                    for decorator in node.decorator_list:
+                        if not (isinstance(decorator, ast.Name) and decorator.id == "staticmethod"):
+                            raise _CannotReadStatically(f"method {node.name} has decorators")
+                    test_methods[node.name] = (node, class_node)
+            elif isinstance(node, ast.ClassDef):
+                continue
+            else:
+                for child in ast.walk(node):
+                    if isinstance(child, (ast.Name, ast.FunctionDef, ast.AsyncFunctionDef)):
+                        name = child.id if isinstance(child, ast.Name) else child.name
+                        if name.startswith(default_config.prefix_tests) and (not isinstance(child, ast.Name) or isinstance(child.ctx, ast.Store)):
+                            raise _CannotReadStatically(f"member {name} defined in a dynamic way")
+
+    return test_methods
+
+
+# returns str docstring of class, or the first one found on its bases, same as inspect.getdoc
+def _get_class_docstring(chain: List[ast.ClassDef]) -> str:
+    for class_node in chain:
+        doc = ast.get_docstring(class_node)
+        if doc is not None:
+            return doc
+    return None
+
+
+# returns str docstring of method, or the one of the same method on the bases of the class where it was defined
+def _get_method_docstring(node: TYPE_FUNCTION_NODE, owner_chain: List[ast.ClassDef]) -> str:
+    doc = ast.get_docstring(node)
+    if doc is not None:
+        return doc
+
+    for class_node in owner_chain[1:]:
+        for base_node in class_node.body:
+            if isinstance(base_node, _FUNCTION_NODES) and base_node.name == node.name:
+                doc = ast.get_docstring(base_node)
+                if doc is not None:
+                    return doc
+    return None
+
+
+# returns the default value of a parameter on the method definition
+def _get_parameter_default_value(node: TYPE_FUNCTION_NODE, param_name: str, your_default_value=None):
+    args = node.args
+    for variadic in (args.vararg, args.kwarg):
+        if variadic is not None and variadic.arg == param_name:
+            raise _CannotReadStatically(f"{node.name} has variadic {param_name}")
+
+    positional = args.posonlyargs + args.args
+    defaults = [None] * (len(positional) - len(args.defaults)) + list(args.defaults)
+    for arg, default in list(zip(positional, defaults)) + list(zip(args.kwonlyargs, args.kw_defaults)):
+        if arg.arg == param_name:
+            if default is None:
+                raise _CannotReadStatically(f"{node.name} has no default value for {param_name}")
+            try:
+                return ast.literal_eval(default)
+            except (ValueError, TypeError, SyntaxError):
+                raise _CannotReadStatically(f"{node.name} default value for {param_name} is not a literal")
+
+    return your_default_value
+
+
+# returns FileMetadata with all suites and test methods found, by parsing the .py file without executing it
+# or None, if the file has suites defined in a way that can only be known by importing it
+def read_file_metadata_by_ast(full_path_filename: str) -> Union[FileMetadata, None]:
+    with open(full_path_filename, "rb") as f:
+        source = importlib.util.decode_source(f.read())
+
+    try:
+        tree = ast.parse(source, filename=full_path_filename)
+        lines = source.splitlines(True)
+        classes = _get_module_classes(tree)
+
+        suite_metadata_list: List[SuiteMetadata] = []
+        for suite_name in sorted(classes):
+            if not _is_suite_name(suite_name):
+                continue
+
+            suite_node = classes[suite_name]
+            chain = _get_class_chain(suite_node, classes)
+
+            method_metadata_list: List[MethodMetadata] = []
+            for method_name, (node, owner) in sorted(_get_test_methods(chain).items()):
+                method_metadata_list.append(MethodMetadata(
+                    method_name=method_name,
+                    doc=get_doc_dict_from_docstring(
+                        _get_method_docstring(node, _get_class_chain(owner, classes)),
+                        get_method_name_trimmed(method_name),
+                        f"{full_path_filename}:{suite_name}.{method_name}"),
+                    comment=py_inspector.format_comment(py_inspector.get_comments_from_source_lines(lines, _get_first_lineno(node))) or "",
+                    ncycles=_get_parameter_default_value(node, "ncycles", 1),
+                    param=_get_parameter_default_value(node, "param", None),
+                    is_function=True
+                ))
+
+            suite_metadata_list.append(SuiteMetadata(
+                suite_name=suite_name,
+                doc=get_doc_dict_from_docstring(_get_class_docstring(chain), get_suite_name_trimmed(suite_name), f"{full_path_filename}:{suite_name}"),
+                comment=py_inspector.format_comment(py_inspector.get_comments_from_source_lines(lines, _get_first_lineno(suite_node))) or "",
+                method_metadata_list=method_metadata_list
+            ))
+    except (_CannotReadStatically, SyntaxError):
+        return None
+
+    return FileMetadata(suite_metadata_list, True)
+
+
+# returns FileMetadata, statically if possible (and requested), otherwise by importing the file
+def read_file_metadata(full_path_filename: str, root_folder: str = "", use_ast: bool = False) -> FileMetadata:
+    file_metadata = read_file_metadata_by_ast(full_path_filename) if use_ast else None
+    if file_metadata is None:
+        file_metadata = read_file_metadata_by_import(full_path_filename, root_folder)
+    return file_metadata
+
+
+# returns FileMetadata to be sent back from a discovery process, or None if it must be read by the main process
+def read_file_metadata_in_worker(full_path_filename: str, root_folder: str = "", use_ast: bool = False) -> Union[FileMetadata, None]:
+    file_metadata = read_file_metadata(full_path_filename, root_folder, use_ast)
+    return file_metadata if file_metadata.cacheable else None
@@ -0,0 +1,160 @@
+import os
+import ast
+import json
+
+from typing import List, Dict
+
+from testipy import __version__, get_exec_logger
+from testipy.lib_modules import py_inspector
+from testipy.models.attr import PackageAttr, SuiteAttr, TestMethodAttr
+from testipy.engine.read_tests_metadata import is_literal
+
+
+PLAN_FORMAT = 1
+
+_exec_logger = get_exec_logger()
+
+
+# <editor-fold desc="--- Save ---">
+def _method_to_dict(test_method_attr: TestMethodAttr) -> Dict:
+    method_dict = test_method_attr.get_common_attr_as_dict()
+
+    # literals are saved with repr, so tuples and sets are loaded back as they were
+    if is_literal(test_method_attr.param):
+        method_dict["param"] = repr(test_method_attr.param)
+    else:
+        method_dict["param"] = None
+        method_dict["param_from_source"] = True
+
+    return method_dict
+
+
+def suite_to_dict(suite_attr: SuiteAttr, full_path_tests_scripts_foldername: str) -> Dict:
+    return dict(
+        filename=suite_attr.filename,
+        full_path_filename=os.path.relpath(suite_attr.full_path_filename, full_path_tests_scripts_foldername),
+        suite_name=suite_attr.suite_name,
+        suite_id=suite_attr.suite_id,
+        suite_kwargs=suite_attr.suite_kwargs,
+        ncycles=suite_attr.ncycles,
+
+        name=suite_attr.name,
+        comment=suite_attr.comment,
+        prio=suite_attr.prio,
+        level=suite_attr.level,
+        features=suite_attr.features,
+        test_number=suite_attr.test_number,
+        tags=sorted(suite_attr.tags),
+        parallel=suite_attr.parallel,
+        timeout=suite_attr.timeout,
+        fixtures=list(suite_attr.fixtures),
+
+        test_method_list=[_method_to_dict(test_method_attr) for test_method_attr in suite_attr.test_method_attr_list]
+    )
+
+
+def save_plan(plan_filename: str, package_attr_list: List[PackageAttr], full_path_tests_scripts_foldername: str):
+    plan = dict(
+        plan_format=PLAN_FORMAT,
+        testipy_version=__version__,
+        package_list=[dict(
+            package_name=package_attr.package_name,
+            package_id=package_attr.package_id,
+            ncycles=package_attr.ncycles,
+            suite_list=[suite_to_dict(suite_attr, full_path_tests_scripts_foldername) for suite_attr in package_attr.suite_attr_list]
+        ) for package_attr in package_attr_list]
+    )
+
+    folder = os.path.dirname(os.path.abspath(plan_filename))
+    os.makedirs(folder, exist_ok=True)
+    with open(plan_filename, "w") as f:
+        json.dump(plan, f, indent=1)
+
+    _exec_logger.info(f"Saved execution plan to {plan_filename}")
+# </editor-fold>
+
+
+# <editor-fold desc="--- Load ---">
+def _method_from_dict(suite_attr: SuiteAttr, method_dict: Dict) -> TestMethodAttr:
+    test_method_attr = TestMethodAttr(
+        suite_attr=suite_attr,
+
+        method_name=method_dict["method_name"],
+
+        param=None if method_dict["param"] is None else ast.literal_eval(method_dict["param"]),
+        ncycles=method_dict["ncycles"],
+
+        name=method_dict["name"],
+        comment=method_dict["comment"],
+        prio=method_dict["prio"],
+        level=method_dict["level"],
+        features=method_dict["features"],
+        test_number=method_dict["test_number"],
+        tags=set(method_dict["tags"]),
+
+        depends=set(method_dict["depends"]),
+        on_success=set(method_dict["on_success"]),
+        on_failure=set(method_dict["on_failure"]),
+        timeout=method_dict.get("timeout", 0.0),
+    )
+    test_method_attr.method_id = method_dict["method_id"]
+
+    # param default value was not a literal, so it can only come from the module itself
+    if method_dict.get("param_from_source"):
+        test_method_attr.param = py_inspector.get_method_parameter_default_value(test_method_attr.method_obj, "param", None)
+
+    return test_method_attr
+
+
+def suite_from_dict(package_attr: PackageAttr, suite_dict: Dict, full_path_tests_scripts_foldername: str) -> SuiteAttr:
+    suite_attr = SuiteAttr(
+        package_attr=package_attr,
+
+        filename=suite_dict["filename"],
+        full_path_filename=os.path.join(full_path_tests_scripts_foldername, suite_dict["full_path_filename"]),
+        suite_name=suite_dict["suite_name"],
+        suite_kwargs=suite_dict["suite_kwargs"],
+        ncycles=suite_dict["ncycles"],
+
+        name=suite_dict["name"],
+        comment=suite_dict["comment"],
+        prio=suite_dict["prio"],
+        level=suite_dict["level"],
+        features=suite_dict["features"],
+        test_number=suite_dict["test_number"],
+        tags=set(suite_dict["tags"]),
+        parallel=suite_dict.get("parallel", 0),
+        timeout=suite_dict.get("timeout", 0.0),
+        fixtures=suite_dict.get("fixtures", []),
+    )
+    suite_attr.suite_id = suite_dict["suite_id"]
+
+    for method_dict in suite_dict["test_method_list"]:
+        _method_from_dict(suite_attr, method_dict)
+
+    return suite_attr
+
+
+# returns list of PackageAttr, exactly as they were when the plan was saved (ids included), without reading any test file
+def load_plan(plan_filename: str, full_path_tests_scripts_foldername: str) -> List[PackageAttr]:
+    with open(plan_filename, "r") as f:
+        plan = json.load(f)
+
+    if plan.get("plan_format") != PLAN_FORMAT:
+        raise ValueError(f"Execution plan {plan_filename} has format {plan.get('plan_format')}, expected {PLAN_FORMAT}")
+    if plan.get("testipy_version") != __version__:
+        _exec_logger.warning(f"Execution plan {plan_filename} was saved by version {plan.get('testipy_version')}, running {__version__}")
+
+    package_attr_list: List[PackageAttr] = []
+    for package_dict in plan["package_list"]:
+        package_attr = PackageAttr(package_dict["package_name"], ncycles=package_dict["ncycles"])
+        package_attr.package_id = package_dict["package_id"]
+
+        for suite_dict in package_dict["suite_list"]:
+            suite_from_dict(package_attr, suite_dict, full_path_tests_scripts_foldername)
+
+        package_attr_list.append(package_attr)
+
+    _exec_logger.info(f"Loaded execution plan from {plan_filename}")
+    return package_attr_list
+# </editor-fold>
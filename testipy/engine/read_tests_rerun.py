@@ -0,0 +1,107 @@
+from __future__ import annotations
+import os
+import json
+
+from typing import Callable, Dict, List, Set, Tuple, TYPE_CHECKING
+
+from testipy import get_exec_logger
+from testipy.configs import default_config
+from testipy.models import PackageAttr, TestMethodAttr
+from testipy.engine.suite_history import get_method_key
+
+if TYPE_CHECKING:
+    from testipy.models import PackageManager
+
+
+_exec_logger = get_exec_logger()
+
+RESULTS_TESTS_FORMAT = 1
+
+
+# returns str, with the full path of the tests results of that results folder (or the file itself, if given)
+def get_results_tests_filename(results_folder: str) -> str:
+    if os.path.isdir(results_folder):
+        return os.path.join(results_folder, default_config.results_tests_filename)
+    return results_folder
+
+
+# saves the state of each test, by its test method, so the failed ones can run again with -rerun-failed
+def save_results_tests(pm: PackageManager, filename: str):
+    tests = []
+    for pd in pm.all_packages:
+        for sd in pd.suite_manager.all_suites:
+            for current_test in sd.test_manager.all_tests:
+                # tests not started by a test method can't run again
+                if current_test.test_method_attr is None:
+                    continue
+                tests.append(dict(
+                    method_key=get_method_key(current_test.test_method_attr),
+                    package_name=pd.get_name(), suite_name=sd.get_name(), test_name=current_test.get_name(),
+                    usecase=current_test.get_usecase(),
+                    state=current_test.get_state(),
+                    reason_of_state=current_test.get_reason_of_state(),
+                ))
+
+    try:
+        with open(filename, "w") as f:
+            json.dump(dict(results_tests_format=RESULTS_TESTS_FORMAT, tests=tests), f, indent=1)
+    except OSError as ex:
+        _exec_logger.warning(f"Could not save tests results {filename}, {ex}")
+
+
+# returns dict, with the usecases of the failed tests of each test method (by its key), on the results of a previous run
+def load_failed_tests(results_folder: str) -> Dict[str, Set[str]]:
+    filename = get_results_tests_filename(results_folder)
+    with open(filename, "r") as f:
+        results = json.load(f)
+    if results.get("results_tests_format") != RESULTS_TESTS_FORMAT:
+        raise ValueError(f"Tests results {filename} are not supported, format {results.get('results_tests_format')} is not {RESULTS_TESTS_FORMAT}")
+
+    failed: Dict[str, Set[str]] = dict()
+    for test in results["tests"]:
+        if test["state"] in default_config.rerun_failed_states:
+            failed.setdefault(test["method_key"], set()).add(test["usecase"])
+    return failed
+
+
+# returns list of PackageAttr, only with the failed test methods, the ones they @DEPENDS on, and the SETUP/TEARDOWN
+# (auto_include_tests_with_tags) of their suites, keeping the order and ids of the selected tests
+def select_failed_tests(selected_tests: List[PackageAttr], failed: Dict[str, Set[str]]) -> List[PackageAttr]:
+    selected_tests, failed_methods, included = select_test_methods(selected_tests, lambda ma: get_method_key(ma) in failed)
+
+    found = set(map(get_method_key, failed_methods))
+    for test_method_attr in failed_methods:
+        _exec_logger.debug(f"Rerun {get_method_key(test_method_attr)}, failed usecases: {', '.join(sorted(failed[get_method_key(test_method_attr)]))}")
+
+    _exec_logger.info(f"Rerun {len(failed_methods)} failed test methods, with {len(included)} they depend on or SETUP/TEARDOWN")
+    if len(found) < len(failed):
+        _exec_logger.warning(f"{len(failed) - len(found)} failed test methods are not on the selected tests")
+
+    return selected_tests
+
+
+# returns (list of PackageAttr, list of TestMethodAttr, list of TestMethodAttr), the selected tests only with the test
+# methods to keep, the ones they @DEPENDS on, and the SETUP/TEARDOWN of their suites, then the ones kept and the ones included
+def select_test_methods(selected_tests: List[PackageAttr], keep: Callable[[TestMethodAttr], bool]) -> Tuple[List[PackageAttr], List[TestMethodAttr], List[TestMethodAttr]]:
+    all_kept, all_included = [], []
+
+    for package_attr in selected_tests:
+        for suite_attr in list(package_attr.suite_attr_list):
+            kept = [ma for ma in suite_attr.test_method_attr_list if keep(ma)]
+            if not kept:
+                package_attr.remove_suite_attr(suite_attr)
+                continue
+
+            included = [ma for ma in suite_attr.test_method_attr_list if ma not in kept and _is_auto_included(ma)]
+            included += [ma for ma in suite_attr.dependency_graph.get_closure(kept + included) if ma not in included]
+            ids = set(map(id, kept + included))
+            suite_attr.test_method_attr_list[:] = [ma for ma in suite_attr.test_method_attr_list if id(ma) in ids]
+
+            all_kept += kept
+            all_included += included
+
+    return [package_attr for package_attr in selected_tests if package_attr.suite_attr_list], all_kept, all_included
+
+
+def _is_auto_included(test_method_attr: TestMethodAttr) -> bool:
+    return any(tag in test_method_attr.tags for tag in default_config.auto_include_tests_with_tags)
@@ -0,0 +1,397 @@
+from __future__ import annotations
+
+from typing import List, Dict, Tuple, Iterable, Union
+
+from testipy.configs import enums_data, default_config
+from testipy.engine.read_tests_utils import TYPE_DOC, is_auto_include_test_tag
+
+
+class TagBits:
+    """
+    Interns tags as bit positions, so a set of tags becomes an int and tag lists are compared with bitwise operations.
+    Only the tags of the selection options get a bit, so the masks stay as small as those; any other tag is 0.
+    """
+
+    def __init__(self):
+        self._bit_by_tag: Dict[str, int] = dict()
+
+    # returns int, the bit of the tag, a new one if not interned yet (only for the selection options)
+    def get_bit(self, tag: str) -> int:
+        bit = self._bit_by_tag.get(tag)
+        if bit is None:
+            bit = self._bit_by_tag[tag] = 1 << len(self._bit_by_tag)
+        return bit
+
+    # returns int, the mask with the bits of all tags, interning them (only for the selection options)
+    def get_and_mask(self, tags: Iterable[str]) -> int:
+        mask = 0
+        for tag in tags:
+            mask |= self.get_bit(tag)
+        return mask
+
+    # returns int, the mask with the bits of the tags interned, the others are not selected by any option
+    def get_mask(self, tags: Iterable[str]) -> int:
+        bit_by_tag = self._bit_by_tag
+        mask = 0
+        for tag in tags:
+            mask |= bit_by_tag.get(tag, 0)
+        return mask
+
+    def __len__(self):
+        return len(self._bit_by_tag)
+
+
+class TagFilter:
+    """
+    Compiled include/exclude tag lists. Each entry can have several tags joined with & to make an AND.
+    """
+
+    def __init__(self, tag_bits: TagBits, include_tags: List[str] = None, exclude_tags: List[str] = None):
+        self._include_masks: List[int] = [self._get_and_mask(tag_bits, tags) for tags in include_tags or []]
+        self._exclude_masks: List[int] = [self._get_and_mask(tag_bits, tags) for tags in exclude_tags or []]
+
+    @staticmethod
+    def _get_and_mask(tag_bits: TagBits, tags: str) -> int:
+        return tag_bits.get_and_mask(tags.split(default_config.separator_and_join_tags))
+
+    @staticmethod
+    def _any(mask: int, and_masks: List[int]) -> bool:
+        for and_mask in and_masks:
+            if mask & and_mask == and_mask:
+                return True
+        return False
+
+    def is_valid(self, mask: int) -> bool:
+        if self._exclude_masks and self._any(mask, self._exclude_masks):
+            return False
+        if self._include_masks:
+            return self._any(mask, self._include_masks)
+        return True
+
+    def __bool__(self):
+        return bool(self._include_masks or self._exclude_masks)
+
+
+class PrefixTrie:
+    """
+    Tells if a text begins with any of the prefixes added, walking the text only once.
+    """
+
+    _END = ""
+
+    def __init__(self, prefixes: Iterable[str] = ()):
+        self._root: Dict = dict()
+        for prefix in prefixes:
+            self.add(prefix)
+
+    def add(self, prefix: str) -> PrefixTrie:
+        node = self._root
+        for char in prefix:
+            node = node.setdefault(char, dict())
+        node[self._END] = True
+        return self
+
+    def begins_with_any(self, text: str) -> bool:
+        node = self._root
+        if self._END in node:
+            return True
+        for char in text:
+            node = node.get(char)
+            if node is None:
+                return False
+            if self._END in node:
+                return True
+        return False
+
+    def __bool__(self):
+        return bool(self._root)
+
+
+class TestNumberFilter:
+    """
+    Compiled include/exclude @TN lists, where each @TN is selected if it begins with any of them.
+    """
+
+    def __init__(self, include_testnumber: List[str] = None, exclude_testnumber: List[str] = None):
+        self._include = PrefixTrie(include_testnumber or [])
+        self._exclude = PrefixTrie(exclude_testnumber or [])
+
+    def __bool__(self):
+        return bool(self._include or self._exclude)
+
+    def is_valid(self, test_numbers: List[str]) -> bool:
+        if test_numbers:
+            if self._exclude:
+                for test_number in test_numbers:
+                    if self._exclude.begins_with_any(test_number):
+                        return False
+
+            if self._include:
+                for test_number in test_numbers:
+                    if self._include.begins_with_any(test_number):
+                        return True
+                return False
+        elif self._include:
+            return False
+
+        return True
+
+
+class LevelFilter:
+    """
+    Compiled -ilv -elv -alv -blv options.
+    """
+
+    def __init__(self, level_filter: Tuple[List, List, List, List] = ([], [], [], [])):
+        include_level, exclude_level, above_level, below_level = level_filter
+
+        self._no_filter = not (include_level or exclude_level or above_level or below_level)
+        self._include_level = set(str(level) for level in include_level)
+        self._exclude_level = set(str(level) for level in exclude_level)
+        self._above_level = int(above_level[-1]) if above_level else None
+        self._below_level = int(below_level[-1]) if below_level else None
+
+    def is_valid(self, test_level: int) -> bool:
+        # no filter, then all included
+        if self._no_filter:
+            return True
+
+        # cherry-pick level
+        str_test_level = str(test_level)
+        if str_test_level in self._exclude_level:
+            return False
+        if str_test_level in self._include_level:
+            return True
+
+        # group select
+        if self._above_level is not None:
+            if self._below_level is not None:
+                return self._above_level <= test_level <= self._below_level
+            return test_level >= self._above_level
+        if self._below_level is not None:
+            return test_level <= self._below_level
+
+        return len(self._include_level) == 0
+
+
+# <editor-fold desc="--- Select expression ---">
+class _Node:
+    def evaluate(self, mask: int) -> bool:
+        raise NotImplementedError
+
+
+class _Tag(_Node):
+    def __init__(self, bit: int):
+        self.bit = bit
+
+    def evaluate(self, mask: int) -> bool:
+        return mask & self.bit != 0
+
+
+class _AllTags(_Node):
+    def __init__(self, and_mask: int):
+        self.and_mask = and_mask
+
+    def evaluate(self, mask: int) -> bool:
+        return mask & self.and_mask == self.and_mask
+
+
+class _Not(_Node):
+    def __init__(self, node: _Node):
+        self.node = node
+
+    def evaluate(self, mask: int) -> bool:
+        return not self.node.evaluate(mask)
+
+
+class _And(_Node):
+    def __init__(self, nodes: List[_Node]):
+        self.nodes = nodes
+
+    def evaluate(self, mask: int) -> bool:
+        for node in self.nodes:
+            if not node.evaluate(mask):
+                return False
+        return True
+
+
+class _Or(_Node):
+    def __init__(self, nodes: List[_Node]):
+        self.nodes = nodes
+
+    def evaluate(self, mask: int) -> bool:
+        for node in self.nodes:
+            if node.evaluate(mask):
+                return True
+        return False
+
+
+class _ExpressionParser:
+    """
+    expression := term ( "|" term )*
+    term       := factor ( "&" factor )*
+    factor     := "!" factor | "(" expression ")" | TAG
+    """
+
+    _OPERATORS = "&|!()"
+
+    def __init__(self, expression: str, tag_bits: TagBits):
+        self.expression = expression
+        self.tag_bits = tag_bits
+        self.tokens: List[Tuple[int, str]] = self._tokenize(expression)
+        self.pos = 0
+
+    def _tokenize(self, expression: str) -> List[Tuple[int, str]]:
+        tokens = []
+        i = 0
+        while i < len(expression):
+            char = expression[i]
+            if char.isspace():
+                i += 1
+            elif char in self._OPERATORS:
+                tokens.append((i, char))
+                i += 1
+            else:
+                start = i
+                while i < len(expression) and not expression[i].isspace() and expression[i] not in self._OPERATORS:
+                    i += 1
+                tokens.append((start, expression[start:i]))
+        return tokens
+
+    def _peek(self) -> Union[str, None]:
+        return self.tokens[self.pos][1] if self.pos < len(self.tokens) else None
+
+    def _error(self, message: str) -> ValueError:
+        column = self.tokens[self.pos][0] if self.pos < len(self.tokens) else len(self.expression)
+        return ValueError(f"Invalid -select expression '{self.expression}', {message} at column {column + 1}")
+
+    def parse(self) -> _Node:
+        if not self.tokens:
+            raise self._error("empty expression")
+        node = self._expression()
+        if self.pos < len(self.tokens):
+            raise self._error(f"unexpected '{self._peek()}'")
+        return node
+
+    def _expression(self) -> _Node:
+        nodes = [self._term()]
+        while self._peek() == "|":
+            self.pos += 1
+            nodes.append(self._term())
+        return nodes[0] if len(nodes) == 1 else _Or(nodes)
+
+    def _term(self) -> _Node:
+        nodes = [self._factor()]
+        while self._peek() == "&":
+            self.pos += 1
+            nodes.append(self._factor())
+        if len(nodes) == 1:
+            return nodes[0]
+
+        # join all plain tags into a single mask
+        tags = [node for node in nodes if isinstance(node, _Tag)]
+        others = [node for node in nodes if not isinstance(node, _Tag)]
+        if len(tags) > 1:
+            and_mask = 0
+            for tag in tags:
+                and_mask |= tag.bit
+            others.insert(0, _AllTags(and_mask))
+        else:
+            others = tags + others
+        return others[0] if len(others) == 1 else _And(others)
+
+    def _factor(self) -> _Node:
+        token = self._peek()
+        if token is None:
+            raise self._error("missing tag")
+        if token == "!":
+            self.pos += 1
+            return _Not(self._factor())
+        if token == "(":
+            self.pos += 1
+            node = self._expression()
+            if self._peek() != ")":
+                raise self._error("missing ')'")
+            self.pos += 1
+            return node
+        if token in self._OPERATORS:
+            raise self._error(f"unexpected '{token}'")
+        self.pos += 1
+        return _Tag(self.tag_bits.get_bit(token))
+
+
+def compile_select_expression(expression: str, tag_bits: TagBits) -> _Node:
+    return _ExpressionParser(expression, tag_bits).parse()
+# </editor-fold>
+
+
+class TestSelection:
+    """
+    All selection options (-is -es -it -et -if -ef -itn -etn -ilv -elv -alv -blv -select) compiled only once,
+    to be applied to every suite and test method found.
+    """
+
+    def __init__(self,
+                 include_suite_tag: List[str] = None, exclude_suite_tag: List[str] = None,
+                 include_test_tag: List[str] = None, exclude_test_tag: List[str] = None,
+                 level_filter: Tuple[List, List, List, List] = ([], [], [], []),
+                 include_feature: List[str] = None, exclude_feature: List[str] = None,
+                 include_testnumber: List[str] = None, exclude_testnumber: List[str] = None,
+                 select_expression: str = ""):
+        self.tag_bits = TagBits()
+
+        self._include_suite_filenames = set(include_suite_tag or [])
+        self._exclude_suite_filenames = set(exclude_suite_tag or [])
+        self._suite_tag_filter = TagFilter(self.tag_bits, include_suite_tag, exclude_suite_tag)
+        self._test_tag_filter = TagFilter(self.tag_bits, include_test_tag, exclude_test_tag)
+        self._feature_filter = TagFilter(self.tag_bits, include_feature, exclude_feature)
+        self._testnumber_filter = TestNumberFilter(include_testnumber, exclude_testnumber)
+        self._level_filter = LevelFilter(level_filter)
+        self._select: Union[_Node, None] = compile_select_expression(select_expression, self.tag_bits) if select_expression else None
+
+    # returns int, mask with the python name (with and without prefix), @NAME and @TAG
+    def _get_names_and_tags_mask(self, name: str, name_prefix: str, doc: TYPE_DOC) -> int:
+        return self.tag_bits.get_mask((name, name[len(name_prefix):], doc[enums_data.TAG_NAME], *doc[enums_data.TAG_TAG]))
+
+    @staticmethod
+    def _split_features(features: str) -> List[str]:
+        features = features.split(" ")
+        return [] if features == [""] else features
+
+    def get_suite_mask(self, suite_name: str, doc: TYPE_DOC) -> int:
+        return self._get_names_and_tags_mask(suite_name, default_config.prefix_suite, doc)
+
+    def is_valid_suite(self, suite_name: str, doc: TYPE_DOC, filename: str) -> bool:
+        module_name = filename.split(".")[0]
+        if module_name in self._include_suite_filenames and module_name not in self._exclude_suite_filenames:
+            return True
+
+        return (suite_name.startswith(default_config.prefix_suite) and doc[enums_data.TAG_LEVEL] > 0 and
+                self._suite_tag_filter.is_valid(self.get_suite_mask(suite_name, doc)))
+
+    def is_valid_test_method(self, method_name: str, doc: TYPE_DOC, suite_mask: int = 0) -> bool:
+        if not self._level_filter.is_valid(doc[enums_data.TAG_LEVEL]):
+            return False
+
+        if is_auto_include_test_tag(doc):
+            return True
+
+        if not method_name.startswith(default_config.prefix_tests) or doc[enums_data.TAG_LEVEL] <= 0:
+            return False
+
+        mask = 0
+        if self._test_tag_filter or self._select is not None:
+            mask = self._get_names_and_tags_mask(method_name, default_config.prefix_tests, doc)
+            if not self._test_tag_filter.is_valid(mask):
+                return False
+
+        if self._feature_filter or self._select is not None:
+            features_mask = self.tag_bits.get_mask(self._split_features(doc[enums_data.TAG_FEATURES]))
+            if not self._feature_filter.is_valid(features_mask):
+                return False
+            mask |= features_mask
+
+        if self._testnumber_filter and not self._testnumber_filter.is_valid(self._split_features(doc[enums_data.TAG_TESTNUMBER])):
+            return False
+
+        return self._select is None or self._select.evaluate(mask | suite_mask)
@@ -0,0 +1,99 @@
+from typing import List, NamedTuple, Tuple
+
+from testipy import get_exec_logger
+from testipy.models import PackageAttr, SuiteAttr
+from testipy.engine.suite_history import SuiteHistory, get_suite_key
+
+
+_exec_logger = get_exec_logger()
+
+
+class ShardSuite(NamedTuple):
+    suite_attr: SuiteAttr
+    expected_duration: float
+    from_history: bool
+
+
+# returns (int, int), from "i/N" (ex: 2/4), with 1 <= i <= N
+def parse_shard(shard: str) -> Tuple[int, int]:
+    try:
+        shard_index, shard_total = (int(value) for value in shard.split("/"))
+    except ValueError:
+        raise ValueError(f"Invalid shard '{shard}', expected i/N (ex: 2/4)")
+    if not 1 <= shard_index <= shard_total:
+        raise ValueError(f"Invalid shard '{shard}', must be between 1/{shard_total} and {shard_total}/{shard_total}")
+    return shard_index, shard_total
+
+
+# returns int, how many times the test methods of the suite are called
+def _get_total_runs(suite_attr: SuiteAttr) -> int:
+    return max(1, len(suite_attr.test_method_attr_list) * suite_attr.ncycles) * suite_attr.package.ncycles
+
+
+# returns list of ShardSuite, with the expected duration of each suite, from its recorded durations, or else
+# from its number of tests (by the average duration of a test of the recorded suites, or 1s if none recorded)
+def get_expected_durations(selected_tests: List[PackageAttr], history: SuiteHistory) -> List[ShardSuite]:
+    suites = [suite_attr for package_attr in selected_tests for suite_attr in package_attr.suite_attr_list]
+    recorded = {id(suite_attr): history.get(get_suite_key(suite_attr)) for suite_attr in suites}
+
+    with_history = [suite_attr for suite_attr in suites if recorded[id(suite_attr)] is not None]
+    total_runs = sum(_get_total_runs(suite_attr) for suite_attr in with_history)
+    seconds_per_test = sum(recorded[id(suite_attr)] * suite_attr.package.ncycles for suite_attr in with_history) / total_runs if total_runs else 1.0
+
+    return [ShardSuite(suite_attr, recorded[id(suite_attr)] * suite_attr.package.ncycles, True)
+            if recorded[id(suite_attr)] is not None else
+            ShardSuite(suite_attr, _get_total_runs(suite_attr) * seconds_per_test, False)
+            for suite_attr in suites]
+
+
+# returns list of shards, each with its ShardSuite list, always the same for the same selected tests and history,
+# longest suites first, each to the shard with less expected time (the first one if equal)
+def get_shards(selected_tests: List[PackageAttr], shard_total: int, history: SuiteHistory) -> List[List[ShardSuite]]:
+    shards: List[List[ShardSuite]] = [[] for _ in range(shard_total)]
+    shard_durations = [0.0] * shard_total
+
+    # by position on the plan when equal, since suite keys repeat with storyboards
+    expected = list(enumerate(get_expected_durations(selected_tests, history)))
+    for _, shard_suite in sorted(expected, key=lambda pos_suite: (-pos_suite[1].expected_duration, pos_suite[0])):
+        shard = min(range(shard_total), key=lambda i: (shard_durations[i], i))
+        shards[shard].append(shard_suite)
+        shard_durations[shard] += shard_suite.expected_duration
+
+    return shards
+
+
+# returns list of PackageAttr, only with the suites of that shard (1 based), keeping the order and ids of the plan
+def select_shard(selected_tests: List[PackageAttr], shard_index: int, shard_total: int, history: SuiteHistory) -> List[PackageAttr]:
+    shards = get_shards(selected_tests, shard_total, history)
+    in_shard = {id(shard_suite.suite_attr) for shard_suite in shards[shard_index - 1]}
+
+    for package_attr in selected_tests:
+        for suite_attr in [suite_attr for suite_attr in package_attr.suite_attr_list if id(suite_attr) not in in_shard]:
+            package_attr.remove_suite_attr(suite_attr)
+
+    expected = sum(shard_suite.expected_duration for shard_suite in shards[shard_index - 1])
+    _exec_logger.info(f"Shard {shard_index}/{shard_total}: {len(in_shard)} suites, expected {expected:.1f}s")
+
+    return [package_attr for package_attr in selected_tests if package_attr.suite_attr_list]
+
+
+# returns str, with the suites, tests and expected wall time of each shard
+def get_shard_report(shards: List[List[ShardSuite]], shard_index: int = 0) -> str:
+    from tabulate import tabulate
+
+    rows = []
+    for i, shard in enumerate(shards, start=1):
+        rows.append((
+            f"{i}/{len(shards)}" + (" *" if i == shard_index else ""),
+            len(shard),
+            sum(len(shard_suite.suite_attr.test_method_attr_list) for shard_suite in shard),
+            sum(shard_suite.expected_duration for shard_suite in shard),
+            sum(1 for shard_suite in shard if not shard_suite.from_history)))
+
+    durations = [row[3] for row in rows]
+    imbalance = max(durations) / (sum(durations) / len(durations)) if sum(durations) else 1.0
+
+    return "\n".join([
+        tabulate(rows, headers=("Shard", "Suites", "Test methods", "Expected s", "Suites without history"), floatfmt=".1f", tablefmt="simple"),
+        f"Longest shard is {imbalance:.2f}x the average",
+    ])
@@ -17,6 +17,11 @@ class ConfigFilters:
 
 # returns dict of doc from class or method
 def get_doc_dict(obj, name: str = "") -> TYPE_DOC:
+    return get_doc_dict_from_docstring(py_inspector.get_doc(obj), name, obj)
+
+
+# returns dict of doc from an already cleaned docstring, where is only used for error messages
+def get_doc_dict_from_docstring(doc: str, name: str = "", where: object = "") -> TYPE_DOC:
     doc_dict = dict()
     doc_dict[enums_data.TAG_NAME] = name
     doc_dict[enums_data.TAG_TAG] = set()
@@ -27,21 +32,33 @@ def get_doc_dict(obj, name: str = "") -> TYPE_DOC:
     doc_dict[enums_data.TAG_DEPENDS] = set()
     doc_dict[enums_data.TAG_ON_SUCCESS] = set()
     doc_dict[enums_data.TAG_ON_FAILURE] = set()
+    doc_dict[enums_data.TAG_PARALLEL] = 0
+    doc_dict[enums_data.TAG_TIMEOUT] = 0.0
+    doc_dict[enums_data.TAG_FIXTURES] = []
 
-    doc = py_inspector.get_doc(obj)
     if doc:
         for line in doc.split("\n"):
             if line.startswith(enums_data.PREFIX_TAGS):
                 if " " not in line:
-                    raise AttributeError(f"tag {line} must have arguments after, inside {obj}")
+                    raise AttributeError(f"tag {line} must have arguments after, inside {where}")
 
                 first_space = line.index(" ")
                 tag_name = line.upper()[:first_space] if first_space > 0 else line.strip().upper()
 
-                if tag_name in [enums_data.TAG_PRIO, enums_data.TAG_LEVEL]:
+                if tag_name in [enums_data.TAG_PRIO, enums_data.TAG_LEVEL, enums_data.TAG_PARALLEL]:
                     doc_dict[tag_name] = int(line[len(tag_name)+1:].strip())
                     continue
 
+                if tag_name == enums_data.TAG_TIMEOUT:
+                    doc_dict[tag_name] = float(line[len(tag_name)+1:].strip())
+                    continue
+
+                if tag_name == enums_data.TAG_FIXTURES:
+                    for fixture_name in line[len(tag_name)+1:].strip().split():
+                        if fixture_name not in doc_dict[tag_name]:
+                            doc_dict[tag_name].append(fixture_name)
+                    continue
+
                 if tag_name == enums_data.TAG_TAG:
                     for current_tag in line[len(tag_name)+1:].strip().upper().split():
                         doc_dict[tag_name].add(current_tag)
@@ -0,0 +1,177 @@
+import os
+import ast
+import json
+import inspect
+import hashlib
+
+from typing import Dict, List, Union
+
+from testipy import get_exec_logger
+from testipy.configs import default_config
+from testipy.lib_modules.common_methods import synchronized, get_current_date_time
+from testipy.models import TestMethodAttr
+from testipy.engine.read_tests_cache import get_file_hash
+from testipy.engine.suite_history import get_method_key
+
+
+_exec_logger = get_exec_logger()
+
+# increase when the fingerprint changes for the same test method
+RESULT_CACHE_FORMAT = 2
+
+
+# returns str, with full path of the result cache file for that tests folder and environment, so each one keeps its results
+def get_result_cache_filename(full_path_tests_scripts_foldername: str, environment_name: str) -> str:
+    folder_hash = hashlib.sha1(os.path.abspath(full_path_tests_scripts_foldername).encode()).hexdigest()[:16]
+    return os.path.join(default_config.default_cache_folder, default_config.result_cache_filename.format(f"{folder_hash}_{environment_name}"))
+
+
+# returns list of str, with the full path of the data files named on the suite file (ex: DDTMethods("data.yaml", ...))
+def get_referenced_data_files(full_path_filename: str) -> List[str]:
+    with open(full_path_filename, "r") as f:
+        tree = ast.parse(f.read(), full_path_filename)
+
+    folder = os.path.dirname(full_path_filename)
+    data_files = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Constant) and isinstance(node.value, str) and node.value.lower().endswith(default_config.result_cache_data_extensions):
+            # same as load_config, relative to the package folder, or else only its name on the package folder
+            for fpn in (os.path.join(folder, node.value), os.path.join(folder, os.path.basename(node.value))):
+                if os.path.isfile(fpn):
+                    data_files.add(os.path.abspath(fpn))
+                    break
+    return sorted(data_files)
+
+
+# returns bytes, with the constant of a code object, the same on every run (frozenset order changes with PYTHONHASHSEED)
+def _get_const_bytes(const) -> bytes:
+    if inspect.iscode(const):
+        return _get_code_bytes(const)
+    if isinstance(const, tuple):
+        return b"(" + b",".join(_get_const_bytes(item) for item in const) + b")"
+    if isinstance(const, frozenset):
+        return b"{" + b",".join(sorted(_get_const_bytes(item) for item in const)) + b"}"
+    return repr(const).encode()
+
+
+# returns bytes, with what the code object does, without its filename and line numbers (they change between machines)
+def _get_code_bytes(code) -> bytes:
+    consts = [_get_const_bytes(const) for const in code.co_consts]
+    return b"|".join([code.co_code, repr(code.co_names).encode(), repr(code.co_varnames).encode()] + consts)
+
+
+class ResultCache:
+    """
+    The fingerprint of each test method that passed, so it is not called again while its code, data and environment are
+    unchanged, and reported as a cached PASS instead (--cache-results).
+    The fingerprint is made of the test method code object, its suite file, the data files named on the suite file,
+    its param, the suite_kwargs and the environment name (-env). Modules imported by the suite file are not part of it.
+    """
+
+    def __init__(self, cache_filename: str, environment_name: str):
+        self.cache_filename = cache_filename
+        self.environment_name = environment_name
+        self._entries: Dict[str, Dict] = dict()
+        self._load()
+
+        # fingerprint of the test method (None if failed) of this run, by its key, until saved
+        self.changes: Dict[str, Union[Dict, None]] = dict()
+        self._fingerprints: Dict[str, str] = dict()
+        self._file_hashes: Dict[str, str] = dict()
+
+    def __getstate__(self):
+        # workers only need the recorded entries, and send back their changes
+        return dict(cache_filename=self.cache_filename, environment_name=self.environment_name, _entries=self._entries,
+                    changes=dict(), _fingerprints=dict(), _file_hashes=dict())
+
+    def _load(self):
+        try:
+            with open(self.cache_filename, "r") as f:
+                data = json.load(f)
+            if data.get("result_cache_format") == RESULT_CACHE_FORMAT:
+                self._entries = data["entries"]
+        except FileNotFoundError:
+            pass
+        except Exception as ex:
+            _exec_logger.warning(f"Ignoring result cache {self.cache_filename}, {ex}")
+
+    # returns str, sha1 of the file content, read once per run
+    def _get_file_hash(self, full_path_filename: str) -> str:
+        if full_path_filename not in self._file_hashes:
+            self._file_hashes[full_path_filename] = get_file_hash(full_path_filename)
+        return self._file_hashes[full_path_filename]
+
+    # returns str, with the fingerprint of the test method, or empty if it can't be made
+    @synchronized
+    def get_fingerprint(self, test_method_attr: TestMethodAttr) -> str:
+        method_key = get_method_key(test_method_attr)
+        if method_key in self._fingerprints:
+            return self._fingerprints[method_key]
+
+        suite_attr = test_method_attr.suite_attr
+        try:
+            method = inspect.unwrap(test_method_attr.method_obj)
+            sha1 = hashlib.sha1()
+            sha1.update(_get_code_bytes(method.__code__))
+            sha1.update(self._get_file_hash(suite_attr.full_path_filename).encode())
+            for fpn in get_referenced_data_files(suite_attr.full_path_filename):
+                sha1.update(f"{os.path.basename(fpn)}:{self._get_file_hash(fpn)}".encode())
+            sha1.update(json.dumps([test_method_attr.param, suite_attr.suite_kwargs, self.environment_name], sort_keys=True, default=str).encode())
+            fingerprint = sha1.hexdigest()
+        except Exception as ex:
+            _exec_logger.debug(f"No result cache for {method_key}, {ex}")
+            fingerprint = ""
+
+        self._fingerprints[method_key] = fingerprint
+        return fingerprint
+
+    # returns str, when the test method passed with the same fingerprint, or empty if it must be called
+    def get_passed(self, test_method_attr: TestMethodAttr) -> str:
+        if any(tag in test_method_attr.tags for tag in default_config.result_cache_never_tags):
+            return ""
+
+        entry = self._entries.get(get_method_key(test_method_attr))
+        fingerprint = self.get_fingerprint(test_method_attr) if entry else ""
+        if fingerprint and entry["fingerprint"] == fingerprint:
+            return entry["passed_at"]
+        return ""
+
+    # records the result of the test method called on this run
+    def add_result(self, test_method_attr: TestMethodAttr, passed: bool):
+        fingerprint = self.get_fingerprint(test_method_attr) if passed else ""
+        entry = dict(fingerprint=fingerprint, passed_at=get_current_date_time()) if fingerprint else None
+        self.add_changes({get_method_key(test_method_attr): entry})
+
+    # a test method that failed once (ex: on another package cycle) is not cached on this run
+    @synchronized
+    def add_changes(self, changes: Dict[str, Union[Dict, None]]):
+        for method_key, entry in changes.items():
+            if method_key not in self.changes or self.changes[method_key] is not None:
+                self.changes[method_key] = entry
+
+    # returns dict, with the changes recorded since the last call (sent by the workers with each suite)
+    def pop_changes(self) -> Dict[str, Union[Dict, None]]:
+        changes, self.changes = self.changes, dict()
+        return changes
+
+    def save(self):
+        if not self.changes:
+            return
+
+        for method_key, entry in self.pop_changes().items():
+            if entry is None:
+                self._entries.pop(method_key, None)
+            else:
+                self._entries[method_key] = entry
+
+        try:
+            os.makedirs(os.path.dirname(self.cache_filename), exist_ok=True)
+            tmp_filename = f"{self.cache_filename}.{os.getpid()}.tmp"
+            with open(tmp_filename, "w") as f:
+                json.dump(dict(result_cache_format=RESULT_CACHE_FORMAT, entries=dict(sorted(self._entries.items()))), f, indent=1)
+            os.replace(tmp_filename, self.cache_filename)
+        except Exception as ex:
+            _exec_logger.warning(f"Could not save result cache {self.cache_filename}, {ex}")
+
+    def __repr__(self):
+        return f"<ResultCache {self.cache_filename}: {len(self._entries)} test methods passed>"
@@ -0,0 +1,249 @@
+from __future__ import annotations
+import os
+import pickle
+import struct
+import threading
+
+from datetime import timedelta
+from typing import Dict, Iterator, List, Tuple, TYPE_CHECKING
+
+from testipy import __version__, get_exec_logger
+from testipy.configs import default_config
+from testipy.helpers.errors import get_picklable_exception
+from testipy.lib_modules.args_parser import ArgsParser
+from testipy.lib_modules.common_methods import synchronized, get_current_date_time, get_datetime_now
+from testipy.lib_modules.watchdog import watchdog
+from testipy.reporter.report_interfaces import ReportInterface
+from testipy.engine.suite_history import get_method_key
+
+if TYPE_CHECKING:
+    from testipy.models import PackageAttr, TestMethodAttr, PackageDetails, SuiteDetails, TestDetails
+    from testipy.reporter.report_manager import ReportManager
+
+
+_exec_logger = get_exec_logger()
+
+RUN_JOURNAL_FORMAT = 1
+
+# each record is pickled, after its size, so a record cut by a crash is detected (and ignored)
+_RECORD_SIZE = struct.Struct("!I")
+
+
+# returns str, with the full path of the journal of that results folder (or the file itself, if given)
+def get_journal_filename(results_folder: str) -> str:
+    if os.path.isdir(results_folder):
+        return os.path.join(results_folder, default_config.journal_filename)
+    return results_folder
+
+
+# returns tuple, with the method key and the package and suite cycles, of one call of the test method
+def _get_method_run_key(test_method_attr: TestMethodAttr, sd: SuiteDetails) -> Tuple[str, int, int]:
+    return get_method_key(test_method_attr), sd.package.get_cycle(), sd.get_cycle()
+
+
+class RunJournal(ReportInterface):
+    """
+    Append-only journal of every event of the run, on its results folder, so a run that was killed can be continued
+    with -resume. The records are written as they come, and synced to disk every journal_sync_interval seconds (or
+    journal_sync_events), so a crash loses at most the last ones. Each end_method record tells the test method (on
+    that package and suite cycle) ended, with all its tests, so a resumed run doesn't call it again.
+    """
+
+    def __init__(self, filename: str, ap: ArgsParser):
+        super().__init__("journal")
+        self.filename = filename
+        self.args = ap.to_list()
+
+        self._lock = threading.Lock()
+        self._file = None
+        self._pending = 0
+        self._sync_handle = None
+
+    def _write(self, *record):
+        data = pickle.dumps(record, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(_RECORD_SIZE.pack(len(data)) + data)
+            self._pending += 1
+            if self._pending >= default_config.journal_sync_events:
+                self._sync()
+            elif self._sync_handle is None:
+                self._sync_handle = watchdog.watch(default_config.journal_sync_interval, self.sync)
+
+    def _sync(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._pending = 0
+        # not cancelled, the watchdog may be calling sync (holding the handle lock) while this holds the journal lock
+        self._sync_handle = None
+
+    # called by the watchdog, once journal_sync_interval is over since the first record not synced
+    def sync(self):
+        with self._lock:
+            self._sync_handle = None
+            if self._file is not None and self._pending:
+                self._sync()
+
+    def _startup_(self, selected_tests: List[PackageAttr]):
+        try:
+            self._file = open(self.filename, "ab")
+        except OSError as ex:
+            _exec_logger.warning(f"Could not open run journal {self.filename}, the run can't be resumed, {ex}")
+            return
+        # a resumed run appends to the journal of the run it continues
+        self._write("header", RUN_JOURNAL_FORMAT, self.args, __version__, get_current_date_time())
+
+    def _teardown_(self, end_state: str):
+        with self._lock:
+            if self._file is not None:
+                self._sync()
+                self._file.close()
+                self._file = None
+
+    def start_package(self, pd: PackageDetails):
+        self._write("start_package", pd.get_name(), pd.get_cycle())
+
+    def end_package(self, pd: PackageDetails):
+        self._write("end_package", pd.get_name(), pd.get_cycle())
+
+    def start_suite(self, sd: SuiteDetails):
+        self._write("start_suite", sd.package.get_name(), sd.package.get_cycle(), sd.get_name(), sd.get_cycle())
+
+    def end_suite(self, sd: SuiteDetails):
+        self._write("end_suite", sd.package.get_name(), sd.package.get_cycle(), sd.get_name(), sd.get_cycle())
+
+    def start_test(self, current_test: TestDetails):
+        self._write("start_test", current_test.get_test_id(), _get_method_run_key(current_test.test_method_attr, current_test.suite),
+                    current_test.get_name(), current_test.get_usecase(), current_test.get_comment())
+
+    def test_info(self, current_test: TestDetails, info: str, level: str, attachment: Dict = None, true_html: bool = False):
+        self._write("test_info", current_test.get_test_id(), info, level, attachment, true_html)
+
+    def test_step(
+            self, current_test: TestDetails, state: str, reason_of_state: str = "", description: str = "",
+            take_screenshot: bool = False, qty: int = 1, exc_value: BaseException = None
+    ):
+        self._write("test_step", current_test.get_test_id(), state, reason_of_state, description, qty, get_picklable_exception(exc_value, builtin_only=True))
+
+    def end_test(self, current_test: TestDetails, state: str, reason_of_state: str, exc_value: BaseException = None):
+        self._write("end_test", current_test.get_test_id(), state, reason_of_state, get_picklable_exception(exc_value, builtin_only=True), current_test.get_duration())
+
+    def save_file(self, current_test: TestDetails, data, filename) -> Dict:
+        self._write("save_file", current_test.get_test_id(), data, filename)
+
+    def copy_file(self, current_test: TestDetails, orig_filename, dest_filename, data) -> Dict:
+        self._write("copy_file", current_test.get_test_id(), orig_filename, dest_filename, data)
+
+    # called by the ExecutionProgress, after all tests of the test method ended
+    def end_method(self, test_method_attr: TestMethodAttr, sd: SuiteDetails):
+        self._write("end_method", _get_method_run_key(test_method_attr, sd))
+
+    def show_status(self, message: str):
+        pass
+
+    def show_alert_message(self, message: str):
+        pass
+
+    def input_prompt_message(self, message: str, default_value: str = ""):
+        pass
+
+
+# returns iterator of tuple, with the records of the journal, until the end or the first one cut by a crash
+def _read_records(filename: str) -> Iterator[Tuple]:
+    with open(filename, "rb") as f:
+        while True:
+            header = f.read(_RECORD_SIZE.size)
+            if len(header) < _RECORD_SIZE.size:
+                return
+            size = _RECORD_SIZE.unpack(header)[0]
+            data = f.read(size)
+            if len(data) < size:
+                return
+            try:
+                yield pickle.loads(data)
+            except Exception as ex:
+                _exec_logger.warning(f"Ignoring the rest of the run journal {filename}, {ex}")
+                return
+
+
+# returns ArgsParser, with the args of the run to resume, followed by the ones given now (so they can be overridden)
+def get_resumed_args(ap: ArgsParser) -> ArgsParser:
+    filename = get_journal_filename(ap.get_option("-resume"))
+    if not os.path.isfile(filename):
+        raise ValueError(f"No run journal {filename}, only a run started with --journal can be resumed")
+    records = _read_records(filename)
+    header = next(records, None)
+    records.close()
+    if header is None or header[0] != "header" or header[1] != RUN_JOURNAL_FORMAT:
+        raise ValueError(f"Run journal {filename} is not supported, or is empty")
+    return ArgsParser(header[2] + ap.to_list())
+
+
+class ResumedRun:
+    """
+    The tests of each test method (on each package and suite cycle) that ended on the run being resumed (-resume),
+    read from its journal, so they are reported again with the same results instead of calling the test method.
+    """
+
+    def __init__(self, results_folder: str):
+        self.results_folder = results_folder
+        self._tests_by_method_run: Dict[Tuple[str, int, int], List[List[Tuple]]] = dict()
+        self._load(get_journal_filename(results_folder))
+
+    # the journal has one part for each time the run was started (or resumed), each with its own test ids
+    def _load(self, filename: str):
+        tests: Dict[int, List[Tuple]] = dict()
+        tests_by_method_run: Dict[Tuple[str, int, int], List[int]] = dict()
+
+        for record in _read_records(filename):
+            event = record[0]
+            if event == "header":
+                tests.clear()
+                tests_by_method_run.clear()
+            elif event == "start_test":
+                test_id, method_run_key = record[1], record[2]
+                tests[test_id] = [record]
+                tests_by_method_run.setdefault(method_run_key, []).append(test_id)
+            elif event == "end_method":
+                test_ids = tests_by_method_run.pop(record[1], [])
+                self._tests_by_method_run[record[1]] = [tests.pop(test_id) for test_id in test_ids]
+            elif event in ("test_info", "test_step", "end_test", "save_file", "copy_file") and record[1] in tests:
+                tests[record[1]].append(record)
+
+    def __len__(self):
+        return len(self._tests_by_method_run)
+
+    # returns bool, if all test methods of that suite cycle ended, so it doesn't need to be initialized
+    def has_suite(self, sd: SuiteDetails) -> bool:
+        return all(_get_method_run_key(ma, sd) in self._tests_by_method_run for ma in sd.suite_attr.test_method_attr_list)
+
+    # returns bool, if the test method ended on the run being resumed, and its tests were reported again
+    @synchronized
+    def replay_test_method(self, test_method_attr: TestMethodAttr, sd: SuiteDetails, rm: ReportManager) -> bool:
+        tests = self._tests_by_method_run.pop(_get_method_run_key(test_method_attr, sd), None)
+        if tests is None:
+            return False
+
+        for records in tests:
+            _, _, _, test_name, usecase, description = records[0]
+            current_test = rm.startTest(sd, test_method_attr, test_name, usecase, description)
+            for event, _, *args in records[1:]:
+                if event == "test_info":
+                    rm.test_info(current_test, *args)
+                elif event == "test_step":
+                    state, reason_of_state, step_description, qty, exc_value = args
+                    rm.test_step(current_test, state, reason_of_state, step_description, qty=qty, exc_value=exc_value)
+                elif event == "end_test":
+                    state, reason_of_state, exc_value, duration = args
+                    # it took the same time as on the run being resumed
+                    current_test.start_time = get_datetime_now() - timedelta(seconds=duration)
+                    rm.end_test(current_test, state, reason_of_state, exc_value)
+                elif event == "save_file":
+                    rm.reporters_save_file(current_test, *args)
+                elif event == "copy_file":
+                    rm.reporters_copy_file(current_test, *args)
+        return True
+
+    def __repr__(self):
+        return f"<ResumedRun {self.results_folder}: {len(self)} test methods ended>"
@@ -0,0 +1,105 @@
+import os
+import json
+import hashlib
+
+from typing import Dict, List, Union
+
+from testipy import get_exec_logger
+from testipy.configs import default_config
+from testipy.models import SuiteAttr, TestMethodAttr
+
+
+_exec_logger = get_exec_logger()
+
+
+# returns str, that identifies the suite between runs (ex: qa.login/suite_login.py/SuiteLogin)
+def get_suite_key(suite_attr: SuiteAttr) -> str:
+    return f"{suite_attr.package.package_name}/{suite_attr.filename}/{suite_attr.suite_name}"
+
+
+# returns str, that identifies the test method between runs (ex: qa.login/suite_login.py/SuiteLogin/test_login)
+def get_method_key(test_method_attr: TestMethodAttr) -> str:
+    return f"{get_suite_key(test_method_attr.suite_attr)}/{test_method_attr.method_name}"
+
+
+# returns str, with full path of the history file of the tests folder, on suite_history_folder if set, or else the one
+# kept with the tests (so all machines use the same), or else on default_cache_folder, not to change the tests folder
+def get_suite_history_filename(full_path_tests_scripts_foldername: str) -> str:
+    if default_config.suite_history_folder:
+        return os.path.join(default_config.suite_history_folder, default_config.suite_history_filename)
+
+    filename = os.path.join(full_path_tests_scripts_foldername, default_config.suite_history_filename)
+    if os.path.isfile(filename):
+        return filename
+
+    folder_hash = hashlib.sha1(os.path.abspath(full_path_tests_scripts_foldername).encode()).hexdigest()[:16]
+    name, ext = os.path.splitext(default_config.suite_history_filename)
+    return os.path.join(default_config.default_cache_folder, f"{name}_{folder_hash}{ext}")
+
+
+class SuiteHistory:
+    """
+    Recorded durations of each suite (all its cycles, for one package cycle) and of each test method (all its cycles),
+    in seconds, as a JSON file.
+    New durations are averaged with the recorded ones, by suite_history_weight, so one slow run doesn't change much.
+    """
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        self._durations: Dict[str, float] = dict()
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.filename, "r") as f:
+                self._durations = {str(k): float(v) for k, v in json.load(f).get("durations", {}).items()}
+        except FileNotFoundError:
+            pass
+        except Exception as ex:
+            _exec_logger.warning(f"Ignoring suite history {self.filename}, {ex}")
+
+    # returns float, with the expected duration in seconds, or None if the suite never ran
+    def get(self, suite_key: str) -> Union[float, None]:
+        return self._durations.get(suite_key)
+
+    def update(self, durations: Dict[str, float]):
+        weight = default_config.suite_history_weight
+        for suite_key, duration in durations.items():
+            recorded = self._durations.get(suite_key)
+            self._durations[suite_key] = duration if recorded is None else recorded * (1.0 - weight) + duration * weight
+
+    # written to a temporary file first, so runs ending at the same time (or killed) never leave it half written
+    def save(self, filename: str = ""):
+        filename = filename or self.filename
+        try:
+            os.makedirs(os.path.dirname(filename) or ".", exist_ok=True)
+            tmp_filename = f"{filename}.{os.getpid()}.tmp"
+            with open(tmp_filename, "w") as f:
+                json.dump(dict(durations=dict(sorted(self._durations.items()))), f, indent=1)
+            os.replace(tmp_filename, filename)
+        except OSError as ex:
+            _exec_logger.warning(f"Could not save suite history {filename}, {ex}")
+
+    def __len__(self):
+        return len(self._durations)
+
+
+# returns float, with the recorded seconds of the test method, or else the estimate for a test method with no history
+def get_expected_method_duration(test_method_attr: TestMethodAttr, history: SuiteHistory) -> float:
+    recorded = history.get(get_method_key(test_method_attr))
+    return recorded if recorded is not None else default_config.test_method_duration_estimate * test_method_attr.ncycles
+
+
+# returns float, with the recorded seconds of the suite, or else the expected seconds of its test methods
+def get_expected_suite_duration(suite_attr: SuiteAttr, history: SuiteHistory) -> float:
+    recorded = history.get(get_suite_key(suite_attr))
+    if recorded is not None:
+        return recorded
+    return sum(get_expected_method_duration(test_method_attr, history) for test_method_attr in suite_attr.test_method_attr_list) * suite_attr.ncycles
+
+
+# returns list of SuiteAttr, by @PRIO and then the longest first, so the last ones to start are the shortest ones
+def sort_longest_first(suite_attr_list: List[SuiteAttr], history: SuiteHistory) -> List[SuiteAttr]:
+    expected = {id(suite_attr): get_expected_suite_duration(suite_attr, history) for suite_attr in suite_attr_list}
+    position = {id(suite_attr): i for i, suite_attr in enumerate(suite_attr_list)}
+    return sorted(suite_attr_list, key=lambda suite_attr: (suite_attr.prio, -expected[id(suite_attr)], position[id(suite_attr)]))
@@ -0,0 +1,199 @@
+from __future__ import annotations
+import os
+import sys
+import json
+import threading
+import contextvars
+import subprocess
+
+from functools import lru_cache
+from contextlib import contextmanager
+from typing import Dict, List, Set, Tuple, TYPE_CHECKING
+
+from testipy import get_exec_logger
+from testipy.configs import default_config
+from testipy.lib_modules.common_methods import synchronized
+from testipy.engine.suite_history import get_method_key, get_suite_key
+from testipy.engine.read_tests_rerun import select_test_methods
+
+if TYPE_CHECKING:
+    from testipy.models import PackageAttr, TestMethodAttr
+
+
+_exec_logger = get_exec_logger()
+
+TEST_IMPACT_FORMAT = 1
+
+# functions called by the test method (or suite) running on this thread or async task, as (filename, qualified name)
+_current_footprint: contextvars.ContextVar = contextvars.ContextVar("testipy_footprint", default=None)
+
+
+def _trace_calls(frame, event, arg):
+    footprint = _current_footprint.get()
+    if footprint is not None:
+        code = frame.f_code
+        footprint.add((code.co_filename, getattr(code, "co_qualname", code.co_name)))
+    # no line events, only calls
+    return None
+
+
+# returns str, with the full path of the test impact map of that results folder (or the file itself, if given)
+def get_test_impact_filename(results_folder: str) -> str:
+    if os.path.isdir(results_folder):
+        return os.path.join(results_folder, default_config.test_impact_filename)
+    return results_folder
+
+
+class ImpactRecorder:
+    """
+    Records the source files and functions called by each test method (--record-impact), by its key, and the ones called
+    by each suite outside its test methods (suite __init__, setup_suite, teardown_suite), by the suite key.
+    Only calls are traced (not lines), with sys.settrace on all threads, for the test methods running on threads started
+    by TestiPy (and async ones), so threads started by the test methods themselves are not recorded.
+    Files of python, installed packages and TestiPy itself are not kept.
+    """
+
+    def __init__(self, full_path_tests_scripts_foldername: str):
+        self.full_path_tests_scripts_foldername = full_path_tests_scripts_foldername
+        self.footprints: Dict[str, Dict[str, Set[str]]] = dict()
+        self._kept_files: Dict[str, str] = dict()
+
+    def start(self):
+        threading.settrace(_trace_calls)
+        sys.settrace(_trace_calls)
+        if hasattr(threading, "settrace_all_threads"):
+            threading.settrace_all_threads(_trace_calls)
+
+    def stop(self):
+        threading.settrace(None)
+        sys.settrace(None)
+        if hasattr(threading, "settrace_all_threads"):
+            threading.settrace_all_threads(None)
+
+    # records the calls made inside, for that key, on this thread or async task (and the ones started from it)
+    @contextmanager
+    def record(self, key: str):
+        footprint = set()
+        token = _current_footprint.set(footprint)
+        try:
+            yield
+        finally:
+            _current_footprint.reset(token)
+            self.add_footprints({key: self._get_files_functions(footprint)})
+
+    # returns dict, with the functions called of each file kept, relative to the tests folder if under it
+    def _get_files_functions(self, footprint: Set[Tuple[str, str]]) -> Dict[str, Set[str]]:
+        files_functions: Dict[str, Set[str]] = dict()
+        for filename, function_name in footprint:
+            if filename not in self._kept_files:
+                self._kept_files[filename] = _get_footprint_filename(filename, self.full_path_tests_scripts_foldername)
+            if kept_filename := self._kept_files[filename]:
+                files_functions.setdefault(kept_filename, set()).add(function_name)
+        return files_functions
+
+    # a test method that runs several times (ex: package cycles) has the footprint of all of them
+    @synchronized
+    def add_footprints(self, footprints: Dict[str, Dict[str, Set[str]]]):
+        for key, files_functions in footprints.items():
+            recorded = self.footprints.setdefault(key, dict())
+            for filename, functions in files_functions.items():
+                recorded.setdefault(filename, set()).update(functions)
+
+    # returns dict, with the footprints recorded since the last call (sent by the workers with each suite)
+    def pop_footprints(self) -> Dict[str, Dict[str, Set[str]]]:
+        footprints, self.footprints = self.footprints, dict()
+        return footprints
+
+    def save(self, filename: str):
+        footprints = {key: {fn: sorted(functions) for fn, functions in sorted(files_functions.items())} for key, files_functions in sorted(self.footprints.items())}
+        try:
+            with open(filename, "w") as f:
+                json.dump(dict(test_impact_format=TEST_IMPACT_FORMAT, tests_folder=self.full_path_tests_scripts_foldername, footprints=footprints), f, indent=1)
+            _exec_logger.info(f"Saved the footprint of {len(footprints)} test methods and suites to {filename}")
+        except OSError as ex:
+            _exec_logger.warning(f"Could not save test impact {filename}, {ex}")
+
+
+# returns str, the filename as kept on the footprint, or empty if not kept (python, installed packages, TestiPy)
+def _get_footprint_filename(filename: str, full_path_tests_scripts_foldername: str) -> str:
+    if filename.startswith("<") or not os.path.isfile(filename):
+        return ""
+
+    filename = os.path.realpath(filename)
+    for folder in _get_not_kept_folders():
+        if filename.startswith(folder):
+            return ""
+
+    tests_folder = os.path.realpath(full_path_tests_scripts_foldername)
+    if filename.startswith(tests_folder + os.sep):
+        return os.path.relpath(filename, tests_folder)
+    return filename
+
+
+# returns list of str, with the folders of python, its installed packages and TestiPy
+@lru_cache(maxsize=1)
+def _get_not_kept_folders() -> List[str]:
+    import sysconfig
+
+    folders = {sysconfig.get_paths()[name] for name in ("stdlib", "platstdlib", "purelib", "platlib")}
+    folders.add(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    return [os.path.realpath(folder) + os.sep for folder in folders]
+
+
+# returns dict, with the footprint of each test method and suite of the test impact map, with full path filenames
+def load_test_impact(results_folder: str, full_path_tests_scripts_foldername: str) -> Dict[str, Set[str]]:
+    filename = get_test_impact_filename(results_folder)
+    with open(filename, "r") as f:
+        test_impact = json.load(f)
+    if test_impact.get("test_impact_format") != TEST_IMPACT_FORMAT:
+        raise ValueError(f"Test impact {filename} is not supported, format {test_impact.get('test_impact_format')} is not {TEST_IMPACT_FORMAT}")
+
+    # the files under the tests folder were saved relative to it, so the map can be used on other machines
+    tests_folder = os.path.realpath(full_path_tests_scripts_foldername)
+    return {key: {os.path.realpath(os.path.join(tests_folder, fn)) for fn in files_functions}
+            for key, files_functions in test_impact["footprints"].items()}
+
+
+# returns set of str, with the full path of the changed files, given as filenames (or comma separated) or git:<revision>
+def get_changed_files(changes: List[str]) -> Set[str]:
+    changed_files = set()
+    for change in changes:
+        if change.startswith("git:"):
+            changed_files.update(_get_git_changed_files(change[4:] or "HEAD"))
+        else:
+            changed_files.update(os.path.realpath(fn.strip()) for fn in change.split(",") if fn.strip())
+    return changed_files
+
+
+# returns list of str, with the full path of the files changed since that git revision (including the not committed ones)
+def _get_git_changed_files(revision: str) -> List[str]:
+    def _git(*args) -> List[str]:
+        result = subprocess.run(["git", *args], capture_output=True, text=True)
+        if result.returncode != 0:
+            raise ValueError(f"git {' '.join(args)} failed: {result.stderr.strip()}")
+        return result.stdout.splitlines()
+
+    top_folder = _git("rev-parse", "--show-toplevel")[0]
+    return [os.path.realpath(os.path.join(top_folder, fn)) for fn in _git("diff", "--name-only", revision) if fn]
+
+
+# returns list of PackageAttr, only with the test methods whose footprint (or their suite footprint) has a changed file,
+# or with no footprint recorded, plus the ones they @DEPENDS on and the SETUP/TEARDOWN of their suites
+def select_affected_tests(selected_tests: List[PackageAttr], footprints: Dict[str, Set[str]], changed_files: Set[str]) -> List[PackageAttr]:
+    not_recorded = []
+
+    def _is_affected(test_method_attr: TestMethodAttr) -> bool:
+        method_key = get_method_key(test_method_attr)
+        if method_key not in footprints:
+            not_recorded.append(method_key)
+            return True
+        return not changed_files.isdisjoint(footprints[method_key] | footprints.get(get_suite_key(test_method_attr.suite_attr), set()))
+
+    selected_tests, affected, included = select_test_methods(selected_tests, _is_affected)
+
+    for method_key in not_recorded:
+        _exec_logger.debug(f"Affected {method_key}, no footprint recorded")
+    _exec_logger.info(f"Affected {len(affected)} test methods by {len(changed_files)} changed files ({len(not_recorded)} with no footprint recorded), "
+                      f"with {len(included)} they depend on or SETUP/TEARDOWN")
+
+    return selected_tests
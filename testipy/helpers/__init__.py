@@ -10,6 +10,7 @@ from typing import Union, Dict, Tuple
 from testipy.helpers.errors import get_traceback_str, get_traceback_tabulate, get_traceback_list
 from testipy.helpers.timer import Timer
 from testipy.helpers.prettify import prettify, format_duration
+from testipy.lib_modules.common_methods import get_current_package_folder
 
 
 # define custom tag handler for string concatenation
@@ -22,13 +23,26 @@ def yaml_join(loader, node):
 yaml.add_constructor("!join", yaml_join)
 
 
+# returns str, folder of same_path_as_file: a file, a folder, a SuiteDetails (its package folder), or else the
+# package folder of the suite running on this thread
+def _get_base_folder(same_path_as_file=None) -> str:
+    if same_path_as_file is None:
+        return get_current_package_folder()
+    if hasattr(same_path_as_file, "get_package_folder"):
+        return same_path_as_file.get_package_folder()
+    if os.path.isdir(same_path_as_file):
+        return os.path.abspath(same_path_as_file)
+    return os.path.dirname(os.path.abspath(same_path_as_file))
+
+
 # returns full path filename, based on other file path
 def create_filename_fullpath(fpn: str, same_path_as_file=None) -> str:
-    if os.path.isfile(fpn):
-        fpn = os.path.abspath(fpn)
+    relative_fpn = os.path.join(get_current_package_folder(), fpn)
+    if os.path.isfile(relative_fpn):
+        fpn = os.path.abspath(relative_fpn)
     else:
         fpn = os.path.split(fpn)[-1]
-        fpn = os.path.join(os.path.dirname(os.path.abspath(same_path_as_file)), fpn) if same_path_as_file else os.path.join(os.getcwd(), fpn)
+        fpn = os.path.join(_get_base_folder(same_path_as_file), fpn)
         if not os.path.isfile(fpn):
             raise FileNotFoundError(f"File {fpn} not found.")
     return fpn
@@ -84,11 +98,8 @@ def left_update_dict(d1: Dict, d2: Dict) -> Dict:
 def exec_cmd(cmd: str, timeout: int = 2, change_to_path: str = "") -> Tuple[int, str, str]:
     """ returns (int, str, str), with (exitcode, stdout, stderr) """
     try:
-        if change_to_path:
-            cwd = os.getcwd()
-            os.chdir(change_to_path)
-
-        proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE, shell=False)
+        # cwd of the command only, the process cwd is shared by all tests running in parallel
+        proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE, shell=False, cwd=change_to_path or None)
         try:
             outs, errs = proc.communicate(timeout=timeout)
             # proc.stdout.flush()
@@ -101,9 +112,6 @@ def exec_cmd(cmd: str, timeout: int = 2, change_to_path: str = "") -> Tuple[int,
     except:
         result = (-102, "", sys.exc_info()[1])
 
-    if change_to_path:
-        os.chdir(cwd)
-
     return result
 
 
@@ -1,7 +1,21 @@
+import pickle
+import builtins
 import traceback
 
-from typing import Dict, List
-from tabulate import tabulate
+from typing import Dict, List, Union
+
+
+REMOTE_TRACEBACK_ATTR = "_testipy_traceback_list"
+
+
+# raised on a test method that took longer than its @TIMEOUT (or -timeout)
+class TestTimeoutError(Exception):
+    pass
+
+
+# raised when a fixture (@FIXTURES) of a suite can't be set up
+class FixtureError(Exception):
+    pass
 
 
 def get_traceback_str(exc_value: BaseException, full: bool = False) -> str:
@@ -18,6 +32,8 @@ def get_traceback_str(exc_value: BaseException, full: bool = False) -> str:
 
 
 def get_traceback_tabulate(exc_value: BaseException) -> str:
+    from tabulate import tabulate
+
     result = ""
     for error in get_traceback_list(exc_value):
         if result:
@@ -32,6 +48,10 @@ def get_traceback_tabulate(exc_value: BaseException) -> str:
 
 
 def get_traceback_list(exc_value: BaseException) -> List[Dict]:
+    # raised on a suite process (-sp), where its traceback was converted, since tracebacks can't be pickled
+    if remote_traceback_list := getattr(exc_value, REMOTE_TRACEBACK_ATTR, None):
+        return list(remote_traceback_list)
+
     result = []
 
     # get previous fails, so errors are appended by order of execution
@@ -60,3 +80,25 @@ def get_traceback_list(exc_value: BaseException) -> List[Dict]:
     })
 
     return result
+
+
+# returns exception that can be pickled, with its traceback already converted to list, only of a builtin type if it
+# must be read by another run (that may not import the module of its type)
+def get_picklable_exception(exc_value: BaseException, builtin_only: bool = False) -> Union[BaseException, None]:
+    if exc_value is None:
+        return None
+
+    traceback_list = get_traceback_list(exc_value)
+    try:
+        if builtin_only and getattr(builtins, type(exc_value).__name__, None) is not type(exc_value):
+            raise TypeError(f"{type(exc_value).__name__} is not builtin")
+        exc_copy = pickle.loads(pickle.dumps(exc_value))
+    except Exception:
+        exc_copy = Exception(f"{type(exc_value).__name__}: {exc_value}")
+
+    try:
+        setattr(exc_copy, REMOTE_TRACEBACK_ATTR, traceback_list)
+    except Exception:
+        pass
+
+    return exc_copy
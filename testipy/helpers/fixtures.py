@@ -0,0 +1,194 @@
+from __future__ import annotations
+import time
+import inspect
+import threading
+
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Tuple
+
+from testipy import get_exec_logger
+from testipy.helpers.errors import FixtureError
+from testipy.helpers.prettify import format_duration
+from testipy.lib_modules.async_runner import async_runner
+
+
+_exec_logger = get_exec_logger()
+
+SCOPE_SESSION = "session"
+SCOPE_PACKAGE = "package"
+SCOPE_SUITE = "suite"
+FIXTURE_SCOPES = (SCOPE_SESSION, SCOPE_PACKAGE, SCOPE_SUITE)
+
+# returned by _next_value when the (async) generator of a fixture ended
+_END = object()
+
+
+class FixtureDef(NamedTuple):
+    name: str
+    scope: str
+    func: Callable
+    # names of the fixtures it uses, by its parameters
+    params: Tuple[str, ...]
+
+
+# all fixtures defined, by their name, registered when the module defining them is imported
+_fixture_defs: Dict[str, FixtureDef] = dict()
+
+
+# decorator of a function (or generator, for a teardown after its yield, or async ones) that sets up a fixture,
+# given to the suites with that name on their @FIXTURES, and built once for each session, package cycle or suite cycle
+#   @fixture(scope="package")
+#   def db(token):
+#       conn = connect(token)
+#       yield conn
+#       conn.close()
+def fixture(func: Callable = None, *, scope: str = SCOPE_SUITE, name: str = ""):
+    if scope not in FIXTURE_SCOPES:
+        raise ValueError(f"Fixture scope must be one of {', '.join(FIXTURE_SCOPES)}, not {scope}")
+
+    def _register(func: Callable) -> Callable:
+        fixture_def = FixtureDef(name or func.__name__, scope, func, tuple(inspect.signature(func).parameters))
+        previous = _fixture_defs.get(fixture_def.name)
+        if previous is not None and previous.func.__module__ != func.__module__:
+            _exec_logger.warning(f"Fixture {fixture_def.name} of {func.__module__} replaces the one of {previous.func.__module__}")
+        _fixture_defs[fixture_def.name] = fixture_def
+        return func
+
+    return _register(func) if func is not None else _register
+
+
+def _get_fixture_def(name: str) -> FixtureDef:
+    fixture_def = _fixture_defs.get(name)
+    if fixture_def is None:
+        raise FixtureError(f"Fixture {name} not found, the module with its @fixture must be imported by the suite module")
+    return fixture_def
+
+
+async def _anext(agen):
+    try:
+        return await agen.__anext__()
+    except StopAsyncIteration:
+        return _END
+
+
+# returns the next value of the (async) generator of a fixture, or _END
+def _next_value(gen) -> Any:
+    if inspect.isasyncgen(gen):
+        return async_runner.run(_anext(gen))
+    return next(gen, _END)
+
+
+# returns (value, generator or None), the value of the fixture, and its generator, to be resumed on teardown
+def _call_fixture(fixture_def: FixtureDef, kwargs: Dict[str, Any]) -> Tuple[Any, Any]:
+    result = fixture_def.func(**kwargs)
+
+    if inspect.isgenerator(result) or inspect.isasyncgen(result):
+        value = _next_value(result)
+        if value is _END:
+            raise FixtureError(f"Fixture {fixture_def.name} didn't yield a value")
+        return value, result
+
+    if inspect.iscoroutine(result):
+        return async_runner.run(result), None
+    return result, None
+
+
+class FixtureScope:
+    """
+    The fixtures built for one session, package cycle or suite cycle. Each fixture is only built when first needed, by
+    the first suite thread asking for it, while the others wait for it (other fixtures can be built at the same time).
+    A fixture of a wider scope is built on the parent scope (suite -> package -> session), so it is shared by all
+    suites under it, and a fixture can use the ones of its own or wider scopes, by its parameters.
+    teardown() resumes the generators of the fixtures built, the last one first, when the scope ends.
+    A fixture that failed is not built again on the same scope, the suites needing it fail with the same error.
+    """
+
+    def __init__(self, scope: str, name: str, parent: FixtureScope = None):
+        self.scope = scope
+        self.name = name
+        self.parent = parent
+
+        self._values: Dict[str, Any] = dict()
+        self._errors: Dict[str, Exception] = dict()
+        self._teardowns: List[Tuple[str, Any]] = []
+        self._building: Dict[str, threading.Lock] = dict()
+        self._lock = threading.Lock()
+
+    # returns dict, with the value of each fixture, by its name
+    def get_all(self, names: Iterable[str]) -> Dict[str, Any]:
+        return {name: self.get(name) for name in names}
+
+    # returns the value of the fixture, built on this scope (or the parent with its scope) if not built yet
+    def get(self, name: str, _using: Tuple[str, ...] = ()) -> Any:
+        if name in _using:
+            raise FixtureError(f"Fixture {name} uses itself: {' -> '.join(_using + (name,))}")
+
+        fixture_def = _get_fixture_def(name)
+        return self._get_owner(fixture_def)._get_value(fixture_def, _using + (name,))
+
+    def _get_owner(self, fixture_def: FixtureDef) -> FixtureScope:
+        fixture_scope = self
+        while fixture_scope is not None and fixture_scope.scope != fixture_def.scope:
+            fixture_scope = fixture_scope.parent
+        if fixture_scope is None:
+            raise FixtureError(f"Fixture {fixture_def.name} ({fixture_def.scope}) can't be used by a {self.scope} fixture")
+        return fixture_scope
+
+    def _get_value(self, fixture_def: FixtureDef, using: Tuple[str, ...]) -> Any:
+        name = fixture_def.name
+        with self._lock:
+            if name in self._values:
+                return self._values[name]
+            building = self._building.setdefault(name, threading.Lock())
+
+        with building:
+            if name in self._values:
+                return self._values[name]
+            if name in self._errors:
+                raise FixtureError(f"Fixture {name} failed: {self._errors[name]}") from self._errors[name]
+
+            # the time of the fixtures it uses is counted on their own
+            kwargs = {param: self.get(param, using) for param in fixture_def.params}
+            started = time.perf_counter()
+            try:
+                value, gen = _call_fixture(fixture_def, kwargs)
+            except Exception as ex:
+                self._errors[name] = ex
+                _exec_logger.error(f"Fixture {name} ({self.scope} {self.name}) failed after {format_duration(time.perf_counter() - started)}: {ex}")
+                raise FixtureError(f"Fixture {name} failed: {ex}") from ex
+
+            with self._lock:
+                self._values[name] = value
+                if gen is not None:
+                    self._teardowns.append((name, gen))
+            _exec_logger.info(f"Fixture {name} ({self.scope} {self.name}) set up in {format_duration(time.perf_counter() - started)}")
+            return value
+
+    def teardown(self):
+        with self._lock:
+            teardowns, self._teardowns = self._teardowns, []
+            self._values.clear()
+            self._errors.clear()
+            self._building.clear()
+
+        for name, gen in reversed(teardowns):
+            started = time.perf_counter()
+            try:
+                if _next_value(gen) is not _END:
+                    if inspect.isasyncgen(gen):
+                        async_runner.run(gen.aclose())
+                    else:
+                        gen.close()
+                    raise FixtureError("yielded more than once")
+                _exec_logger.info(f"Fixture {name} ({self.scope} {self.name}) torn down in {format_duration(time.perf_counter() - started)}")
+            except Exception as ex:
+                _exec_logger.error(f"Fixture {name} ({self.scope} {self.name}) teardown failed after {format_duration(time.perf_counter() - started)}: {ex}")
+
+    def __len__(self):
+        return len(self._values)
+
+    def __repr__(self):
+        return f"<FixtureScope {self.scope} {self.name}: {len(self)} fixtures>"
+
+
+# fixtures of the session, shared by all suites run by this process, torn down when the run (or the worker process) ends
+session_fixtures = FixtureScope(SCOPE_SESSION, "session")
@@ -95,5 +95,18 @@ class ArgsParser:
     def get_arguments(self, default_value=None) -> list:
         return self.__argv_dict.get("_arguments_", default_value or [])
 
+    # returns list, with the flags, options and arguments, to be parsed again (ex: the run being resumed)
+    def to_list(self) -> List[str]:
+        result = []
+        for key, values in self.__argv_dict.items():
+            if key == "_arguments_":
+                result += values
+            elif key.startswith("--"):
+                result.append(key)
+            else:
+                for value in values:
+                    result += [key, value]
+        return result
+
     def __str__(self):
         return str(self.__argv_dict)
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import threading
+import concurrent.futures
+
+from typing import Any, Coroutine, TYPE_CHECKING
+
+from testipy.configs import default_config
+
+if TYPE_CHECKING:
+    import asyncio
+
+
+class AsyncRunner:
+    """
+    One event loop, running on its own thread, for all async test methods (and async setup_suite/teardown_suite) of
+    this process. Clients created on setup_suite can be used by all test methods of that suite, even if they were
+    started from different threads. The loop (and asyncio) is only created when the first coroutine is submitted.
+    limited() allows at most concurrency_limit (-ac) coroutines running at the same time, for all suites.
+    """
+
+    def __init__(self, concurrency_limit: int = default_config.async_concurrency):
+        self.concurrency_limit: int = concurrency_limit
+        self._loop: asyncio.AbstractEventLoop = None
+        self._thread: threading.Thread = None
+        self._semaphore: asyncio.Semaphore = None
+        self._lock = threading.Lock()
+
+    def set_concurrency_limit(self, concurrency_limit: int):
+        if concurrency_limit < 1:
+            raise ValueError("Async concurrency limit must be at least 1.")
+        self.concurrency_limit = concurrency_limit
+        self._semaphore = None
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        import asyncio
+
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._run_loop, name="testipy-async", daemon=True)
+                self._thread.start()
+            return self._loop
+
+    def _run_loop(self):
+        import asyncio
+
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
+    def is_loop_thread(self) -> bool:
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    # returns future, of the coroutine scheduled on the event loop
+    def submit(self, coro: Coroutine) -> concurrent.futures.Future:
+        import asyncio
+
+        return asyncio.run_coroutine_threadsafe(coro, self._get_loop())
+
+    # returns the result of the coroutine, waiting for it on this thread
+    def run(self, coro: Coroutine) -> Any:
+        if self.is_loop_thread():
+            coro.close()
+            raise RuntimeError("Cannot wait for a coroutine on the event loop thread, use await instead.")
+        return self.submit(coro).result()
+
+    # returns the result of the coroutine, awaited only when there are less than concurrency_limit running
+    async def limited(self, coro: Coroutine) -> Any:
+        import asyncio
+
+        # created here, on the event loop thread
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency_limit)
+
+        async with self._semaphore:
+            return await coro
+
+    def stop(self):
+        with self._lock:
+            if self._loop is not None:
+                self._loop.call_soon_threadsafe(self._loop.stop)
+                self._thread.join()
+                self._loop.close()
+                self._loop = self._thread = self._semaphore = None
+
+
+async_runner = AsyncRunner()
@@ -4,6 +4,7 @@ import os
 import threading
 import functools
 
+from contextvars import ContextVar
 from datetime import datetime
 from time import time
 from typing import Tuple, Dict, List, Iterable
@@ -14,6 +15,9 @@ from testipy.configs import default_config
 
 TESTS_ROOT_FOLDER = os.getcwd()
 
+# package folder of the suite running on each thread (or async test method), since packages running in parallel (-pt) can't change the cwd
+_running_package_folder: ContextVar[str] = ContextVar("running_package_folder", default="")
+
 
 def get_app_version() -> Tuple[str, str, str]:
     return __app__, __version__, __app_full__
@@ -39,6 +43,20 @@ def get_timestamp() -> int:
     return int(time() * 1000)
 
 
+# returns str, full path of the package folder (ex: qa.regression -> <tests folder>/qa/regression)
+def get_package_folder(package_name: str) -> str:
+    return os.path.join(TESTS_ROOT_FOLDER, package_name.replace(default_config.separator_package, os.path.sep))
+
+
+def set_current_package_folder(package_folder: str = ""):
+    _running_package_folder.set(package_folder)
+
+
+# returns str, package folder of the suite running on this thread (or async test method), or else the current working directory
+def get_current_package_folder() -> str:
+    return _running_package_folder.get() or os.getcwd()
+
+
 def get_datetime_now() -> datetime:
     return datetime.now()
 
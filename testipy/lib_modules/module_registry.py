@@ -0,0 +1,202 @@
+import os
+import sys
+import threading
+import importlib.abc
+import importlib.machinery
+import importlib.util
+
+from types import ModuleType
+from typing import Dict, List, NamedTuple, Union
+
+from testipy import get_exec_logger
+from testipy.lib_modules.startup_profiler import startup_profiler
+
+
+_exec_logger = get_exec_logger()
+
+
+class RegistryEntry(NamedTuple):
+    module: ModuleType
+    module_name: str
+    mtime_ns: int
+    size: int
+
+
+# returns str, dotted module name from the package path (ex: qa.regression.suite_login), relative to root_folder,
+# or else up to the last folder with an __init__.py (like a normal import would name it)
+def get_module_name(full_path_filename: str, root_folder: str = "") -> str:
+    full_path_filename = os.path.abspath(full_path_filename)
+    path_without_ext = os.path.splitext(full_path_filename)[0]
+
+    if root_folder:
+        root_folder = os.path.abspath(root_folder)
+        if path_without_ext.startswith(root_folder + os.path.sep):
+            return os.path.relpath(path_without_ext, root_folder).replace(os.path.sep, ".")
+
+    parts = [os.path.basename(path_without_ext)]
+    folder = os.path.dirname(full_path_filename)
+    while os.path.isfile(os.path.join(folder, "__init__.py")) and os.path.dirname(folder) != folder:
+        parts.insert(0, os.path.basename(folder))
+        folder = os.path.dirname(folder)
+    return ".".join(parts)
+
+
+# returns list of folders from the file folder up to root_folder (excluded), innermost first
+def get_folders_up_to_root(full_path_filename: str, root_folder: str = "") -> List[str]:
+    folders = []
+    folder = os.path.dirname(os.path.abspath(full_path_filename))
+    root_folder = os.path.abspath(root_folder) if root_folder else ""
+
+    while folder and folder != root_folder:
+        folders.append(folder)
+        if not root_folder or os.path.dirname(folder) == folder:
+            break
+        folder = os.path.dirname(folder)
+
+    return folders
+
+
+def _is_same_file(module: ModuleType, full_path_filename: str) -> bool:
+    module_file = getattr(module, "__file__", None)
+    return bool(module_file) and os.path.abspath(module_file) == full_path_filename
+
+
+class _PackageFoldersFinder(importlib.abc.MetaPathFinder):
+    """
+    Finds the modules imported by name (ex: import toolbox) on the package folders of the file being executed on this
+    thread, as if they were first on sys.path. sys.path is not changed, other threads import at the same time.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def push(self, folders: List[str]):
+        self._local.__dict__.setdefault("stack", []).append(folders)
+
+    def pop(self):
+        self._local.stack.pop()
+
+    def find_spec(self, fullname: str, path=None, target=None):
+        stack = getattr(self._local, "stack", None)
+        # submodules are found on the __path__ of their package
+        if not stack or path is not None:
+            return None
+        return importlib.machinery.PathFinder.find_spec(fullname, stack[-1], target)
+
+
+# before the one for sys.path, so the package folders come first, as they did on it
+def _install_finder(finder: _PackageFoldersFinder):
+    index = sys.meta_path.index(importlib.machinery.PathFinder) if importlib.machinery.PathFinder in sys.meta_path else len(sys.meta_path)
+    sys.meta_path.insert(index, finder)
+
+
+_package_folders_finder = _PackageFoldersFinder()
+_install_finder(_package_folders_finder)
+
+
+class ModuleRegistry:
+    """
+    Python files loaded by path, each executed only once while it doesn't change (mtime, size).
+    Modules are registered on sys.modules only under the dotted name from their package path (ex: qa.api.toolbox), as
+    a normal import would, so an "import qa.api.toolbox" from a test reuses the module already loaded by discovery (and
+    vice versa), and a bare file name (ex: toolbox) is left for the module a plain import would find.
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, RegistryEntry] = dict()
+        self._lock = threading.RLock()
+
+    def load(self, full_path_filename: str, root_folder: str = "") -> ModuleType:
+        full_path_filename = os.path.abspath(full_path_filename)
+        st = os.stat(full_path_filename)
+
+        with self._lock:
+            entry = self._entries.get(full_path_filename)
+            if entry is not None and entry.mtime_ns == st.st_mtime_ns and entry.size == st.st_size:
+                return entry.module
+
+            return self._load(full_path_filename, root_folder, st, reload=entry is not None)
+
+    def reload(self, full_path_filename: str, root_folder: str = "") -> ModuleType:
+        full_path_filename = os.path.abspath(full_path_filename)
+        with self._lock:
+            return self._load(full_path_filename, root_folder, os.stat(full_path_filename), reload=True)
+
+    def unload(self, full_path_filename: str):
+        full_path_filename = os.path.abspath(full_path_filename)
+        with self._lock:
+            entry = self._entries.pop(full_path_filename, None)
+            if entry is not None:
+                self._unregister(entry.module)
+
+    def clear(self):
+        with self._lock:
+            for full_path_filename in list(self._entries):
+                self.unload(full_path_filename)
+
+    def get(self, full_path_filename: str) -> Union[ModuleType, None]:
+        entry = self._entries.get(os.path.abspath(full_path_filename))
+        return entry.module if entry else None
+
+    def __contains__(self, full_path_filename: str) -> bool:
+        return os.path.abspath(full_path_filename) in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _load(self, full_path_filename: str, root_folder: str, st: os.stat_result, reload: bool) -> ModuleType:
+        module_name = get_module_name(full_path_filename, root_folder)
+        short_name = module_name.rsplit(".", 1)[-1]
+
+        if reload:
+            old_entry = self._entries.pop(full_path_filename, None)
+            if old_entry is not None:
+                self._unregister(old_entry.module)
+        else:
+            # already imported by an import statement, so use that one
+            module = sys.modules.get(module_name)
+            if module is not None and _is_same_file(module, full_path_filename):
+                self._entries[full_path_filename] = RegistryEntry(module, module_name, st.st_mtime_ns, st.st_size)
+                return module
+
+        # the dotted name is taken by another file (ex: an installed package), so use only the file
+        if module_name in sys.modules and not _is_same_file(sys.modules[module_name], full_path_filename):
+            used_by = getattr(sys.modules[module_name], "__file__", None)
+            _exec_logger.debug(f"Module name {module_name} already used by {used_by}, {full_path_filename} not registered with that name")
+            module_name = ""
+
+        module = _exec_module(full_path_filename, module_name or short_name, root_folder, register_as=module_name)
+
+        self._entries[full_path_filename] = RegistryEntry(module, module.__name__, st.st_mtime_ns, st.st_size)
+        return module
+
+    @staticmethod
+    def _unregister(module: ModuleType):
+        for name in [name for name, mod in list(sys.modules.items()) if mod is module]:
+            del sys.modules[name]
+
+
+# returns module, executed with that name, with its package folders available for imports
+def _exec_module(full_path_filename: str, module_name: str, root_folder: str = "", register_as: str = "") -> ModuleType:
+    spec = importlib.util.spec_from_file_location(module_name, full_path_filename)
+    module = importlib.util.module_from_spec(spec)
+
+    # registered before executing, like a normal import, so circular imports find it
+    if register_as:
+        sys.modules[register_as] = module
+
+    _package_folders_finder.push(get_folders_up_to_root(full_path_filename, root_folder))
+    try:
+        with startup_profiler.measure_import(full_path_filename):
+            spec.loader.exec_module(module)
+    except BaseException:
+        if register_as and sys.modules.get(register_as) is module:
+            del sys.modules[register_as]
+        raise
+    finally:
+        _package_folders_finder.pop()
+
+    return module
+
+
+module_registry = ModuleRegistry()
@@ -1,18 +1,50 @@
-import os
-import importlib.util
 import inspect
 
+from types import ModuleType
 from typing import List, Tuple, Dict, Any
 
+from testipy.lib_modules.module_registry import module_registry
+
 
 # returns str comment from class or function
 def get_comment(obj) -> str:
-    comment = inspect.getcomments(obj)
+    return format_comment(inspect.getcomments(obj))
+
+
+# returns str comment without the leading #
+def format_comment(comment: str) -> str:
     if comment:
         comment = comment.lstrip("#").replace("\n# ", "\n").replace("\n", "\n").strip()
     return comment
 
 
+# returns str comment lines immediately preceding source line lnum (0 based), same as inspect.getcomments
+def get_comments_from_source_lines(lines: List[str], lnum: int) -> str:
+    if lnum <= 0:
+        return None
+
+    indent = inspect.indentsize(lines[lnum])
+    end = lnum - 1
+    if end >= 0 and lines[end].lstrip()[:1] == "#" and inspect.indentsize(lines[end]) == indent:
+        comments = [lines[end].expandtabs().lstrip()]
+        if end > 0:
+            end = end - 1
+            comment = lines[end].expandtabs().lstrip()
+            while comment[:1] == "#" and inspect.indentsize(lines[end]) == indent:
+                comments[:0] = [comment]
+                end = end - 1
+                if end < 0:
+                    break
+                comment = lines[end].expandtabs().lstrip()
+        while comments and comments[0].strip() == "#":
+            comments[:1] = []
+        while comments and comments[-1].strip() == "#":
+            comments[-1:] = []
+        return "".join(comments)
+
+    return None
+
+
 # returns str doc from class or function
 def get_doc(obj) -> str:
     """
@@ -21,15 +53,19 @@ def get_doc(obj) -> str:
     return inspect.getdoc(obj)
 
 
-# returns module from a .py file
-def import_module_from_file(full_path_filename: str):
-    filename = os.path.basename(full_path_filename)
+# returns module from a .py file, executed only the first time (or if the file was changed since), with its package folders available for imports
+def import_module_from_file(full_path_filename: str, root_folder: str = "") -> ModuleType:
+    return module_registry.load(full_path_filename, root_folder)
+
+
+# returns module from a .py file, executed again even if not changed
+def reload_module_from_file(full_path_filename: str, root_folder: str = "") -> ModuleType:
+    return module_registry.reload(full_path_filename, root_folder)
 
-    spec = importlib.util.spec_from_file_location(filename[:-3], full_path_filename)
-    module_obj = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(module_obj)
 
-    return module_obj
+# returns the class with that name inside the python file
+def get_class_from_file(full_path_filename: str, class_name: str, root_folder: str = ""):
+    return getattr(import_module_from_file(full_path_filename, root_folder), class_name)
 
 
 # returns list with all classes, vars, functions, etc...
@@ -1,7 +1,7 @@
 import os
 import sys
 
-from typing import List, Set, Dict
+from typing import List, Set, Dict, Tuple
 from getpass import getuser
 from socket import gethostname
 from dataclasses import dataclass
@@ -30,6 +30,19 @@ class StartArguments:
     onlyonce: bool
     repetitions: int
     suite_threads: int
+    suite_processes: int
+    suite_processes_recycle: int
+    suite_processes_max_rss: int
+    package_threads: int
+    async_concurrency: int
+    timeout: float
+    maxfail: int
+    result_cache: bool
+    record_impact: bool
+    journal: bool
+    coordinator_address: str
+    shard_index: int
+    shard_total: int
 
     storyboard: List[str]
 
@@ -53,8 +66,15 @@ class ParseStartArguments:
     def _get_rid(self) -> str:
         return str(self.ap.get_option("-rid", get_current_short_time())).zfill(6)
 
+    # returns str, with the results folder of the run being resumed (-resume), or empty
+    def _get_resume_folder(self) -> str:
+        resume_folder = self.ap.get_option("-resume", "")
+        return os.path.abspath(resume_folder).rstrip(os.sep) if resume_folder else ""
+
     # returns str, with witch home folder have been storing the results
     def _get_results_folder_base(self) -> str:
+        if resume_folder := self._get_resume_folder():
+            return os.path.dirname(resume_folder)
         return os.path.join(str(self.ap.get_option("-rf", default_config.default_results_folder)),
                             self._get_project_name())
 
@@ -66,12 +86,15 @@ class ParseStartArguments:
     def _get_environment_name(self) -> str:
         return str(self.ap.get_option("-env", default_config.default_environment_name)).lower()
 
-    # returns str, with folder_id (ex: testipy_20201231_00123)
+    # returns str, with folder_id (ex: testipy_20201231_00123), and the shard (ex: testipy_20201231_00123_shard2of4)
     def _generate_foldername_runtime(self) -> str:
+        if resume_folder := self._get_resume_folder():
+            return os.path.basename(resume_folder)
+        shard_index, shard_total = self.get_shard()
         return default_config.default_foldername_separator.join(
             (self._get_project_name(),
             get_current_short_date(),
-            self._get_rid())
+            self._get_rid()) + ((f"shard{shard_index}of{shard_total}",) if shard_total > 1 else ())
         )
 
     # returns str, with folder tha will store this results
@@ -129,6 +152,97 @@ class ParseStartArguments:
             raise ValueError("Number of suite_threads cannot exceed 8.")
         return st
 
+    def get_suite_processes(self) -> int:
+        if self._is_debugcode():
+            return 1
+
+        sp = int(self.ap.get_option("-sp", str(default_config.suite_processes)))
+        if sp < 1:
+            raise ValueError("Number of suite_processes must be at least 1.")
+        return sp
+
+    # returns int, with the suites a -sp worker process runs before it is replaced by a new one (0 is never)
+    def get_suite_processes_recycle(self) -> int:
+        if self._is_debugcode():
+            return 0
+
+        recycle = int(self.ap.get_option("-sp-recycle", str(default_config.suite_processes_recycle)))
+        if recycle < 0:
+            raise ValueError("Suites before recycling a worker process cannot be negative.")
+        return recycle
+
+    # returns int, with the MB of memory a -sp worker process can use after a suite, or it is replaced (0 is no limit)
+    def get_suite_processes_max_rss(self) -> int:
+        if self._is_debugcode():
+            return 0
+
+        max_rss = int(self.ap.get_option("-sp-max-rss", str(default_config.suite_processes_max_rss)))
+        if max_rss < 0:
+            raise ValueError("Max memory of a worker process cannot be negative.")
+        return max_rss
+
+    def get_package_threads(self) -> int:
+        if self._is_debugcode():
+            return 1
+
+        pt = int(self.ap.get_option("-pt", str(default_config.package_threads)))
+        if pt < 1:
+            raise ValueError("Number of package_threads must be at least 1.")
+        return pt
+
+    def get_async_concurrency(self) -> int:
+        ac = int(self.ap.get_option("-ac", str(default_config.async_concurrency)))
+        if ac < 1:
+            raise ValueError("Async concurrency must be at least 1.")
+        return ac
+
+    # returns float, with the seconds of the test methods without @TIMEOUT (0 is no timeout)
+    def get_timeout(self) -> float:
+        timeout = float(self.ap.get_option("-timeout", str(default_config.test_method_timeout)))
+        if timeout < 0:
+            raise ValueError("Timeout cannot be negative.")
+        return timeout
+
+    # returns int, with the failed tests after which the remaining ones are skipped (0 is never)
+    def get_maxfail(self) -> int:
+        if self.ap.has_flag_or_option("--fail-fast"):
+            return 1
+        maxfail = int(self.ap.get_option("-maxfail", str(default_config.maxfail)))
+        if maxfail < 0:
+            raise ValueError("Max fail cannot be negative.")
+        return maxfail
+
+    # returns bool, if the test methods that passed are not called again while unchanged
+    def _is_result_cache(self) -> bool:
+        if self.ap.has_flag_or_option("--no-cache"):
+            return False
+        return default_config.result_cache or self.ap.has_flag_or_option("--cache-results")
+
+    # returns bool, if every event of the run is recorded on its journal, so it can be resumed (a resumed run appends to it)
+    def _is_journal(self) -> bool:
+        if self.ap.has_flag_or_option("--no-journal"):
+            return False
+        return default_config.journal or self.ap.has_flag_or_option("--journal") or self.ap.has_flag_or_option("-resume")
+
+    # returns str, with host:port where the coordinator waits for workers, or empty if not distributed
+    def get_coordinator_address(self) -> str:
+        if self._is_debugcode():
+            return ""
+        coordinator_address = str(self.ap.get_option("-coordinator", ""))
+        if coordinator_address:
+            from testipy.engine.execute_tests_distributed import get_coordinator_key
+
+            # the key is not kept here, as the start arguments are on the results
+            get_coordinator_key(self.ap)
+        return coordinator_address
+
+    # returns (int, int), with the shard to run and the total of shards, (1, 1) if not sharded
+    def get_shard(self) -> Tuple[int, int]:
+        from testipy.engine.read_tests_shard import parse_shard
+
+        shard = self.ap.get_option("-shard", "")
+        return parse_shard(shard) if shard else (1, 1)
+
     def _get_tests_scripts_build(self, full_path_tests_scripts_foldername: str) -> Dict:
         filename = os.path.join(full_path_tests_scripts_foldername, default_config.tests_build_filename)
         try:
@@ -154,6 +268,19 @@ class ParseStartArguments:
             onlyonce=self._is_onlyonce(),
             repetitions=self._get_repetitions(),
             suite_threads=self.get_suite_threads(),
+            suite_processes=self.get_suite_processes(),
+            suite_processes_recycle=self.get_suite_processes_recycle(),
+            suite_processes_max_rss=self.get_suite_processes_max_rss(),
+            package_threads=self.get_package_threads(),
+            async_concurrency=self.get_async_concurrency(),
+            timeout=self.get_timeout(),
+            maxfail=self.get_maxfail(),
+            result_cache=self._is_result_cache(),
+            record_impact=self.ap.has_flag_or_option("--record-impact"),
+            journal=self._is_journal(),
+            coordinator_address=self.get_coordinator_address(),
+            shard_index=self.get_shard()[0],
+            shard_total=self.get_shard()[1],
 
             storyboard=self._get_storyboard(),
 
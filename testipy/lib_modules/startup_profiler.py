@@ -0,0 +1,171 @@
+import os
+import sys
+import json
+import time
+import builtins
+import threading
+import importlib.util
+
+from contextlib import contextmanager
+from typing import List, Dict, NamedTuple
+
+
+class SectionTime(NamedTuple):
+    name: str
+    depth: int
+    start: float
+    duration: float
+
+
+class ImportTime(NamedTuple):
+    module_name: str
+    depth: int
+    self_time: float
+    cumulative_time: float
+    start: float
+
+
+class StartupProfiler:
+    """
+    Measures where the startup time goes (--profile-startup): named sections (discovery, reporters, ...) and the
+    time to import each module, for the first time, while it is running. Imports are measured until stop(), also
+    after end_startup(), so test modules imported lazily, when their suites run, are there too.
+    Nested sections and imports are tracked for each thread (suites and packages can run on several).
+    When not started, section() and measure_import() do nothing.
+    """
+
+    def __init__(self):
+        self.enabled: bool = False
+        self._t0: float = 0.0
+        self._t_end: float = 0.0
+        self._sections: List[SectionTime] = []
+        self._imports: List[ImportTime] = []
+        self._local = threading.local()
+        self._original_import = None
+
+    def start(self):
+        if self.enabled:
+            return
+        self.enabled = True
+        self._t0 = time.perf_counter()
+        self._original_import = builtins.__import__
+        builtins.__import__ = self._timed_import
+
+    # the tests start running, imports are still measured until stop()
+    def end_startup(self):
+        if self.enabled and not self._t_end:
+            self._t_end = time.perf_counter()
+
+    def stop(self):
+        if not self.enabled:
+            return
+        self.end_startup()
+        self.enabled = False
+        if builtins.__import__ is self._timed_import:
+            builtins.__import__ = self._original_import
+
+    # returns list, the cumulative time of the children of each import being measured on this thread, innermost last
+    def _get_children_time(self) -> List[float]:
+        children_time = getattr(self._local, "children_time", None)
+        if children_time is None:
+            children_time = self._local.children_time = []
+        return children_time
+
+    @contextmanager
+    def section(self, name: str):
+        if not self.enabled:
+            yield
+            return
+
+        start = time.perf_counter()
+        depth = getattr(self._local, "depth", 0)
+        self._local.depth = depth + 1
+        try:
+            yield
+        finally:
+            self._local.depth = depth
+            self._sections.append(SectionTime(name, depth, start - self._t0, time.perf_counter() - start))
+
+    # for modules loaded from a file (test suites, reporters), that don't go through the import statement
+    @contextmanager
+    def measure_import(self, module_name: str):
+        if not self.enabled:
+            yield
+            return
+
+        self._get_children_time().append(0.0)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._add_import(module_name, start)
+
+    def _add_import(self, module_name: str, start: float):
+        cumulative_time = time.perf_counter() - start
+        children_time = self._get_children_time()
+        self_time = cumulative_time - children_time.pop()
+        if children_time:
+            children_time[-1] += cumulative_time
+        self._imports.append(ImportTime(module_name, len(children_time), self_time, cumulative_time, start - self._t0))
+
+    def _timed_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        module_name = name
+        if level > 0:
+            try:
+                module_name = importlib.util.resolve_name("." * level + name, (globals or {}).get("__package__"))
+            except (ImportError, ValueError):
+                pass
+
+        # already imported, so nothing to measure
+        if module_name in sys.modules:
+            return self._original_import(name, globals, locals, fromlist, level)
+
+        self._get_children_time().append(0.0)
+        start = time.perf_counter()
+        try:
+            return self._original_import(name, globals, locals, fromlist, level)
+        finally:
+            self._add_import(module_name, start)
+
+    def get_total_time(self) -> float:
+        return (self._t_end or time.perf_counter()) - self._t0
+
+    def as_dict(self) -> Dict:
+        return dict(
+            total_time=self.get_total_time(),
+            sections=[section._asdict() for section in sorted(self._sections, key=lambda s: s.start)],
+            imports=[imp._asdict() for imp in sorted(self._imports, key=lambda i: i.cumulative_time, reverse=True)]
+        )
+
+    def get_report(self) -> str:
+        from tabulate import tabulate
+
+        sections = [(s.name, s.duration * 1000.0, s.start * 1000.0)
+                    for s in sorted(self._sections, key=lambda s: s.duration, reverse=True)]
+        imports = [(i.module_name, i.self_time * 1000.0, i.cumulative_time * 1000.0, i.start * 1000.0)
+                   for i in sorted(self._imports, key=lambda i: i.self_time, reverse=True)]
+
+        return "\n".join([
+            f"Startup took {self.get_total_time() * 1000.0:.1f}ms",
+            "",
+            "Sections (by duration):",
+            tabulate(sections, headers=("Section", "Duration ms", "Started at ms"), floatfmt=".1f", tablefmt="simple"),
+            "",
+            f"Imports (by self time), {len(self._imports)} modules imported, also while the tests run:",
+            tabulate(imports, headers=("Module", "Self ms", "Cumulative ms", "Started at ms"), floatfmt=".1f", tablefmt="simple"),
+        ])
+
+    # returns tuple, with the full path of the report and json files
+    def save(self, folder: str, report_filename: str, json_filename: str):
+        report_fpn = os.path.join(folder, report_filename)
+        json_fpn = os.path.join(folder, json_filename)
+
+        with open(report_fpn, "w") as f:
+            f.write(self.get_report() + "\n")
+        with open(json_fpn, "w") as f:
+            json.dump(self.as_dict(), f, indent=1)
+
+        return report_fpn, json_fpn
+
+
+startup_profiler = StartupProfiler()
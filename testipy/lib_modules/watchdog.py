@@ -0,0 +1,119 @@
+import time
+import heapq
+import itertools
+import threading
+
+from typing import Callable, List, Tuple, Union
+
+
+class WatchHandle:
+    """
+    A callback the watchdog calls when its time is over, unless cancelled before.
+    The callback runs holding the handle lock, so cancel() waits for it to end, and returns False if it already ran.
+    """
+
+    def __init__(self, timeout: Union[float, None], callback: Callable, args: Tuple):
+        self.timeout = timeout
+        self.deadline = time.perf_counter() + timeout if timeout else None
+        self.fired_at: float = 0.0
+        self._callback = callback
+        self._args = args
+        self.lock = threading.RLock()
+        self._cancelled = False
+        self._fired = False
+
+    def fire(self):
+        with self.lock:
+            if self._cancelled or self._fired:
+                return
+            self._fired = True
+            self.fired_at = time.perf_counter()
+            self._callback(*self._args)
+
+    # returns bool, True if cancelled before its callback was called
+    def cancel(self) -> bool:
+        with self.lock:
+            if not self._fired:
+                self._cancelled = True
+            return not self._fired
+
+    def is_fired(self) -> bool:
+        return self._fired
+
+    def is_done(self) -> bool:
+        return self._cancelled or self._fired
+
+
+class Watchdog:
+    """
+    One thread (only started when needed) that fires the handles whose time is over, in deadline order.
+    Handles without timeout are not scheduled, but can still be fired by whoever has them (ex: suite timeout).
+    """
+
+    def __init__(self):
+        self._heap: List[Tuple[float, int, WatchHandle]] = []
+        self._seq = itertools.count()
+        self._condition = threading.Condition()
+        self._thread: threading.Thread = None
+
+    # returns WatchHandle, to be cancelled when done
+    def watch(self, timeout: Union[float, None], callback: Callable, *args) -> WatchHandle:
+        handle = WatchHandle(timeout, callback, args)
+        if handle.deadline is not None:
+            with self._condition:
+                heapq.heappush(self._heap, (handle.deadline, next(self._seq), handle))
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="testipy-watchdog", daemon=True)
+                    self._thread.start()
+                self._condition.notify()
+        return handle
+
+    def _run(self):
+        while True:
+            with self._condition:
+                # cancelled ones are only removed here
+                while self._heap and self._heap[0][2].is_done():
+                    heapq.heappop(self._heap)
+
+                if not self._heap:
+                    self._condition.wait()
+                    continue
+
+                wait_time = self._heap[0][0] - time.perf_counter()
+                if wait_time > 0:
+                    self._condition.wait(wait_time)
+                    continue
+
+                _, _, handle = heapq.heappop(self._heap)
+
+            try:
+                handle.fire()
+            except Exception:
+                pass
+
+
+# replaces an exception raised on this thread, that didn't land yet
+class _ClearedException(BaseException):
+    pass
+
+
+# returns bool, if the exception will be raised on that thread when it runs python code again (not while blocked on C code)
+def raise_in_thread(thread_ident: int, exc_type: type) -> bool:
+    import ctypes
+
+    return ctypes.pythonapi.PyThreadState_SetAsyncExc(ctypes.c_ulong(thread_ident), ctypes.py_object(exc_type)) == 1
+
+
+# an exception raised on this thread (raise_in_thread) that didn't land yet is replaced by one that lands here, when the
+# C call returns (the loop is a fallback, for pythons that check for it later). Clearing it with NULL is not done, that
+# leaves the interpreter checking for one forever (and hangs with sys.settrace on python 3.11)
+def clear_raised_in_this_thread():
+    try:
+        raise_in_thread(threading.get_ident(), _ClearedException)
+        for _ in range(100):
+            pass
+    except _ClearedException:
+        pass
+
+
+watchdog = Watchdog()
@@ -1,4 +1,7 @@
-from typing import Union, List, Set, Dict
+from collections import deque
+from typing import Union, List, Set, Dict, Iterable
+
+from testipy.lib_modules import py_inspector, common_methods as cm
 
 
 class TestMethodAttr:
@@ -8,13 +11,15 @@ class TestMethodAttr:
             name: str = "", comment: str = "", prio: int = 0, level: int = 1,
             features: str = "", test_number: str = "",
             tags: Set[str] = None,
-            depends: Set[int] = None, on_success: Set[int] = None, on_failure: Set[int] = None
+            depends: Set[int] = None, on_success: Set[int] = None, on_failure: Set[int] = None,
+            timeout: float = 0.0
     ):
         self.suite_attr: SuiteAttr = suite_attr
 
         self.method_name: str = method_name
-        self.method_obj: object = method_obj
-        self.method_id: int = suite_attr.get_max_test_method_id()
+        self._method_obj: object = method_obj
+        self._method_id: int = 0
+        self.method_id = suite_attr.get_max_test_method_id()
 
         self.param: object = param
         self.ncycles: int = ncycles
@@ -30,15 +35,38 @@ class TestMethodAttr:
         self.depends: Set[int] = depends or set()
         self.on_success: Set[int] = on_success or set()
         self.on_failure: Set[int] = on_failure or set()
-        
-        suite_attr.test_method_attr_list.append(self)
+
+        # @TIMEOUT, seconds each call of the test method can take (0 is the -timeout given)
+        self.timeout: float = timeout
+
+        suite_attr.add_test_method_attr(self)
+
+    @property
+    def method_id(self) -> int:
+        return self._method_id
+
+    @method_id.setter
+    def method_id(self, method_id: int):
+        self._method_id = method_id
+        self.suite_attr.update_max_test_method_id(method_id)
+
+    @property
+    def method_obj(self) -> object:
+        # resolved only when needed, so the suite module is imported only if it will run
+        if self._method_obj is None and self.suite_attr.suite_obj is not None:
+            self._method_obj = getattr(self.suite_attr.suite_obj, self.method_name, None)
+        return self._method_obj
+
+    @method_obj.setter
+    def method_obj(self, method_obj: object):
+        self._method_obj = method_obj
 
     def duplicate(self, suite_attr: "SuiteAttr"):
         _new_attr = TestMethodAttr(
             suite_attr=suite_attr,
 
             method_name=self.method_name,
-            method_obj=self.method_obj,
+            method_obj=self._method_obj,
 
             param=self.param,
             ncycles=self.ncycles,
@@ -53,7 +81,8 @@ class TestMethodAttr:
 
             depends=self.depends,
             on_success=self.on_success,
-            on_failure=self.on_failure
+            on_failure=self.on_failure,
+            timeout=self.timeout
         )
         _new_attr.method_id = self.method_id
 
@@ -77,7 +106,8 @@ class TestMethodAttr:
 
             depends=list(self.depends),
             on_success=list(self.on_success),
-            on_failure=list(self.on_failure)
+            on_failure=list(self.on_failure),
+            timeout=self.timeout
         )
 
     def __repr__(self):
@@ -87,21 +117,29 @@ class TestMethodAttr:
 class SuiteAttr:
     def __init__(self, package_attr: "PackageAttr", filename: str, suite_name: str,
                  suite_obj: object = None, ncycles: int = 1, suite_kwargs: dict = None,
+                 full_path_filename: str = "",
                  test_method_attr_list: List[TestMethodAttr] = None,
                  name: str = "", comment: str = "", prio: int = 0, level: int = 1,
                  features: str = "", test_number: str = "",
-                 tags: Set[str] = None):
+                 tags: Set[str] = None, parallel: int = 0, timeout: float = 0.0,
+                 fixtures: List[str] = None):
         self.package: PackageAttr = package_attr
 
         self.filename: str = filename
+        self.full_path_filename: str = full_path_filename
         self.suite_name: str = suite_name
-        self.suite_obj = suite_obj
-        self.suite_id: int = package_attr.get_max_suite_id()
+        self._suite_obj = suite_obj
+        self._suite_id: int = 0
         self.suite_kwargs: dict = suite_kwargs or {}
 
         self.app = None
 
         self.test_method_attr_list: List[TestMethodAttr] = test_method_attr_list or []
+        self._test_method_by_method_name: Dict[str, TestMethodAttr] = dict()
+        self._test_method_by_name: Dict[str, TestMethodAttr] = dict()
+        self._indexed_test_methods: int = 0
+        self._max_test_method_id: int = 0
+        self._reindex_test_methods()
         self.ncycles: int = ncycles
 
         self.name: str = name or suite_name or filename
@@ -111,30 +149,101 @@ class SuiteAttr:
         self.features: str = features
         self.test_number: str = test_number
         self.tags: Set[str] = tags or set()
-        
-        package_attr.suite_attr_list.append(self)
 
-    def get_test_method_by_name(self, name: str) -> Union[TestMethodAttr, None]:
+        # @PARALLEL, max test methods running at the same time, following their dependencies (0 is one by one)
+        self.parallel: int = parallel
+
+        # @TIMEOUT, seconds for all cycles of the suite (0 is no timeout)
+        self.timeout: float = timeout
+
+        # @FIXTURES, names of the fixtures given to the suite __init__()
+        self.fixtures: List[str] = fixtures or []
+
+        self._dependency_graph: Union[DependencyGraph, None] = None
+        self._dependency_graph_key: tuple = ()
+
+        self.suite_id = package_attr.get_max_suite_id()
+        package_attr.add_suite_attr(self)
+
+    @property
+    def suite_id(self) -> int:
+        return self._suite_id
+
+    @suite_id.setter
+    def suite_id(self, suite_id: int):
+        self._suite_id = suite_id
+        self.package.update_max_suite_id(suite_id)
+
+    @property
+    def suite_obj(self):
+        # the suite module is only imported the first time its class is needed
+        if self._suite_obj is None and self.full_path_filename:
+            self._suite_obj = py_inspector.get_class_from_file(self.full_path_filename, self.suite_name, cm.TESTS_ROOT_FOLDER)
+        return self._suite_obj
+
+    @suite_obj.setter
+    def suite_obj(self, suite_obj):
+        self._suite_obj = suite_obj
+
+    # the list can still be changed directly, so the indexes are rebuilt when it no longer has the same size
+    def _reindex_test_methods(self):
+        self._test_method_by_method_name.clear()
+        self._test_method_by_name.clear()
         for test_method_attr in self.test_method_attr_list:
-            if test_method_attr.method_name == name or test_method_attr.name == name:
-                return test_method_attr
-        return None
+            self._test_method_by_method_name.setdefault(test_method_attr.method_name, test_method_attr)
+            self._test_method_by_name.setdefault(test_method_attr.name, test_method_attr)
+        self._indexed_test_methods = len(self.test_method_attr_list)
+        self._max_test_method_id = max([ma.method_id for ma in self.test_method_attr_list], default=0)
+
+    def _check_test_methods_index(self):
+        if self._indexed_test_methods != len(self.test_method_attr_list):
+            self._reindex_test_methods()
+
+    def add_test_method_attr(self, test_method_attr: TestMethodAttr):
+        self._check_test_methods_index()
+        self.test_method_attr_list.append(test_method_attr)
+        self._test_method_by_method_name.setdefault(test_method_attr.method_name, test_method_attr)
+        self._test_method_by_name.setdefault(test_method_attr.name, test_method_attr)
+        self._indexed_test_methods += 1
+        self.update_max_test_method_id(test_method_attr.method_id)
+
+    def update_max_test_method_id(self, method_id: int):
+        if method_id > self._max_test_method_id:
+            self._max_test_method_id = method_id
+
+    def get_test_method_by_name(self, name: str) -> Union[TestMethodAttr, None]:
+        self._check_test_methods_index()
+        by_method_name = self._test_method_by_method_name.get(name)
+        by_name = self._test_method_by_name.get(name)
+
+        # when both exist the first on the list is returned
+        if by_method_name is not None and by_name is not None and by_method_name is not by_name:
+            return min(by_method_name, by_name, key=self.test_method_attr_list.index)
+        return by_method_name or by_name
+
+    @property
+    def dependency_graph(self) -> "DependencyGraph":
+        # rebuilt only if the list of test methods was changed since last time
+        key = tuple(map(id, self.test_method_attr_list))
+        if self._dependency_graph is None or self._dependency_graph_key != key:
+            self._dependency_graph = DependencyGraph(self.test_method_attr_list, where=self.suite_name)
+            self._dependency_graph_key = key
+        return self._dependency_graph
 
     def get_max_test_method_id(self) -> int:
-        _max_rec = len(self.test_method_attr_list)
-        _max_id = max([ma.method_id for ma in self.test_method_attr_list]) if _max_rec > 0 else 0
-        return max(_max_rec, _max_id) + 1
+        self._check_test_methods_index()
+        return max(len(self.test_method_attr_list), self._max_test_method_id) + 1
 
     def duplicate(self, package: "PackageAttr", clone_children: bool = True):
         _new_attr = SuiteAttr(
             package_attr=package,
 
             filename=self.filename,
+            full_path_filename=self.full_path_filename,
             suite_name=self.suite_name,
-            suite_obj=self.suite_obj,
+            suite_obj=self._suite_obj,
             suite_kwargs=self.suite_kwargs,
 
-            test_method_attr_list=self.test_method_attr_list,
             ncycles=self.ncycles,
 
             name=self.name,
@@ -143,7 +252,10 @@ class SuiteAttr:
             level=self.level,
             tags=self.tags,
             features=self.features,
-            test_number=self.test_number
+            test_number=self.test_number,
+            parallel=self.parallel,
+            timeout=self.timeout,
+            fixtures=self.fixtures
         )
         _new_attr.suite_id = self.suite_id
 
@@ -157,6 +269,99 @@ class SuiteAttr:
         return f"<SuiteAttr {self.suite_id}: {self.suite_name}[x{self.ncycles}], Methods: {len(self.test_method_attr_list)}>"
 
 
+class DependencyGraph:
+    """
+    Test methods of one suite indexed by @PRIO, where each test points to the prios on its @DEPENDS (@ON_SUCCESS and @ON_FAILURE are also there).
+    A test that depends on its own prio is not a cycle, since other tests with that prio may run before it.
+    """
+
+    def __init__(self, test_method_attr_list: Iterable[TestMethodAttr], where: str = ""):
+        self.where: str = where
+        self._tests_by_prio: Dict[int, List[TestMethodAttr]] = dict()
+        self._dependents_by_prio: Dict[int, List[TestMethodAttr]] = dict()
+        self._depends_by_prio: Dict[int, Set[int]] = dict()
+
+        for test_method_attr in test_method_attr_list:
+            self._tests_by_prio.setdefault(test_method_attr.prio, []).append(test_method_attr)
+            self._depends_by_prio.setdefault(test_method_attr.prio, set()).update(test_method_attr.depends)
+            for prio in test_method_attr.depends:
+                self._dependents_by_prio.setdefault(prio, []).append(test_method_attr)
+
+    def get_tests_by_prio(self, prio: int) -> List[TestMethodAttr]:
+        return self._tests_by_prio.get(prio, [])
+
+    # returns list, of tests that this test depends on
+    def get_dependencies(self, test_method_attr: TestMethodAttr) -> List[TestMethodAttr]:
+        return [ma for prio in sorted(test_method_attr.depends) for ma in self.get_tests_by_prio(prio) if ma is not test_method_attr]
+
+    # returns list, of tests that depend on this test
+    def get_dependents(self, test_method_attr: TestMethodAttr) -> List[TestMethodAttr]:
+        return [ma for ma in self._dependents_by_prio.get(test_method_attr.prio, []) if ma is not test_method_attr]
+
+    # returns list, of prios that make a cycle (first prio repeated at the end), or empty if there is none
+    def find_cycle(self, prios: Iterable[int] = None) -> List[int]:
+        visiting, visited = 1, 2
+        state: Dict[int, int] = dict()
+
+        for start in (self._tests_by_prio if prios is None else prios):
+            if start in state or start not in self._tests_by_prio:
+                continue
+
+            path = [start]
+            stack = [iter(sorted(self._depends_by_prio[start]))]
+            state[start] = visiting
+            while stack:
+                prio = next(stack[-1], None)
+                if prio is None:
+                    state[path.pop()] = visited
+                    stack.pop()
+                elif prio == path[-1] or prio not in self._tests_by_prio or state.get(prio) == visited:
+                    continue
+                elif state.get(prio) == visiting:
+                    return path[path.index(prio):] + [prio]
+                else:
+                    state[prio] = visiting
+                    path.append(prio)
+                    stack.append(iter(sorted(self._depends_by_prio[prio])))
+
+        return []
+
+    def check_cycles(self, prios: Iterable[int] = None):
+        if cycle := self.find_cycle(prios):
+            cycle_str = " -> ".join(f"{self._get_names(prio)}(prio {prio})" for prio in cycle)
+            raise ValueError(f"Circular @DEPENDS in {self.where}: {cycle_str}")
+
+    def _get_names(self, prio: int) -> str:
+        return "/".join(ma.method_name for ma in self.get_tests_by_prio(prio))
+
+    # returns list, of all tests the given ones depend on (directly or not), without the given ones
+    def get_closure(self, test_method_attr_list: Iterable[TestMethodAttr]) -> List[TestMethodAttr]:
+        test_method_attr_list = list(test_method_attr_list)
+        seen_tests = set(map(id, test_method_attr_list))
+        seen_prios = set()
+        queue = deque(prio for ma in test_method_attr_list for prio in ma.depends)
+
+        self.check_cycles(prio for ma in test_method_attr_list for prio in ma.depends)
+
+        closure = []
+        while queue:
+            prio = queue.popleft()
+            if prio in seen_prios:
+                continue
+            seen_prios.add(prio)
+
+            for test_method_attr in self.get_tests_by_prio(prio):
+                if id(test_method_attr) not in seen_tests:
+                    seen_tests.add(id(test_method_attr))
+                    closure.append(test_method_attr)
+                    queue.extend(test_method_attr.depends)
+
+        return closure
+
+    def __repr__(self):
+        return f"<DependencyGraph {self.where}: {len(self._tests_by_prio)} prios, {sum(map(len, self._dependents_by_prio.values()))} dependencies>"
+
+
 class PackageAttr:
     __counter: int = 0
 
@@ -171,18 +376,61 @@ class PackageAttr:
         self.package_id: int = self.__counter
 
         self.suite_attr_list: List[SuiteAttr] = suite_attr_list or []
+        self._suite_by_suite_name: Dict[str, SuiteAttr] = dict()
+        self._suite_by_name: Dict[str, SuiteAttr] = dict()
+        self._indexed_suites: int = 0
+        self._max_suite_id: int = 0
+        self._reindex_suites()
+
         self.ncycles: int = ncycles
 
+    # the list can still be changed directly, so the indexes are rebuilt when it no longer has the same size
+    def _reindex_suites(self):
+        self._suite_by_suite_name.clear()
+        self._suite_by_name.clear()
+        for suite_attr in self.suite_attr_list:
+            self._suite_by_suite_name.setdefault(suite_attr.suite_name, suite_attr)
+            self._suite_by_name.setdefault(suite_attr.name, suite_attr)
+        self._indexed_suites = len(self.suite_attr_list)
+        self._max_suite_id = max([suite_attr.suite_id for suite_attr in self.suite_attr_list], default=0)
+
+    def _check_suites_index(self):
+        if self._indexed_suites != len(self.suite_attr_list):
+            self._reindex_suites()
+
+    def add_suite_attr(self, suite_attr: SuiteAttr):
+        self._check_suites_index()
+        self.suite_attr_list.append(suite_attr)
+        self._suite_by_suite_name.setdefault(suite_attr.suite_name, suite_attr)
+        self._suite_by_name.setdefault(suite_attr.name, suite_attr)
+        self._indexed_suites += 1
+        self.update_max_suite_id(suite_attr.suite_id)
+
+    def remove_suite_attr(self, suite_attr: SuiteAttr):
+        # usually the last one added
+        if self.suite_attr_list and self.suite_attr_list[-1] is suite_attr:
+            self.suite_attr_list.pop()
+        else:
+            self.suite_attr_list.remove(suite_attr)
+        self._reindex_suites()
+
+    def update_max_suite_id(self, suite_id: int):
+        if suite_id > self._max_suite_id:
+            self._max_suite_id = suite_id
+
     def get_suite_by_name(self, name: str) -> Union[SuiteAttr, None]:
-        for suite in self.suite_attr_list:
-            if suite.suite_name == name or suite.name == name:
-                return suite
-        return None
+        self._check_suites_index()
+        by_suite_name = self._suite_by_suite_name.get(name)
+        by_name = self._suite_by_name.get(name)
+
+        # when both exist the first on the list is returned
+        if by_suite_name is not None and by_name is not None and by_suite_name is not by_name:
+            return min(by_suite_name, by_name, key=self.suite_attr_list.index)
+        return by_suite_name or by_name
 
     def get_max_suite_id(self) -> int:
-        _max_rec = len(self.suite_attr_list)
-        _max_id = max([suite_attr.suite_id for suite_attr in self.suite_attr_list]) if _max_rec > 0 else 0
-        return max(_max_rec, _max_id) + 1
+        self._check_suites_index()
+        return max(len(self.suite_attr_list), self._max_suite_id) + 1
 
     def get_max_test_method_id(self):
         _max_rec = len(self.suite_attr_list)
@@ -192,7 +440,6 @@ class PackageAttr:
     def duplicate(self, clone_children: bool = True):
         _new_attr = PackageAttr(
             package_name=self.package_name,
-            suite_attr_list=self.suite_attr_list,
             ncycles=self.ncycles
         )
         _new_attr.package_id = self.package_id
@@ -248,6 +495,14 @@ def get_package_by_name(package_attr_list: List[PackageAttr], name: str) -> Unio
     return None
 
 
+# returns dict, package_name: PackageAttr (the first one if repeated), to search many packages by name
+def get_packages_by_name(package_attr_list: List[PackageAttr]) -> Dict[str, PackageAttr]:
+    packages_by_name: Dict[str, PackageAttr] = dict()
+    for package_attr in package_attr_list:
+        packages_by_name.setdefault(package_attr.package_name, package_attr)
+    return packages_by_name
+
+
 # show test list
 def show_test_structure(package_attr_list: List[PackageAttr]) -> str:
     str_res = ""
@@ -1,9 +1,11 @@
 from __future__ import annotations
+import threading
+
+from contextvars import ContextVar
 from typing import Dict, List, Set, NamedTuple, Any, Union, TYPE_CHECKING
-from tabulate import tabulate
 
 from testipy.configs import enums_data, default_config
-from testipy.lib_modules.common_methods import get_datetime_now
+from testipy.lib_modules.common_methods import get_datetime_now, get_package_folder
 from testipy.lib_modules.state_counter import StateCounter
 
 if TYPE_CHECKING:
@@ -11,6 +13,10 @@ if TYPE_CHECKING:
     from testipy.reporter.report_manager import ReportManager
 
 
+# current test method of each SuiteDetails (by id) running on the thread or async test method, only while set
+_current_test_method_attr_by_suite: ContextVar[Dict[int, TestMethodAttr]] = ContextVar("current_test_method_attr_by_suite", default={})
+
+
 class TestInfo(NamedTuple):
     timestamp: int
     time: str
@@ -74,33 +80,56 @@ class SuiteDetails(CommonDetails):
 
         self.package: PackageDetails = parent
         self.suite_attr: SuiteAttr = suite_attr
-        self.current_test_method_attr: TestMethodAttr = None
+        self.package_folder: str = get_package_folder(parent.package_attr.package_name)
         self.test_state_by_prio: Dict[int, Set] = dict()  # {2: {"PASS", "SKIP"}, 10: ...
         self.rb_test_result_rows: List = []
         self.test_manager: TestManager = TestManager(self)
 
+        # test methods of a @PARALLEL suite run on their own threads (or event loop tasks), each with its current test method
+        self._current_test_method_attr: TestMethodAttr = None
+        self._lock = threading.Lock()
+
+    @property
+    def current_test_method_attr(self) -> Union[TestMethodAttr, None]:
+        # the last one set, anywhere, if not set on this thread or task (ex: a thread started by the test itself)
+        return _current_test_method_attr_by_suite.get().get(id(self), self._current_test_method_attr)
+
     def set_current_test_method_attr(self, test_method_attr: Union[TestMethodAttr, None]) -> SuiteDetails:
-        self.current_test_method_attr = test_method_attr
+        # a new dict, so other threads or tasks that copied this context keep theirs, without the suites that ended
+        current_by_suite = dict(_current_test_method_attr_by_suite.get())
+        if test_method_attr is None:
+            current_by_suite.pop(id(self), None)
+        else:
+            current_by_suite[id(self)] = test_method_attr
+        _current_test_method_attr_by_suite.set(current_by_suite)
+
+        self._current_test_method_attr = test_method_attr
         return self
 
     def endSuite(self):
         self.end_time = get_datetime_now()
 
+    # returns str, full path of the package folder, for files relative to the tests, without depending on the cwd
+    def get_package_folder(self) -> str:
+        return self.package_folder
+
     def startTest(self, test_name: str = "") -> TestDetails:
         assert self.current_test_method_attr is not None, f"Must suite_details.set_current_test_method_attr(tma: TestMethodAttr) before this! {test_name=}"
         current_test = self.test_manager.startTest(self.current_test_method_attr, test_name)
         return current_test
 
     def update_package_suite_counters(self, prio: int, state: str, reason_of_state: str):
-        if prio not in self.test_state_by_prio:
-            self.test_state_by_prio[prio] = set()
-        self.test_state_by_prio[prio].add(state)
+        with self._lock:
+            if prio not in self.test_state_by_prio:
+                self.test_state_by_prio[prio] = set()
+            self.test_state_by_prio[prio].add(state)
 
         self.state_counter.inc_state(state, reason_of_state=reason_of_state, description="update suite counters")
         self.package.update_package_suite_counters(state, reason_of_state)
 
     def get_test_state_by_prio(self, prio: int) -> Set[str]:
-        return self.test_state_by_prio.get(prio, {})
+        with self._lock:
+            return set(self.test_state_by_prio.get(prio, ()))
 
     def get_tests_by_meid(self, test_method_id: int) -> List[TestDetails]:
         return self.test_manager.get_tests_by_meid(test_method_id)
@@ -209,6 +238,8 @@ class TestDetails(CommonDetails):
         return self._test_step
 
     def get_test_step_counters_tabulate(self, tablefmt="simple") -> str:
+        from tabulate import tabulate
+
         # reverse timed_laps row order, with timestamp being the first column
         tl = [(
             str(lap.timed_all_end)[:23],
@@ -282,6 +313,9 @@ class PackageManager:
         self.state_counter.inc_state(state, reason_of_state=reason_of_state, description="update global counters")
 
     def get_duration(self) -> float:
+        # no package started (ex: shard with no suites)
+        if self.start_time is None:
+            return 0.0
         if not self.end_time:
             self.end_time = get_datetime_now()
         return (self.end_time - self.start_time).total_seconds()
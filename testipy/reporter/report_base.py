@@ -1,8 +1,6 @@
 from __future__ import annotations
 
-import pandas as pd
-
-from typing import Dict, List
+from typing import Dict, List, TYPE_CHECKING
 from mimetypes import guess_type
 
 from testipy.configs import enums_data, default_config
@@ -10,6 +8,9 @@ from testipy.models import PackageAttr, SuiteAttr, TestMethodAttr, PackageManage
 from testipy.reporter.report_interfaces import ReportInterface
 from testipy.lib_modules.common_methods import get_current_date_time_ns, get_timestamp
 
+if TYPE_CHECKING:
+    import pandas as pd
+
 
 class ReportBase(ReportInterface):
 
@@ -29,20 +30,27 @@ class ReportBase(ReportInterface):
         # sequencial counter for test_id
         self._test_id_counter = 0
 
-        # results stored in da Pandas Dataframe
-        self._df = pd.DataFrame(columns=self._df_columns)
+        # results stored as rows, the Pandas Dataframe is only created (and pandas imported) when asked for
+        self._df_rows: List[List] = []
+        self._df: pd.DataFrame = None
 
     # <editor-fold desc="--- Gets ---">
     def get_selected_tests(self) -> List[PackageAttr]:
         return self._selected_tests
 
     def get_selected_tests_as_df(self) -> pd.DataFrame:
+        if self._selected_tests_as_df is None and self._selected_tests_as_dict is not None:
+            import pandas as pd
+            self._selected_tests_as_df = pd.DataFrame(self._selected_tests_as_dict["data"], columns=self._selected_tests_as_dict["headers"])
         return self._selected_tests_as_df
 
     def get_selected_tests_as_dict(self) -> Dict[str, List]:
         return self._selected_tests_as_dict
 
     def get_df(self) -> pd.DataFrame:
+        if self._df is None or self._df.shape[0] != len(self._df_rows):
+            import pandas as pd
+            self._df = pd.DataFrame(self._df_rows, columns=self._df_columns)
         return self._df.copy()
 
     @staticmethod
@@ -63,7 +71,7 @@ class ReportBase(ReportInterface):
     def _startup_(self, selected_tests: List[PackageAttr]):
         self._selected_tests = selected_tests
         self._selected_tests_as_dict = format_test_structure_for_reporters(selected_tests)
-        self._selected_tests_as_df = pd.DataFrame(self._selected_tests_as_dict["data"], columns=self._selected_tests_as_dict["headers"])
+        self._selected_tests_as_df = None
 
     def _teardown_(self, end_state):
         totals = self.pm.state_counter
@@ -92,22 +100,10 @@ class ReportBase(ReportInterface):
     def end_suite(self, sd: SuiteDetails):
         sd.endSuite()
 
-        # update DataFrame with all ended tests for this suite
-        df_size = self._df.shape[0]
-        new_rows = pd.DataFrame(
-            sd.rb_test_result_rows,
-            columns=self._df_columns,
-            index=range(df_size, df_size + len(sd.rb_test_result_rows))
-        )
-
-        if df_size == 0:
-            self._df = new_rows
-        else:
-            df1 = self._df.dropna(axis=1, how="all")
-            df2 = new_rows.dropna(axis=1, how="all")
-            self._df = pd.concat([df1, df2], axis=0, join="outer", ignore_index=True, copy=False)
-
-        # clear list since they were added to DataFrame
+        # keep all ended tests for this suite, to be on the DataFrame
+        self._df_rows.extend(sd.rb_test_result_rows)
+
+        # clear list since they were added to the results
         sd.rb_test_result_rows.clear()
 
     def startTest(self, sd: SuiteDetails, test_method_attr: TestMethodAttr, test_name: str, usecase: str, description: str) -> TestDetails:
@@ -8,17 +8,22 @@ from testipy import get_exec_logger
 from testipy.configs import default_config
 from testipy.lib_modules.args_parser import ArgsParser
 from testipy.lib_modules.start_arguments import StartArguments
-from testipy.lib_modules.browser_manager import BrowserManager
-from testipy.lib_modules import webhook_http_listener as HL
 from testipy.models import PackageDetails, SuiteDetails, TestDetails
 
 if TYPE_CHECKING:
     from testipy.models import PackageAttr
+    from testipy.lib_modules.browser_manager import BrowserManager
 
 
 _exec_logger = get_exec_logger()
 
 
+# http.server is only imported when the webhook listener is used
+def _get_http_listener():
+    from testipy.lib_modules import webhook_http_listener as HL
+    return HL
+
+
 class ReportInterface(ABC):
 
     def __init__(self, name: str = ""):
@@ -96,6 +101,9 @@ class ReportManagerAddons:
     def get_ap(self) -> ArgsParser:
         return self._ap
 
+    def get_sa(self) -> StartArguments:
+        return self._sa
+
     def has_ap_flag(self, key: str) -> bool:
         return self._ap.has_flag_or_option(key)
 
@@ -147,27 +155,27 @@ class ReportManagerAddons:
 
     @staticmethod
     def start_http_servers(tcp_ports_list: List, listeners_list: List = None):
-        HL.start_http_servers(tcp_ports_list, listeners_list, blocking=False, verbose=False)
+        _get_http_listener().start_http_servers(tcp_ports_list, listeners_list, blocking=False, verbose=False)
 
     @staticmethod
     def set_listeners(listeners_list: List, append: bool = False):
-        HL.set_listeners(listeners_list, append=append)
+        _get_http_listener().set_listeners(listeners_list, append=append)
 
     @staticmethod
     def close_all_http_ports():
-        HL.close_all_http_ports()
+        _get_http_listener().close_all_http_ports()
 
     @staticmethod
     def close_http_port(port: int):
-        HL.close_http_port(port)
+        _get_http_listener().close_http_port(port)
 
     @staticmethod
     def is_port_open(port: int) -> bool:
-        return HL.close_http_port(port)
+        return _get_http_listener().close_http_port(port)
 
     @staticmethod
     def get_last_message_received() -> Dict:
-        return HL.get_last_message_received()
+        return _get_http_listener().get_last_message_received()
 
     # </editor-fold>
 
@@ -175,15 +183,18 @@ class ReportManagerAddons:
     def is_browser_setup(self) -> bool:
         return self.browser_manager is not None and self.browser_manager.is_browser_setup()
 
-    def set_default_webdriver(self, default_browser_settings):
+    # the browser manager (and playwright) is only imported when a test needs a browser
+    def _get_browser_manager(self) -> BrowserManager:
         if self.browser_manager is None:
+            from testipy.lib_modules.browser_manager import BrowserManager
             self.browser_manager = BrowserManager(self)
+        return self.browser_manager
 
-        self.browser_manager.set_default_webdriver(default_browser_settings)
+    def set_default_webdriver(self, default_browser_settings):
+        self._get_browser_manager().set_default_webdriver(default_browser_settings)
 
     def get_bm(self) -> BrowserManager:
-        if self.browser_manager is None:
-            self.browser_manager = BrowserManager(self)
+        self._get_browser_manager()
 
         if not self.browser_manager.is_browser_setup():
             return self.browser_manager.setup_webdriver()
@@ -197,8 +208,7 @@ class ReportManagerAddons:
                         method_args: dict = {},
                         device: dict = {},
                         is_custom: bool = True, **trash):
-        if self.browser_manager is None:
-            self.browser_manager = BrowserManager(self)
+        self._get_browser_manager()
 
         try:
             self.browser_manager.setup_webdriver(browser_name=browser_name,
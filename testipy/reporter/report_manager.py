@@ -11,6 +11,7 @@ from testipy.lib_modules.textdecor import color_state
 from testipy.lib_modules.args_parser import ArgsParser
 from testipy.lib_modules.start_arguments import StartArguments
 from testipy.lib_modules.py_inspector import get_class_from_file_with_prefix
+from testipy.lib_modules.startup_profiler import startup_profiler
 from testipy.reporter.report_base import ReportBase
 from testipy.reporter.report_interfaces import ReportManagerAddons
 
@@ -39,11 +40,15 @@ class ReportManager(ReportBase, ReportManagerAddons):
 
         attachment = super().save_file(current_test, data, filename)
         self.test_info(current_test, f"Saving file '{filename}'", "DEBUG", attachment=attachment)
-        for reporter_name, reporter in self._reporters_list.items():
-            reporter.save_file(current_test, data, filename)
+        self.reporters_save_file(current_test, data, filename)
 
         return attachment
 
+    # only the reporters, the file was already saved by the ReportManager of the process running the suite
+    def reporters_save_file(self, current_test: TestDetails, data, filename: str):
+        for reporter_name, reporter in self._reporters_list.items():
+            reporter.save_file(current_test, data, filename)
+
     @synchronized
     def copy_file(self, current_test, orig_filename="screenshot.png", dest_filename=None, data=None, delete_source=True):
         if not dest_filename:
@@ -60,8 +65,7 @@ class ReportManager(ReportBase, ReportManagerAddons):
         if data:
             attachment = super().copy_file(current_test, orig_filename, dest_filename, data)
             self.test_info(current_test, f"Copying file '{orig_filename}' to '{dest_filename}'", "DEBUG", attachment=attachment)
-            for reporter_name, reporter in self._reporters_list.items():
-                reporter.copy_file(current_test, orig_filename, dest_filename, data)
+            self.reporters_copy_file(current_test, orig_filename, dest_filename, data)
         else:
             attachment = None
 
@@ -73,11 +77,17 @@ class ReportManager(ReportBase, ReportManagerAddons):
 
         return attachment
 
+    # only the reporters, the file was already copied by the ReportManager of the process running the suite
+    def reporters_copy_file(self, current_test: TestDetails, orig_filename: str, dest_filename: str, data):
+        for reporter_name, reporter in self._reporters_list.items():
+            reporter.copy_file(current_test, orig_filename, dest_filename, data)
+
     def _startup_(self, selected_tests: List[PackageAttr]):
         super()._startup_(selected_tests)
         for reporter_name, reporter in self._reporters_list.items():
             try:
-                reporter._startup_(selected_tests)
+                with startup_profiler.section(f"reporter {reporter_name} _startup_"):
+                    reporter._startup_(selected_tests)
             except Exception as e:
                 _exec_logger.critical(f"Internal error rm._startup_ on {reporter_name}: {e}")
                 if self.is_debugcode():
@@ -302,14 +312,16 @@ def build_report_manager_with_reporters(ap: ArgsParser, sa: StartArguments):
 
     def _add_reporter(rep_name, rep_class):
         try:
-            rep = rep_class(rm, sa)
+            with startup_profiler.section(f"reporter {rep_name} __init__"):
+                rep = rep_class(rm, sa)
             rm.add_reporter(rep_name, rep)
         except Exception as ex:
             _exec_logger.warning(f"Internal error on build_report_manager_with_reporters for {rep_name} {ex}")
 
     for rep_name in sa.valid_reporters:
         reporter_name = f"reporter_{rep_name}.py"
-        _, rep_class = get_reporter_by_name_from_folder(reporter_name)
+        with startup_profiler.section(f"reporter {rep_name} import"):
+            _, rep_class = get_reporter_by_name_from_folder(reporter_name)
         if rep_class:
             _add_reporter(rep_name, rep_class)
         else:
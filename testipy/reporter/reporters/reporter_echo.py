@@ -6,7 +6,6 @@ from testipy.configs import enums_data
 from testipy.helpers import format_duration, prettify
 from testipy.lib_modules import textdecor
 from testipy.reporter import ReportInterface
-from testipy.reporter.reporters import df_manager as dfm
 
 if TYPE_CHECKING:
     from testipy.models import PackageAttr, PackageDetails, SuiteDetails, TestDetails
@@ -52,6 +51,8 @@ class ReporterEcho(ReportInterface):
         if df.shape[0] == 0:
             return
 
+        from testipy.reporter.reporters import df_manager as dfm
+
         summary = f"{self.rm.pm.state_counter.get_state_percentage(enums_data.STATE_PASSED):.2f}% [{self.rm.pm.state_counter}] took {format_duration(self.rm.pm.get_duration())}"
 
         # show results
@@ -8,7 +8,6 @@ from testipy import get_exec_logger
 from testipy.configs import enums_data
 from testipy.helpers import prettify, format_duration
 from testipy.reporter import ReportInterface
-from testipy.reporter.reporters import df_manager as dfm
 
 if TYPE_CHECKING:
     from testipy.models import PackageAttr, PackageDetails, SuiteDetails, TestDetails
@@ -378,6 +377,8 @@ def _get_div_summary(rm: ReportManager) -> str:
         data = [_obj, name, total_passed, total_skipped, total_failed, total_failed_bug, total, total_perc, duration]
         results.append(data)
 
+    from testipy.reporter.reporters import df_manager as dfm
+
     df = rm.get_df()
     df_packages: pd.DataFrame = dfm.get_state_dummies(df, columns=["Package"])
     for index, row in df_packages.iterrows():
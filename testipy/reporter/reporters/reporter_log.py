@@ -4,7 +4,6 @@ import os
 import logging
 
 from tabulate import tabulate
-from mss import mss
 
 from testipy import get_exec_logger
 from testipy.configs import enums_data
@@ -167,6 +166,7 @@ class ReporterLog(ReportInterface):
     ):
         self.__log_exception(current_test, exc_value)
         if take_screenshot:
+            from mss import mss
             with mss() as sct:
                 self._screenshot_num += 1
                 output_file = f"log_screenshot_{self._screenshot_num:03.0f}.png"
@@ -4,8 +4,7 @@ import os
 import sys
 import cProfile, pstats
 
-from typing import Dict, List
-from tabulate import tabulate
+from typing import Dict, List, Set
 
 
 # allow root folder to be available for imports
@@ -21,6 +20,7 @@ from testipy.reporter.report_manager import build_report_manager_with_reporters
 from testipy.helpers import get_traceback_list, format_duration, prettify
 from testipy.lib_modules.args_parser import ArgsParser
 from testipy.lib_modules.common_methods import get_app_version
+from testipy.lib_modules.startup_profiler import startup_profiler
 from testipy.engine.execution_logger import ExecutionLogger
 from testipy.lib_modules.start_arguments import ParseStartArguments, StartArguments
 
@@ -30,11 +30,33 @@ _exec_logger = get_exec_logger()
 
 
 # <editor-fold desc="--- Just for fun ---">
+# returns str, the intro banner, rendered by pyfiglet only once per version
+def _get_intro_banner() -> str:
+    filename = os.path.join(default_config.default_cache_folder, default_config.intro_cache_filename.format(__version__))
+    try:
+        with open(filename, "r") as f:
+            return f.read()
+    except OSError:
+        pass
+
+    from pyfiglet import Figlet
+    banner = Figlet(font="slant").renderText(f"{__app__} {__version__}")
+
+    try:
+        os.makedirs(default_config.default_cache_folder, exist_ok=True)
+        with open(filename, "w") as f:
+            f.write(banner)
+    except OSError:
+        pass
+
+    return banner
+
+
 def show_intro():
     try:
-        from pyfiglet import Figlet
+        banner = _get_intro_banner()
         print()
-        print(Figlet(font="slant").renderText(f"{__app__} {__version__}"))
+        print(banner)
         print(sys.version)
     except:
         print("WARNING", "no fun if no pyfiglet installed.\nuse: pip3 install pyfiglet", file=sys.stderr)
@@ -44,6 +66,15 @@ def show_intro():
 # </editor-fold>
 
 
+# returns str, two columns table (like tabulate simple format), without the need to import tabulate at startup
+def _format_parameters(parameters: Dict) -> str:
+    rows = [(str(k), str(v)) for k, v in parameters.items()]
+    width = max([len("Parameter")] + [len(k) for k, _ in rows])
+    lines = [f"{'Parameter':<{width}}  Value", f"{'-' * width}  {'-' * 5}"]
+    lines += [f"{k:<{width}}  {v}" for k, v in rows]
+    return "\n".join(lines)
+
+
 class Runner:
     def __init__(self, ap: ArgsParser, sa: StartArguments):
         # configurations and logging
@@ -51,29 +82,113 @@ class Runner:
         self.sa = sa
 
         # Log running parameters
-        p = tabulate([(k, v) for k, v in self.sa.as_dict().items()], headers=("Parameter", "Value"), tablefmt="simple")
-        _exec_logger.debug("Runtime Parameters:\n" + p)
+        _exec_logger.debug("Runtime Parameters:\n" + _format_parameters(self.sa.as_dict()))
+
+        # Files changed, given from the current folder, to run only the tests affected by them
+        changed_files = self._get_changed_files() if ap.has_flag_or_option("-affected-by") else None
 
         # Change working directory to tests directory and added to sys.path
         os.chdir(self.sa.full_path_tests_scripts_foldername)
         sys.path.insert(0, self.sa.full_path_tests_scripts_foldername)
 
         # Select tests to run based on args filters
-        self.selected_tests: List[PackageAttr] = read_files_to_get_selected_tests(
-            ap=ap,
-            storyboard_json_files=sa.storyboard,
-            full_path_tests_scripts_foldername=sa.full_path_tests_scripts_foldername,
-            verbose=sa.debug_testipy
-        )
+        with startup_profiler.section("read_files_to_get_selected_tests"):
+            self.selected_tests: List[PackageAttr] = read_files_to_get_selected_tests(
+                ap=ap,
+                storyboard_json_files=sa.storyboard,
+                full_path_tests_scripts_foldername=sa.full_path_tests_scripts_foldername,
+                verbose=sa.debug_testipy
+            )
         if len(self.selected_tests) == 0:
             raise FileNotFoundError(f"Found no tests under {sa.full_path_tests_scripts_foldername}")
 
+        # Only the test methods that failed on a previous run (with their dependencies and SETUP/TEARDOWN)
+        if rerun_results_folder := ap.get_option("-rerun-failed"):
+            with startup_profiler.section("select_failed_tests"):
+                self.selected_tests = self._select_failed_tests(rerun_results_folder)
+
+        # Only the test methods that called the changed files, on the run that recorded their footprint (with their dependencies and SETUP/TEARDOWN)
+        if changed_files is not None:
+            with startup_profiler.section("select_affected_tests"):
+                self.selected_tests = self._select_affected_tests(ap.get_option("-impact-map"), changed_files)
+
+        # Only the suites of this shard, balanced by their recorded durations
+        if sa.shard_total > 1:
+            with startup_profiler.section("select_shard"):
+                self.selected_tests = self._select_shard(ap.has_flag_or_option("--shard-report"))
+
         # Reporter Manager, with all reporters
-        self.report_manager = build_report_manager_with_reporters(ap, sa)
+        with startup_profiler.section("build_report_manager_with_reporters"):
+            self.report_manager = build_report_manager_with_reporters(ap, sa)
+
+        # The test methods that ended on the run being resumed, read before its journal gets the events of this run
+        self.resumed_run = None
+        if ap.has_flag_or_option("-resume"):
+            with startup_profiler.section("load_resumed_run"):
+                self.resumed_run = self._load_resumed_run(sa.full_path_results_folder_runtime)
+
+        # Journal with every event, so this run can be resumed if killed
+        self.journal = None
+        if sa.journal and not sa.dryrun:
+            from testipy.engine.run_journal import RunJournal
+            self.journal = RunJournal(os.path.join(sa.full_path_results_folder_runtime, default_config.journal_filename), ap)
+            self.report_manager.add_reporter("journal", self.journal)
+
+    def _select_shard(self, show_report: bool) -> List[PackageAttr]:
+        from testipy.engine.suite_history import SuiteHistory, get_suite_history_filename
+        from testipy.engine.read_tests_shard import get_shards, get_shard_report, select_shard
+
+        history = SuiteHistory(get_suite_history_filename(self.sa.full_path_tests_scripts_foldername))
+        if show_report:
+            report = get_shard_report(get_shards(self.selected_tests, self.sa.shard_total, history), self.sa.shard_index)
+            for line in f"Shards expected wall time:\n{report}".splitlines():
+                _exec_logger.info(line)
+            with open(os.path.join(self.sa.full_path_results_folder_runtime, default_config.shard_report_filename), "w") as f:
+                f.write(report + "\n")
+
+        return select_shard(self.selected_tests, self.sa.shard_index, self.sa.shard_total, history)
+
+    def _select_failed_tests(self, results_folder: str) -> List[PackageAttr]:
+        from testipy.engine.read_tests_rerun import load_failed_tests, select_failed_tests
+
+        failed = load_failed_tests(results_folder)
+        _exec_logger.info(f"Found {len(failed)} failed test methods on {results_folder}")
+        return select_failed_tests(self.selected_tests, failed)
+
+    def _load_resumed_run(self, results_folder: str):
+        from testipy.engine.run_journal import ResumedRun
+
+        resumed_run = ResumedRun(results_folder)
+        _exec_logger.info(f"Resuming the run on {results_folder}, {len(resumed_run)} test methods already ended")
+        return resumed_run
+
+    def _get_changed_files(self) -> Set[str]:
+        from testipy.engine.test_impact import get_changed_files
+
+        changed_files = get_changed_files(self.ap.get_options_arguments("-affected-by"))
+        _exec_logger.info(f"Found {len(changed_files)} changed files")
+        return changed_files
+
+    def _select_affected_tests(self, impact_map: str, changed_files: Set[str]) -> List[PackageAttr]:
+        from testipy.engine.test_impact import load_test_impact, select_affected_tests
+
+        if not impact_map:
+            raise ValueError("-affected-by needs -impact-map, with the results folder of a run with --record-impact")
+        footprints = load_test_impact(impact_map, self.sa.full_path_tests_scripts_foldername)
+        _exec_logger.info(f"Found the footprint of {len(footprints)} test methods and suites on {impact_map}")
+        return select_affected_tests(self.selected_tests, footprints, changed_files)
 
     # Execute Tests
     def run(self) -> int:
         total_fails = 0
+        if not self.selected_tests:
+            if self.sa.shard_total > 1:
+                _exec_logger.warning(f"Nothing to run on shard {self.sa.shard_index}/{self.sa.shard_total}, it has no suites")
+            elif self.ap.has_flag_or_option("-affected-by"):
+                _exec_logger.warning("Nothing to run, no tests affected by the changed files")
+            else:
+                _exec_logger.warning("Nothing to run, no failed tests to rerun")
+            return total_fails
 
         for rep in range(1, self.sa.repetitions + 1):
             _exec_logger.info(f"--- Execution #{rep} ---")
@@ -81,7 +196,9 @@ class Runner:
                 total_fails += run_selected_tests(
                     sa=self.sa,
                     selected_tests=self.selected_tests,
-                    rm=self.report_manager
+                    rm=self.report_manager,
+                    journal=self.journal,
+                    resumed_run=self.resumed_run
                 )
             except Exception as ex:
                 total_fails += 1
@@ -90,10 +207,15 @@ class Runner:
                 if self.sa.debug_testipy:
                     raise ex
 
+            if self.sa.maxfail and total_fails >= self.sa.maxfail and rep < self.sa.repetitions:
+                _exec_logger.warning(f"Skipping the remaining executions, {total_fails} failed tests reached -maxfail {self.sa.maxfail}")
+                break
+
         return total_fails
 
     def __enter__(self):
-        self.report_manager._startup_(self.selected_tests)
+        with startup_profiler.section("report_manager._startup_"):
+            self.report_manager._startup_(self.selected_tests)
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
@@ -107,6 +229,10 @@ class Runner:
         f = os.path.join(self.sa.full_path_results_folder_runtime, "results.yaml")
         self.report_manager.pm.state_counter.export_summary_to_file(f)
 
+        # and the state of each test, for -rerun-failed
+        from testipy.engine.read_tests_rerun import save_results_tests
+        save_results_tests(self.report_manager.pm, os.path.join(self.sa.full_path_results_folder_runtime, default_config.results_tests_filename))
+
         return self
 
     @property
@@ -114,6 +240,19 @@ class Runner:
         return format_duration(self.report_manager.get_reporter_duration())
 
 
+# stops the startup profiler and saves its report, when the run ends, so it has the test modules imported while running
+def save_startup_profile(folder: str):
+    if not startup_profiler.enabled:
+        return
+
+    startup_profiler.stop()
+    try:
+        report_fpn, _ = startup_profiler.save(folder, default_config.startup_profile_filename, default_config.startup_profile_json_filename)
+        _exec_logger.info(f"Startup took {startup_profiler.get_total_time()*1000.0:.1f}ms, profile saved to {report_fpn}")
+    except Exception as ex:
+        _exec_logger.warning(f"Could not save startup profile to {folder}, {ex}")
+
+
 def save_stats(folder: str, prof):
     stats = pstats.Stats(prof)
     stats.sort_stats(pstats.SortKey.TIME)
@@ -122,22 +261,60 @@ def save_stats(folder: str, prof):
     stats.dump_stats(filename=filename)
 
 
+# runs the suites sent by a coordinator (testipy worker -coordinator host:port -coordinator-key key [-tf tests_folder])
+def run_worker(ap: ArgsParser) -> int:
+    import logging
+    from testipy.engine.mylogger import MyScreenFormatter
+    from testipy.engine.execute_tests_distributed import run_worker, get_coordinator_key
+
+    # the results and their log are on the coordinator, so only to screen
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(MyScreenFormatter())
+    _exec_logger.addHandler(handler)
+    _exec_logger.setLevel(logging.DEBUG if ap.has_flag_or_option("--debug-testipy") else logging.INFO)
+
+    return run_worker(ap.get_option("-coordinator", ""), get_coordinator_key(ap), ap.get_option("-tf", ""))
+
+
 def run_testipy(args=None) -> int:
     show_intro()
 
     fails = 1
     try:
         ap = ArgsParser.from_str(args) if args else ArgsParser.from_sys()
-        sa = ParseStartArguments(ap).get_start_arguments()
+        if "worker" in ap.get_arguments():
+            return run_worker(ap)
+
+        # same args as the run being resumed, on its results folder
+        if ap.has_flag_or_option("-resume"):
+            from testipy.engine.run_journal import get_resumed_args
+            ap = get_resumed_args(ap)
+
+        if ap.has_flag_or_option("--profile-startup"):
+            startup_profiler.start()
+
+        with startup_profiler.section("ParseStartArguments"):
+            sa = ParseStartArguments(ap).get_start_arguments()
+
+        with startup_profiler.section("ExecutionLogger"):
+            exec_logger = ExecutionLogger(sa.full_path_results_folder_runtime, sa.debug_testipy)
+
+        with exec_logger:
+            with startup_profiler.section("Runner.__init__"):
+                runner = Runner(ap, sa)
+
+            with runner:
+                startup_profiler.end_startup()
 
-        with ExecutionLogger(sa.full_path_results_folder_runtime, sa.debug_testipy) as exec_logger:
-            with Runner(ap, sa) as runner:
-                if ap.has_flag_or_option("--prof"):
-                    with cProfile.Profile() as prof:
+                try:
+                    if ap.has_flag_or_option("--prof"):
+                        with cProfile.Profile() as prof:
+                            fails = runner.run()
+                        save_stats(sa.full_path_results_folder_runtime, prof)
+                    else:
                         fails = runner.run()
-                    save_stats(sa.full_path_results_folder_runtime, prof)
-                else:
-                    fails = runner.run()
+                finally:
+                    save_startup_profile(sa.full_path_results_folder_runtime)
 
             exec_logger.log_info(f"exitcode={fails} | Results at {sa.full_path_results_folder_runtime}")
     except Exception as ex:
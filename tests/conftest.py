@@ -0,0 +1,44 @@
+import os
+import re
+import sys
+import textwrap
+import subprocess
+
+from typing import Dict
+
+import pytest
+
+
+REPO_FOLDER = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+if REPO_FOLDER not in sys.path:
+    sys.path.insert(0, REPO_FOLDER)
+
+
+# writes the test files, by their path relative to the tests folder, returns the tests folder
+def write_tests(tests_folder: str, files: Dict[str, str]) -> str:
+    for filename, source in files.items():
+        full_path_filename = os.path.join(tests_folder, filename)
+        os.makedirs(os.path.dirname(full_path_filename), exist_ok=True)
+        with open(full_path_filename, "w") as f:
+            f.write(textwrap.dedent(source))
+    return tests_folder
+
+
+# returns dict, with the total of tests by state (FAIL, SKIP, PASS, ...) on the output of a run
+def get_totals(output: str) -> Dict[str, int]:
+    match = re.search(r"All took .*\[(.*)]", output)
+    assert match, output
+    return {state: int(total) for state, total in (item.split("=") for item in match.group(1).split(", "))}
+
+
+@pytest.fixture
+def run_testipy(tmp_path):
+    env = dict(os.environ, HOME=str(tmp_path / "home"), PYTHONPATH=REPO_FOLDER)
+
+    # returns CompletedProcess, of testipy run on its own process, with its own home folder (for the caches)
+    def _run(tests_folder: str, *args: str, timeout: float = 120) -> subprocess.CompletedProcess:
+        return subprocess.run([sys.executable, "-m", "testipy", "-tf", str(tests_folder), "-rf", str(tmp_path / "results"), *args],
+                              cwd=str(tmp_path), env=env, capture_output=True, text=True, timeout=timeout)
+
+    return _run
@@ -0,0 +1,66 @@
+from testipy.models import attr
+
+
+def _new_suite(package_attr: attr.PackageAttr, suite_name: str, name: str = "") -> attr.SuiteAttr:
+    return attr.SuiteAttr(package_attr, f"{suite_name.lower()}.py", suite_name, name=name)
+
+
+def test_ids_follow_the_max_id():
+    package_attr = attr.PackageAttr("qa.pkg")
+    suite_attr = _new_suite(package_attr, "SuiteA")
+    first = attr.TestMethodAttr(suite_attr, "test_first")
+    second = attr.TestMethodAttr(suite_attr, "test_second")
+    assert (first.method_id, second.method_id) == (1, 2)
+
+    # an id set later (as when duplicated) moves the counter
+    second.method_id = 10
+    assert suite_attr.get_max_test_method_id() == 11
+    assert attr.TestMethodAttr(suite_attr, "test_third").method_id == 11
+
+    other_suite_attr = _new_suite(package_attr, "SuiteB")
+    assert (suite_attr.suite_id, other_suite_attr.suite_id) == (1, 2)
+    other_suite_attr.suite_id = 7
+    assert package_attr.get_max_suite_id() == 8
+    assert package_attr.get_max_test_method_id() == 12
+
+
+def test_get_by_name_returns_first_on_the_list():
+    package_attr = attr.PackageAttr("qa.pkg")
+    suite_attr = _new_suite(package_attr, "SuiteA")
+    attr.TestMethodAttr(suite_attr, "test_login", name="test_logout")
+    attr.TestMethodAttr(suite_attr, "test_logout")
+
+    assert suite_attr.get_test_method_by_name("test_logout").method_name == "test_login"
+    assert suite_attr.get_test_method_by_name("test_login").method_name == "test_login"
+    assert suite_attr.get_test_method_by_name("test_missing") is None
+
+    _new_suite(package_attr, "SuiteB", name="Orders")
+    assert package_attr.get_suite_by_name("Orders").suite_name == "SuiteB"
+    assert package_attr.get_suite_by_name("SuiteB").suite_name == "SuiteB"
+
+
+def test_indexes_rebuilt_when_the_list_is_changed_directly():
+    package_attr = attr.PackageAttr("qa.pkg")
+    suite_attr = _new_suite(package_attr, "SuiteA")
+    login = attr.TestMethodAttr(suite_attr, "test_login")
+    logout = attr.TestMethodAttr(suite_attr, "test_logout")
+    logout.method_id = 5
+
+    suite_attr.test_method_attr_list.remove(logout)
+    assert suite_attr.get_test_method_by_name("test_logout") is None
+    assert suite_attr.get_max_test_method_id() == 2
+
+    suite_attr.test_method_attr_list.append(logout)
+    assert suite_attr.get_test_method_by_name("test_logout") is logout
+    assert suite_attr.get_test_method_by_name("test_login") is login
+    assert suite_attr.get_max_test_method_id() == 6
+
+    other_suite_attr = _new_suite(package_attr, "SuiteB")
+    other_suite_attr.suite_id = 9
+    package_attr.remove_suite_attr(other_suite_attr)
+    assert package_attr.get_suite_by_name("SuiteB") is None
+    assert package_attr.get_max_suite_id() == 2
+
+    package_attr.suite_attr_list.clear()
+    assert package_attr.get_suite_by_name("SuiteA") is None
+    assert package_attr.get_max_suite_id() == 1
@@ -0,0 +1,72 @@
+import pytest
+
+from testipy.models import attr
+
+
+# returns (SuiteAttr, dict of TestMethodAttr by method name), with the prio and @DEPENDS prios of each test method
+def _make_suite(methods):
+    suite_attr = attr.SuiteAttr(attr.PackageAttr("qa.pkg"), "suite_a.py", "SuiteA")
+    by_name = {name: attr.TestMethodAttr(suite_attr, name, prio=prio, depends=set(depends)) for name, prio, depends in methods}
+    return suite_attr, by_name
+
+
+def test_closure_follows_dependencies_of_dependencies():
+    suite_attr, by_name = _make_suite([
+        ("test_login", 10, ()),
+        ("test_create", 20, (10,)),
+        ("test_update", 30, (20,)),
+        ("test_other", 40, ()),
+    ])
+    graph = attr.DependencyGraph(suite_attr.test_method_attr_list)
+
+    closure = graph.get_closure([by_name["test_update"]])
+
+    assert [ma.method_name for ma in closure] == ["test_create", "test_login"]
+
+
+def test_closure_has_all_tests_of_a_prio_but_not_the_given_ones():
+    suite_attr, by_name = _make_suite([
+        ("test_setup_a", 10, ()),
+        ("test_setup_b", 10, ()),
+        ("test_one", 20, (10,)),
+        ("test_two", 20, (10,)),
+    ])
+    graph = attr.DependencyGraph(suite_attr.test_method_attr_list)
+
+    closure = graph.get_closure([by_name["test_one"], by_name["test_setup_a"]])
+
+    assert [ma.method_name for ma in closure] == ["test_setup_b"]
+
+
+def test_depending_on_its_own_prio_is_not_a_cycle():
+    suite_attr, by_name = _make_suite([
+        ("test_first", 10, ()),
+        ("test_second", 10, (10,)),
+    ])
+    graph = attr.DependencyGraph(suite_attr.test_method_attr_list)
+
+    assert graph.find_cycle() == []
+    assert graph.get_closure([by_name["test_second"]]) == [by_name["test_first"]]
+
+
+def test_cycle_is_an_error_with_its_path():
+    suite_attr, by_name = _make_suite([
+        ("test_a", 10, (30,)),
+        ("test_b", 20, (10,)),
+        ("test_c", 30, (20,)),
+    ])
+    graph = attr.DependencyGraph(suite_attr.test_method_attr_list, where="suite_a.py/SuiteA")
+
+    assert graph.find_cycle() == [10, 30, 20, 10]
+    with pytest.raises(ValueError, match=r"Circular @DEPENDS in suite_a.py/SuiteA: test_a\(prio 10\) -> test_c\(prio 30\)"):
+        graph.get_closure([by_name["test_b"]])
+
+
+def test_unknown_prios_are_ignored():
+    suite_attr, by_name = _make_suite([
+        ("test_a", 10, (99,)),
+    ])
+    graph = attr.DependencyGraph(suite_attr.test_method_attr_list)
+
+    assert graph.find_cycle() == []
+    assert graph.get_closure([by_name["test_a"]]) == []
@@ -0,0 +1,65 @@
+import socket
+import threading
+
+from testipy.engine import execute_tests_distributed as distributed
+
+
+# returns (bool, bool), if the coordinator and the worker authenticated each other
+def _handshake(coordinator_key: bytes, worker_key: bytes):
+    coordinator_sock, worker_sock = socket.socketpair()
+    results = {}
+
+    def _worker():
+        results["worker"] = distributed._authenticate(worker_sock, worker_key, distributed.ROLE_WORKER, distributed.ROLE_COORDINATOR)
+
+    thread = threading.Thread(target=_worker)
+    thread.start()
+    coordinator = distributed._authenticate(coordinator_sock, coordinator_key, distributed.ROLE_COORDINATOR, distributed.ROLE_WORKER)
+    thread.join()
+
+    coordinator_sock.close()
+    worker_sock.close()
+    return coordinator, results["worker"]
+
+
+def test_same_key_authenticates_both_ends():
+    assert _handshake(b"s3cret", b"s3cret") == (True, True)
+
+
+def test_other_key_is_refused_by_both_ends():
+    assert _handshake(b"s3cret", b"other") == (False, False)
+
+
+# a peer sending our own challenge back must not get our answer to send it back as its own
+def test_reflected_challenge_is_refused():
+    coordinator_sock, peer_sock = socket.socketpair()
+    results = {}
+
+    def _coordinator():
+        results["coordinator"] = distributed._authenticate(coordinator_sock, b"s3cret", distributed.ROLE_COORDINATOR, distributed.ROLE_WORKER)
+
+    thread = threading.Thread(target=_coordinator)
+    thread.start()
+    challenge = distributed._recv_bytes(peer_sock)
+    distributed._send_bytes(peer_sock, challenge)
+    answer = distributed._recv_bytes(peer_sock)
+    distributed._send_bytes(peer_sock, answer)
+    thread.join()
+
+    assert results["coordinator"] is False
+    coordinator_sock.close()
+    peer_sock.close()
+
+
+def test_oversized_challenge_is_not_read():
+    coordinator_sock, peer_sock = socket.socketpair()
+    distributed._send_bytes(peer_sock, b"x" * 1024)
+
+    assert distributed._authenticate(coordinator_sock, b"s3cret", distributed.ROLE_COORDINATOR, distributed.ROLE_WORKER) is False
+    coordinator_sock.close()
+    peer_sock.close()
+
+
+def test_parse_address_defaults_to_localhost():
+    assert distributed.parse_address(":5800") == ("localhost", 5800)
+    assert distributed.parse_address("0.0.0.0") == ("0.0.0.0", 5757)
@@ -0,0 +1,165 @@
+import time
+import threading
+
+import pytest
+
+from conftest import write_tests, get_totals
+from testipy.helpers.errors import FixtureError
+from testipy.helpers.fixtures import fixture, FixtureScope, SCOPE_SESSION, SCOPE_PACKAGE, SCOPE_SUITE
+
+
+# returns (session, [package scopes], [[suite scopes of each package]])
+def _new_scopes(npackages: int = 2, nsuites: int = 2):
+    session = FixtureScope(SCOPE_SESSION, "session")
+    packages = [FixtureScope(SCOPE_PACKAGE, f"pkg{p}", session) for p in range(npackages)]
+    suites = [[FixtureScope(SCOPE_SUITE, f"suite{p}.{s}", package) for s in range(nsuites)] for p, package in enumerate(packages)]
+    return session, packages, suites
+
+
+# fixtures are registered by name for the whole process, so each test uses its own names
+def test_built_once_for_each_scope():
+    builds = []
+
+    @fixture(scope=SCOPE_SESSION)
+    def scoped_session():
+        builds.append("session")
+        return object()
+
+    @fixture(scope=SCOPE_PACKAGE)
+    def scoped_package():
+        builds.append("package")
+        return object()
+
+    @fixture
+    def scoped_suite():
+        builds.append("suite")
+        return object()
+
+    session, packages, suites = _new_scopes()
+    names = ["scoped_session", "scoped_package", "scoped_suite"]
+    values = [[suite.get_all(names) for suite in package_suites] for package_suites in suites]
+
+    assert sorted(builds) == ["package"] * 2 + ["session"] + ["suite"] * 4
+    assert len({id(v["scoped_session"]) for package_values in values for v in package_values}) == 1
+    assert [len({id(v["scoped_package"]) for v in package_values}) for package_values in values] == [1, 1]
+    assert values[0][0]["scoped_package"] is not values[1][0]["scoped_package"]
+    assert len({id(v["scoped_suite"]) for package_values in values for v in package_values}) == 4
+    assert (len(session), [len(package) for package in packages]) == (1, [1, 1])
+
+
+def test_built_once_by_threads_at_the_same_time():
+    builds = []
+    both_building = threading.Barrier(2, timeout=5)
+
+    # each one only ends if the other is built at the same time
+    @fixture(scope=SCOPE_PACKAGE)
+    def concurrent_slow():
+        builds.append("slow")
+        both_building.wait()
+        time.sleep(0.2)
+        return object()
+
+    @fixture(scope=SCOPE_PACKAGE)
+    def concurrent_other():
+        builds.append("other")
+        both_building.wait()
+        return object()
+
+    _, _, suites = _new_scopes(npackages=1, nsuites=8)
+    values = []
+    threads = [threading.Thread(target=lambda s=suite, n=name: values.append(s.get(n)))
+               for name in ("concurrent_slow", "concurrent_other") for suite in suites[0]]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(builds) == ["other", "slow"]
+    assert len(values) == 16 and len(set(map(id, values))) == 2
+
+
+def test_torn_down_the_last_one_first():
+    events = []
+
+    @fixture(scope=SCOPE_SESSION)
+    def teardown_token():
+        events.append("setup token")
+        yield "token"
+        events.append("teardown token")
+
+    # uses the fixture named as its parameter
+    @fixture(scope=SCOPE_SESSION)
+    def teardown_db(teardown_token):
+        events.append(f"setup db with {teardown_token}")
+        yield "db"
+        events.append("teardown db")
+
+    @fixture(scope=SCOPE_SESSION)
+    def teardown_failing():
+        events.append("setup failing")
+        raise ValueError("no connection")
+
+    session, _, suites = _new_scopes(npackages=1, nsuites=2)
+    assert [suite.get("teardown_db") for suite in suites[0]] == ["db", "db"]
+
+    # not built again on the same scope
+    for suite in suites[0]:
+        with pytest.raises(FixtureError, match="no connection"):
+            suite.get("teardown_failing")
+
+    session.teardown()
+    assert events == ["setup token", "setup db with token", "setup failing", "teardown db", "teardown token"]
+    assert len(session) == 0
+
+
+# the package fixture is on a module imported by both suites
+FIXTURES_SHARED = """
+    import os
+
+    from testipy.helpers.fixtures import fixture
+
+
+    def log(event):
+        with open(os.path.join(os.path.dirname(__file__), "events.txt"), "a") as f:
+            f.write(event + "\\n")
+
+
+    @fixture(scope="package")
+    def shared():
+        log("setup shared")
+        yield object()
+        log("teardown shared")
+"""
+
+SUITE_WITH_FIXTURES = """
+    from fixtures_shared import log
+
+
+    class Suite{name}:
+        \"\"\"
+        @FIXTURES shared
+        \"\"\"
+
+        def __init__(self, shared):
+            self.shared = shared
+
+        def test_shared(self, sd, rm, ncycles=1, param=None):
+            log(f"{name} {{id(self.shared)}}")
+            rm.testPassed(rm.startTest(sd), "ok")
+"""
+
+
+def test_package_fixture_shared_by_suite_threads(tmp_path, run_testipy):
+    tests_folder = write_tests(str(tmp_path / "tests"), {
+        "qa/pkg/fixtures_shared.py": FIXTURES_SHARED,
+        "qa/pkg/suite_first.py": SUITE_WITH_FIXTURES.format(name="First"),
+        "qa/pkg/suite_second.py": SUITE_WITH_FIXTURES.format(name="Second"),
+    })
+
+    result = run_testipy(tests_folder, "-st", "2", timeout=60)
+
+    assert get_totals(result.stdout) == dict(FAIL=0, FAIL_BUG=0, SKIP=0, PASS=2, Total=2), result.stdout + result.stderr
+    with open(str(tmp_path / "tests" / "qa" / "pkg" / "events.txt")) as f:
+        events = f.read().splitlines()
+    assert events[0] == "setup shared" and events[-1] == "teardown shared", events
+    assert len(events) == 4 and len({event.split()[-1] for event in events[1:3]}) == 1, events
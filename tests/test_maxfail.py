@@ -0,0 +1,53 @@
+import pytest
+
+from conftest import write_tests, get_totals
+
+
+SUITE_FAILS = """
+    class SuiteFails:
+        \"\"\"
+        @PRIO 1
+        \"\"\"
+
+        def test_fails(self, sd, rm, ncycles=1, param=None):
+            rm.testFailed(rm.startTest(sd), "failed")
+"""
+
+# the suites that pass take long enough for the failure to be counted before the next ones start
+SUITE_SLOW = """
+    import time
+
+
+    class Suite{name}:
+        \"\"\"
+        @PRIO {prio}
+        \"\"\"
+
+        def test_slow(self, sd, rm, ncycles=1, param=None):
+            time.sleep(1)
+            rm.testPassed(rm.startTest(sd), "ok")
+"""
+
+
+@pytest.mark.parametrize("mode_args", [
+    ("-maxfail", "1"),
+    ("--fail-fast",),
+    ("-maxfail", "1", "-st", "2"),
+    ("-maxfail", "1", "-pt", "2"),
+    ("-maxfail", "1", "-sp", "2"),
+], ids=["sequential", "fail-fast", "suite-threads", "package-threads", "suite-processes"])
+def test_maxfail_stops_the_run(tmp_path, run_testipy, mode_args):
+    tests_folder = write_tests(str(tmp_path / "tests"), {
+        "qa/pkg_a/suite_fails.py": SUITE_FAILS,
+        "qa/pkg_a/suite_later.py": SUITE_SLOW.format(name="Later", prio=2),
+        "qa/pkg_b/suite_first.py": SUITE_SLOW.format(name="First", prio=1),
+        "qa/pkg_b/suite_second.py": SUITE_SLOW.format(name="Second", prio=2),
+    })
+
+    result = run_testipy(tests_folder, *mode_args, timeout=120)
+    totals = get_totals(result.stdout)
+
+    # only a suite already running with the failed one (on another thread or process) can still pass
+    assert totals["FAIL"] == 1 and totals["Total"] == 4, result.stdout + result.stderr
+    assert totals["PASS"] <= (0 if len(mode_args) <= 2 else 1), result.stdout
+    assert totals["SKIP"] + totals["PASS"] == 3, result.stdout
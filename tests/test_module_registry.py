@@ -0,0 +1,71 @@
+import os
+import sys
+import types
+import threading
+import importlib
+
+import pytest
+
+from conftest import write_tests
+from testipy.lib_modules.module_registry import ModuleRegistry
+
+
+def test_registered_only_with_the_dotted_name(tmp_path):
+    tests_folder = write_tests(str(tmp_path / "tests"), {"qa/api/toolbox_xyz.py": "VALUE = 1\n"})
+    registry = ModuleRegistry()
+
+    module = registry.load(os.path.join(tests_folder, "qa/api/toolbox_xyz.py"), tests_folder)
+    try:
+        assert module.__name__ == "qa.api.toolbox_xyz"
+        assert sys.modules["qa.api.toolbox_xyz"] is module
+        assert "toolbox_xyz" not in sys.modules
+        assert registry.load(os.path.join(tests_folder, "qa/api/toolbox_xyz.py"), tests_folder) is module
+    finally:
+        registry.clear()
+
+    assert "qa.api.toolbox_xyz" not in sys.modules
+
+
+def test_changed_file_is_executed_again(tmp_path):
+    tests_folder = write_tests(str(tmp_path / "tests"), {"qa/api/changed_xyz.py": "VALUE = 1\n"})
+    full_path_filename = os.path.join(tests_folder, "qa/api/changed_xyz.py")
+    registry = ModuleRegistry()
+
+    try:
+        assert registry.load(full_path_filename, tests_folder).VALUE == 1
+        write_tests(tests_folder, {"qa/api/changed_xyz.py": "VALUE = 22\n"})
+        assert registry.load(full_path_filename, tests_folder).VALUE == 22
+        assert sys.modules["qa.api.changed_xyz"].VALUE == 22
+    finally:
+        registry.clear()
+
+
+# a helper next to the suite file is imported by its name, without adding its folder to sys.path (shared by all threads)
+def test_package_folders_only_for_the_file_being_executed(tmp_path):
+    tests_folder = write_tests(str(tmp_path / "tests"), {
+        "qa/api/suite_helped_xyz.py": "import sys\nimport helper_xyz\n\nVALUE = helper_xyz.VALUE\nSYS_PATH = list(sys.path)\n",
+        "qa/api/helper_xyz.py": "import events_xyz\n\nVALUE = 3\nevents_xyz.started.set()\nevents_xyz.can_end.wait(10)\n",
+        "qa/api/other_xyz.py": "VALUE = 4\n",
+    })
+    full_path_filename = os.path.join(tests_folder, "qa/api/suite_helped_xyz.py")
+    events = sys.modules["events_xyz"] = types.SimpleNamespace(started=threading.Event(), can_end=threading.Event())
+    registry = ModuleRegistry()
+
+    try:
+        thread = threading.Thread(target=registry.load, args=(full_path_filename, tests_folder))
+        thread.start()
+        assert events.started.wait(10)
+
+        # while it is executed, the other threads don't find the modules on its folder
+        with pytest.raises(ImportError):
+            importlib.import_module("other_xyz")
+
+        events.can_end.set()
+        thread.join(10)
+        module = registry.get(full_path_filename)
+        assert module.VALUE == 3
+        assert os.path.join(tests_folder, "qa", "api") not in module.SYS_PATH
+    finally:
+        registry.clear()
+        for module_name in ("events_xyz", "helper_xyz"):
+            sys.modules.pop(module_name, None)
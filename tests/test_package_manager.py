@@ -0,0 +1,42 @@
+import threading
+
+from testipy.models import attr
+from testipy.models.package_manager import PackageManager, _current_test_method_attr_by_suite
+
+
+def _start_suites(total: int):
+    package_attr = attr.PackageAttr("qa.pkg")
+    suite_attr = attr.SuiteAttr(package_attr, "suite_a.py", "SuiteA")
+    pd = PackageManager().startPackage(package_attr)
+    return [pd.startSuite(suite_attr) for _ in range(total)], attr.TestMethodAttr(suite_attr, "test_a")
+
+
+def test_ended_suites_are_not_kept_on_the_context():
+    suites, test_method_attr = _start_suites(100)
+
+    for sd in suites:
+        sd.set_current_test_method_attr(test_method_attr)
+        assert sd.current_test_method_attr is test_method_attr
+        sd.set_current_test_method_attr(None)
+        assert sd.current_test_method_attr is None
+
+    assert _current_test_method_attr_by_suite.get() == {}
+
+
+def test_current_test_method_by_thread():
+    (sd,), test_method_attr = _start_suites(1)
+    other_test_method_attr = attr.TestMethodAttr(test_method_attr.suite_attr, "test_b")
+    sd.set_current_test_method_attr(test_method_attr)
+    seen = []
+
+    def _other():
+        sd.set_current_test_method_attr(other_test_method_attr)
+        seen.append(sd.current_test_method_attr)
+
+    thread = threading.Thread(target=_other)
+    thread.start()
+    thread.join()
+
+    assert seen == [other_test_method_attr]
+    assert sd.current_test_method_attr is test_method_attr
+    sd.set_current_test_method_attr(None)
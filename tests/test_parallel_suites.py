@@ -0,0 +1,115 @@
+import os
+
+from conftest import write_tests, get_totals
+
+
+# test_fails ends late, so the ones after it would see no state if they didn't wait for it
+SUITE_GATED = """
+    import time
+
+
+    class SuiteGated:
+        \"\"\"
+        @PARALLEL 4
+        \"\"\"
+
+        def test_fails(self, sd, rm, ncycles=1, param=None):
+            \"\"\"
+            @PRIO 1
+            \"\"\"
+            time.sleep(0.5)
+            rm.testFailed(rm.startTest(sd), "failed")
+
+        def test_on_success(self, sd, rm, ncycles=1, param=None):
+            \"\"\"
+            @PRIO 2
+            @ON_SUCCESS 1
+            \"\"\"
+            rm.testPassed(rm.startTest(sd), "ok")
+
+        def test_on_failure(self, sd, rm, ncycles=1, param=None):
+            \"\"\"
+            @PRIO 3
+            @ON_FAILURE 1
+            \"\"\"
+            rm.testPassed(rm.startTest(sd), "ok")
+"""
+
+# each test method writes when it starts and ends, on the package folder
+SUITE_ORDER = """
+    import os
+    import time
+
+
+    def log(sd, event):
+        with open(os.path.join(sd.get_package_folder(), "events.txt"), "a") as f:
+            f.write(event + "\\n")
+
+
+    class SuiteOrder:
+        \"\"\"
+        @PARALLEL 2
+        \"\"\"
+
+        def test_prio_4(self, sd, rm, ncycles=1, param=None):
+            \"\"\"
+            @PRIO 4
+            \"\"\"
+            log(sd, "start 4")
+            rm.testPassed(rm.startTest(sd), "ok")
+
+        def test_prio_3(self, sd, rm, ncycles=1, param=None):
+            \"\"\"
+            @PRIO 3
+            \"\"\"
+            log(sd, "start 3")
+            rm.testPassed(rm.startTest(sd), "ok")
+
+        def test_prio_1(self, sd, rm, ncycles=1, param=None):
+            \"\"\"
+            @PRIO 1
+            \"\"\"
+            log(sd, "start 1")
+            time.sleep(0.5)
+            log(sd, "end 1")
+            rm.testPassed(rm.startTest(sd), "ok")
+
+        def test_prio_2(self, sd, rm, ncycles=1, param=None):
+            \"\"\"
+            @PRIO 2
+            \"\"\"
+            log(sd, "start 2")
+            time.sleep(0.5)
+            rm.testPassed(rm.startTest(sd), "ok")
+
+        def test_depends_on_1(self, sd, rm, ncycles=1, param=None):
+            \"\"\"
+            @PRIO 5
+            @DEPENDS 1
+            \"\"\"
+            log(sd, "start 5")
+            rm.testPassed(rm.startTest(sd), "ok")
+"""
+
+
+def test_on_success_and_on_failure_wait_for_their_prio(tmp_path, run_testipy):
+    tests_folder = write_tests(str(tmp_path / "tests"), {"qa/pkg/suite_gated.py": SUITE_GATED})
+
+    result = run_testipy(tests_folder, timeout=60)
+
+    assert get_totals(result.stdout) == dict(FAIL=1, FAIL_BUG=0, SKIP=1, PASS=1, Total=3), result.stdout + result.stderr
+    assert "NO SUCCESS on prio=1" in result.stdout
+
+
+def test_started_by_prio_and_after_their_dependencies(tmp_path, run_testipy):
+    tests_folder = write_tests(str(tmp_path / "tests"), {"qa/pkg/suite_order.py": SUITE_ORDER})
+
+    result = run_testipy(tests_folder, timeout=60)
+
+    assert get_totals(result.stdout) == dict(FAIL=0, FAIL_BUG=0, SKIP=0, PASS=5, Total=5), result.stdout + result.stderr
+    with open(os.path.join(tests_folder, "qa", "pkg", "events.txt")) as f:
+        events = f.read().splitlines()
+
+    # the two lowest prios start first (up to @PARALLEL), the dependent only after its dependency ended
+    assert set(events[:2]) == {"start 1", "start 2"}, events
+    assert events.index("end 1") < events.index("start 5"), events
@@ -0,0 +1,78 @@
+from conftest import write_tests
+from testipy.engine.read_tests import get_selected_tests
+
+
+SUITE_LOGIN = """
+    class SuiteLogin:
+        \"\"\"
+        @TAG REST
+        \"\"\"
+
+        def test_login(self, sd, rm, ncycles=2, param=("user", 1)):
+            \"\"\"
+            @PRIO 10
+            @TAG LOGIN
+            \"\"\"
+
+        def test_logout(self, sd, rm, ncycles=1, param=None):
+            \"\"\"
+            @PRIO 20
+            @DEPENDS 10
+            \"\"\"
+"""
+
+# param is not a literal, so the file is read again by the main process
+SUITE_DYNAMIC = """
+    USERS = ["admin", "guest"]
+
+
+    class SuiteDynamic:
+
+        def test_users(self, sd, rm, ncycles=1, param=USERS):
+            \"\"\"
+            @PRIO 1
+            \"\"\"
+"""
+
+SUITE_ORDERS = """
+    class SuiteOrders:
+        \"\"\"
+        @LEVEL 3
+        \"\"\"
+
+        def test_create(self, sd, rm, ncycles=1, param=None):
+            \"\"\"
+            @PRIO 5
+            @TAG SMOKE
+            \"\"\"
+
+        def test_cancel(self, sd, rm, ncycles=1, param=None):
+            \"\"\"
+            @PRIO 6
+            \"\"\"
+"""
+
+
+# returns list, with what was selected (packages, suites and test methods, with their ids and tags)
+def _get_structure(selected_tests) -> list:
+    return [(pa.package_name, pa.package_id, [
+        (sa.filename, sa.suite_name, sa.suite_id, sorted(sa.tags), sa.level, [
+            (ma.method_name, ma.method_id, ma.prio, sorted(ma.tags), ma.ncycles, ma.param, sorted(ma.depends))
+            for ma in sa.test_method_attr_list])
+        for sa in pa.suite_attr_list])
+        for pa in selected_tests]
+
+
+def test_discovery_workers_same_as_serial(tmp_path):
+    tests_folder = write_tests(str(tmp_path / "tests"), {
+        "qa_workers/api/suite_login.py": SUITE_LOGIN,
+        "qa_workers/api/suite_dynamic.py": SUITE_DYNAMIC,
+        "qa_workers/shop/suite_orders.py": SUITE_ORDERS,
+        "qa_workers/shop/helper.py": "VALUE = 1\n",
+    })
+
+    serial = _get_structure(get_selected_tests(tests_folder, discovery_workers=1))
+    in_workers = _get_structure(get_selected_tests(tests_folder, discovery_workers=3))
+
+    assert in_workers == serial
+    assert [suite[1] for package in serial for suite in package[2]] == ["SuiteDynamic", "SuiteLogin", "SuiteOrders"]
@@ -0,0 +1,65 @@
+import os
+
+from conftest import write_tests, get_totals
+from testipy.engine.read_tests_cache import DiscoveryCache
+from testipy.engine.read_tests_metadata import read_file_metadata_by_import
+
+
+BASE_ONE_TEST = """
+    class CommonTests:
+
+        def test_one(self, sd, rm, ncycles=1, param=None):
+            rm.testPassed(rm.startTest(sd), "ok")
+"""
+
+BASE_TWO_TESTS = BASE_ONE_TEST + """
+        def test_two(self, sd, rm, ncycles=1, param=None):
+            rm.testPassed(rm.startTest(sd), "ok")
+"""
+
+SUITE_FROM_BASE = """
+    from {package}.lib.base import CommonTests
+
+
+    class SuiteChild(CommonTests):
+        pass
+"""
+
+
+# returns str, the suite file, with a base on another module, under a package with that name, importable from here
+def _write_suite_with_base(tests_folder: str, package: str, monkeypatch) -> str:
+    write_tests(tests_folder, {f"{package}/lib/base.py": BASE_ONE_TEST, f"{package}/pkg/suite_child.py": SUITE_FROM_BASE.format(package=package)})
+    monkeypatch.syspath_prepend(tests_folder)
+    return os.path.join(tests_folder, package, "pkg", "suite_child.py")
+
+
+def test_source_files_of_the_suite_bases(tmp_path, monkeypatch):
+    tests_folder = str(tmp_path / "tests")
+    suite_filename = _write_suite_with_base(tests_folder, "qa_source_files", monkeypatch)
+
+    file_metadata = read_file_metadata_by_import(suite_filename, tests_folder)
+
+    assert file_metadata.source_files == (os.path.join(tests_folder, "qa_source_files", "lib", "base.py"),)
+
+
+def test_cache_is_not_used_when_a_base_changed(tmp_path, monkeypatch):
+    tests_folder = str(tmp_path / "tests")
+    suite_filename = _write_suite_with_base(tests_folder, "qa_base_changed", monkeypatch)
+    cache = DiscoveryCache(str(tmp_path / "discovery.cache"))
+
+    cache.put(suite_filename, read_file_metadata_by_import(suite_filename, tests_folder))
+    assert cache.get(suite_filename) is not None
+
+    write_tests(tests_folder, {"qa_base_changed/lib/base.py": BASE_TWO_TESTS})
+    assert cache.get(suite_filename) is None
+
+
+def test_run_sees_test_methods_added_to_a_base(tmp_path, run_testipy):
+    tests_folder = write_tests(str(tmp_path / "tests"), {"qa/lib/base.py": BASE_ONE_TEST, "qa/pkg/suite_child.py": SUITE_FROM_BASE.format(package="qa")})
+
+    result = run_testipy(tests_folder)
+    assert get_totals(result.stdout)["PASS"] == 1, result.stdout + result.stderr
+
+    write_tests(tests_folder, {"qa/lib/base.py": BASE_TWO_TESTS})
+    result = run_testipy(tests_folder)
+    assert get_totals(result.stdout)["PASS"] == 2, result.stdout + result.stderr
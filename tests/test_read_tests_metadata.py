@@ -0,0 +1,138 @@
+import os
+
+from conftest import write_tests
+from testipy.engine.read_tests_metadata import read_file_metadata_by_ast, read_file_metadata_by_import
+
+
+SUITE_PARITY = '''
+    # common tests
+    class CommonTests:
+        """
+        @TAG BASE
+        """
+
+        # checks the api is up
+        def test_health(self, sd, rm, ncycles=1, param=None):
+            """
+            @PRIO 1
+            @TAG HEALTH
+            """
+
+        def test_overridden(self, sd, rm, ncycles=1, param=None):
+            """
+            @PRIO 2
+            """
+
+
+    # api suite
+    class SuiteApi(CommonTests):
+        """
+        @LEVEL 3
+        @TAG REST SMOKE
+        @FEATURES 850222
+        @PARALLEL 2
+        """
+
+        # the login
+        def test_login(self, sd, rm, ncycles=3, param=("user", 1)):
+            """
+            @PRIO 10
+            @NAME Login
+            @TAG LOGIN
+            @TIMEOUT 2.5
+            """
+
+        def test_overridden(self, sd, rm, ncycles=1, param=None):
+            pass
+
+        async def test_async(self, sd, rm, ncycles=1, param={"a": [1, 2]}):
+            """
+            @PRIO 20
+            @DEPENDS 10
+            @ON_SUCCESS 10
+            """
+
+        def helper(self):
+            pass
+
+
+    class SuiteEmpty:
+        pass
+'''
+
+
+# parsing a file must give the same metadata as importing it, when it can be read statically
+def test_ast_and_import_give_the_same_metadata(tmp_path):
+    tests_folder = write_tests(str(tmp_path / "tests"), {"qa_parity/pkg/suite_parity.py": SUITE_PARITY})
+    full_path_filename = os.path.join(tests_folder, "qa_parity", "pkg", "suite_parity.py")
+
+    by_ast = read_file_metadata_by_ast(full_path_filename)
+    by_import = read_file_metadata_by_import(full_path_filename, tests_folder)
+
+    assert by_ast is not None
+    assert [sm.suite_name for sm in by_ast.suite_metadata_list] == ["SuiteApi", "SuiteEmpty"]
+    assert by_ast.suite_metadata_list == by_import.suite_metadata_list
+    assert by_ast.cacheable and by_import.cacheable
+
+
+def test_suites_that_need_import_are_not_parsed(tmp_path):
+    tests_folder = write_tests(str(tmp_path / "tests"), {
+        "qa_dynamic/pkg/suite_imported.py": "from qa_dynamic.lib.base import SuiteBase\n",
+        "qa_dynamic/pkg/suite_base_elsewhere.py": "from qa_dynamic.lib import base\n\n\nclass SuiteChild(base.CommonTests):\n    pass\n",
+        "qa_dynamic/pkg/suite_assigned.py": "SuiteAlias = type('SuiteAlias', (), {})\n",
+    })
+
+    for filename in ("suite_imported.py", "suite_base_elsewhere.py", "suite_assigned.py"):
+        assert read_file_metadata_by_ast(os.path.join(tests_folder, "qa_dynamic", "pkg", filename)) is None, filename
+
+
+# test_shared is on CommonBase and CommonRight, python takes the one on CommonRight (C3), a depth-first walk doesn't
+SUITE_DIAMOND = '''
+    class CommonBase:
+        def test_shared(self, sd, rm, ncycles=1, param=None):
+            """
+            @PRIO 1
+            """
+
+
+    class CommonLeft(CommonBase):
+        def test_left(self, sd, rm, ncycles=1, param=None):
+            """
+            @PRIO 2
+            """
+
+
+    class CommonRight(CommonBase):
+        """
+        @TAG RIGHT
+        """
+
+        def test_shared(self, sd, rm, ncycles=2, param=None):
+            """
+            @PRIO 3
+            """
+
+
+    class SuiteDiamond(CommonLeft, CommonRight):
+        pass
+'''
+
+
+def test_multiple_inheritance_in_method_resolution_order(tmp_path):
+    tests_folder = write_tests(str(tmp_path / "tests"), {"qa_diamond/pkg/suite_diamond.py": SUITE_DIAMOND})
+    full_path_filename = os.path.join(tests_folder, "qa_diamond", "pkg", "suite_diamond.py")
+
+    by_ast = read_file_metadata_by_ast(full_path_filename)
+    by_import = read_file_metadata_by_import(full_path_filename, tests_folder)
+
+    assert by_ast.suite_metadata_list == by_import.suite_metadata_list
+    shared, = [mm for mm in by_ast.suite_metadata_list[0].method_metadata_list if mm.method_name == "test_shared"]
+    assert shared.ncycles == 2
+
+
+def test_inconsistent_method_resolution_order_is_not_parsed(tmp_path):
+    tests_folder = write_tests(str(tmp_path / "tests"), {
+        "qa_mro/pkg/suite_mro.py": "class CommonA:\n    pass\n\n\nclass CommonB(CommonA):\n    pass\n\n\nclass SuiteMro(CommonA, CommonB):\n    pass\n",
+    })
+
+    assert read_file_metadata_by_ast(os.path.join(tests_folder, "qa_mro", "pkg", "suite_mro.py")) is None
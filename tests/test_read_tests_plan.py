@@ -0,0 +1,49 @@
+import os
+
+from testipy.models import attr
+from testipy.engine.read_tests_plan import save_plan, load_plan
+
+
+def _make_plan(tests_folder: str):
+    package_attr = attr.PackageAttr("qa.pkg", ncycles=2)
+    suite_attr = attr.SuiteAttr(package_attr, "suite_a.py", "SuiteA", ncycles=3, suite_kwargs={"url": "http://localhost"},
+                                full_path_filename=os.path.join(tests_folder, "qa", "pkg", "suite_a.py"),
+                                name="Suite A", comment="the suite", prio=5, level=2, features="F1 F2", test_number="T1",
+                                tags={"REST", "SMOKE"}, parallel=4, timeout=30.0, fixtures=["db", "token"])
+    attr.TestMethodAttr(suite_attr, "test_login", ncycles=2, param=("user", 1), name="login", comment="logs in", prio=10,
+                        level=3, features="F1", test_number="T2", tags={"LOGIN"}, timeout=1.5)
+    attr.TestMethodAttr(suite_attr, "test_logout", param={"a": {1, 2}}, prio=20, depends={10}, on_success={10}, on_failure={15})
+    return [package_attr]
+
+
+def test_plan_round_trip(tmp_path):
+    tests_folder = str(tmp_path / "tests")
+    package_attr_list = _make_plan(tests_folder)
+    plan_filename = str(tmp_path / "plan" / "plan.json")
+
+    save_plan(plan_filename, package_attr_list, tests_folder)
+    loaded = load_plan(plan_filename, tests_folder)
+
+    # saved again, the loaded plan gives the same file
+    saved_again_filename = str(tmp_path / "plan" / "saved_again.json")
+    save_plan(saved_again_filename, loaded, tests_folder)
+    with open(plan_filename) as f, open(saved_again_filename) as f_again:
+        assert f_again.read() == f.read()
+
+    assert len(loaded[0].suite_attr_list) == 1
+    loaded_methods = loaded[0].suite_attr_list[0].test_method_attr_list
+    assert [ma.method_name for ma in loaded_methods] == ["test_login", "test_logout"]
+    assert loaded_methods[0].param == ("user", 1)
+    assert loaded_methods[1].param == {"a": {1, 2}}
+    assert loaded_methods[1].depends == {10}
+
+
+# a plan saved on one folder runs the tests of another one (ex: other machine)
+def test_plan_loaded_on_other_tests_folder(tmp_path):
+    package_attr_list = _make_plan(str(tmp_path / "tests"))
+    plan_filename = str(tmp_path / "plan.json")
+
+    save_plan(plan_filename, package_attr_list, str(tmp_path / "tests"))
+    loaded = load_plan(plan_filename, str(tmp_path / "other"))
+
+    assert loaded[0].suite_attr_list[0].full_path_filename == os.path.join(str(tmp_path / "other"), "qa", "pkg", "suite_a.py")
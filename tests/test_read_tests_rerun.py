@@ -0,0 +1,79 @@
+import os
+import glob
+import shutil
+
+from conftest import write_tests, get_totals
+
+
+# each test method writes its name when called, on the package folder
+SUITE_ORDERS = """
+    import os
+
+
+    def log(sd, name):
+        with open(os.path.join(sd.get_package_folder(), "called.txt"), "a") as f:
+            f.write(name + "\\n")
+
+
+    class SuiteOrders:
+
+        def test_setup(self, sd, rm, ncycles=1, param=None):
+            \"\"\"
+            @PRIO 1
+            @TAG SETUP
+            \"\"\"
+            log(sd, "setup")
+            rm.testPassed(rm.startTest(sd), "ok")
+
+        def test_login(self, sd, rm, ncycles=1, param=None):
+            \"\"\"
+            @PRIO 2
+            \"\"\"
+            log(sd, "login")
+            rm.testPassed(rm.startTest(sd), "ok")
+
+        def test_order(self, sd, rm, ncycles=1, param=None):
+            \"\"\"
+            @PRIO 3
+            @DEPENDS 2
+            \"\"\"
+            log(sd, "order")
+            rm.testFailed(rm.startTest(sd), "failed")
+
+        def test_cancel(self, sd, rm, ncycles=1, param=None):
+            \"\"\"
+            @PRIO 4
+            \"\"\"
+            log(sd, "cancel")
+            rm.testPassed(rm.startTest(sd), "ok")
+"""
+
+SUITE_USERS = """
+    class SuiteUsers:
+
+        def test_users(self, sd, rm, ncycles=1, param=None):
+            rm.testPassed(rm.startTest(sd), "ok")
+"""
+
+
+def test_rerun_failed_with_dependencies_and_setup(tmp_path, run_testipy):
+    tests_folder = write_tests(str(tmp_path / "tests"), {
+        "qa/orders/suite_orders.py": SUITE_ORDERS,
+        "qa/users/suite_users.py": SUITE_USERS,
+    })
+    called_filename = os.path.join(tests_folder, "qa", "orders", "called.txt")
+
+    result = run_testipy(tests_folder, timeout=60)
+    assert get_totals(result.stdout) == dict(FAIL=1, FAIL_BUG=0, SKIP=0, PASS=4, Total=5), result.stdout + result.stderr
+
+    # the results folder of the first run is moved, not to be mistaken with the one of the rerun
+    results_tests_filenames = glob.glob(str(tmp_path / "results" / "**" / "results_tests.json"), recursive=True)
+    assert len(results_tests_filenames) == 1
+    previous_results_folder = shutil.move(os.path.dirname(results_tests_filenames[0]), str(tmp_path / "previous"))
+    os.remove(called_filename)
+
+    result = run_testipy(tests_folder, "-rerun-failed", previous_results_folder, timeout=60)
+
+    assert get_totals(result.stdout) == dict(FAIL=1, FAIL_BUG=0, SKIP=0, PASS=2, Total=3), result.stdout + result.stderr
+    with open(called_filename) as f:
+        assert f.read().splitlines() == ["setup", "login", "order"]
@@ -0,0 +1,83 @@
+import re
+
+import pytest
+
+from testipy.configs import enums_data
+from testipy.engine.read_tests_selection import TagBits, TestSelection as Selection, compile_select_expression
+
+
+def _doc(name: str = "", tags=(), features: str = "", level: int = 1):
+    return {enums_data.TAG_NAME: name, enums_data.TAG_TAG: list(tags), enums_data.TAG_FEATURES: features,
+            enums_data.TAG_TESTNUMBER: "", enums_data.TAG_LEVEL: level, enums_data.TAG_PRIO: 0}
+
+
+def test_only_selection_tags_are_interned():
+    selection = Selection(include_test_tag=["smoke&api"], exclude_test_tag=["slow"], select_expression="db | !flaky")
+    interned = len(selection.tag_bits)
+
+    for i in range(1000):
+        selection.is_valid_test_method(f"test_{i}", _doc(f"Name {i}", tags=[f"tag_{i}", "smoke", "api"], features=f"feature_{i}"))
+
+    assert len(selection.tag_bits) == interned == 5
+
+
+def test_unknown_tags_are_not_selected():
+    selection = Selection(include_test_tag=["smoke&api"], exclude_test_tag=["slow"])
+
+    assert selection.is_valid_test_method("test_a", _doc(tags=["smoke", "api", "other"]))
+    assert not selection.is_valid_test_method("test_b", _doc(tags=["smoke", "other"]))
+    assert not selection.is_valid_test_method("test_c", _doc(tags=["smoke", "api", "slow"]))
+    assert not selection.is_valid_test_method("test_d", _doc(tags=["unknown"]))
+
+
+# returns bool, if the -select expression matches the tags given
+def _select(expression: str, tags) -> bool:
+    tag_bits = TagBits()
+    node = compile_select_expression(expression, tag_bits)
+    return node.evaluate(tag_bits.get_mask(tags))
+
+
+@pytest.mark.parametrize("expression, tags, expected", [
+    ("smoke", ["smoke"], True),
+    ("smoke", ["api"], False),
+    ("smoke & api", ["smoke", "api"], True),
+    ("smoke & api", ["smoke"], False),
+    ("smoke | api", ["api"], True),
+    ("!slow", [], True),
+    ("!slow", ["slow"], False),
+    ("!!slow", ["slow"], True),
+    # & before |
+    ("smoke | api & db", ["smoke"], True),
+    ("smoke | api & db", ["api"], False),
+    ("(smoke | api) & db", ["smoke"], False),
+    ("(smoke | api) & db", ["api", "db"], True),
+    ("smoke & !(slow | flaky)", ["smoke", "flaky"], False),
+    ("smoke & !(slow | flaky)", ["smoke", "other"], True),
+    ("a&b&c&!d", ["a", "b", "c"], True),
+    ("a&b&c&!d", ["a", "b", "c", "d"], False),
+])
+def test_select_expression(expression, tags, expected):
+    assert _select(expression, tags) is expected
+
+
+@pytest.mark.parametrize("expression, error", [
+    ("", "empty expression"),
+    ("   ", "empty expression"),
+    ("smoke &", "missing tag at column 8"),
+    ("(smoke | api", "missing ')' at column 13"),
+    ("smoke api", "unexpected 'api' at column 7"),
+    ("smoke | & api", "unexpected '&' at column 9"),
+    ("smoke)", "unexpected ')' at column 6"),
+])
+def test_select_expression_errors(expression, error):
+    with pytest.raises(ValueError, match=re.escape(error)):
+        compile_select_expression(expression, TagBits())
+
+
+def test_select_with_suite_tags():
+    selection = Selection(select_expression="REST & !slow")
+    suite_mask = selection.get_suite_mask("SuiteApi", _doc(tags=["REST"]))
+
+    assert selection.is_valid_test_method("test_a", _doc(), suite_mask)
+    assert not selection.is_valid_test_method("test_b", _doc(tags=["slow"]), suite_mask)
+    assert not selection.is_valid_test_method("test_c", _doc())
@@ -0,0 +1,65 @@
+import pytest
+
+from testipy.models import attr
+from testipy.engine.suite_history import SuiteHistory, get_suite_key
+from testipy.engine.read_tests_shard import parse_shard, get_shards, select_shard
+
+
+# returns list of PackageAttr, with one package and a suite for each (suite name, test methods)
+def _make_selected_tests(suites):
+    package_attr = attr.PackageAttr("qa.pkg")
+    for suite_name, total_methods in suites:
+        suite_attr = attr.SuiteAttr(package_attr, f"{suite_name.lower()}.py", suite_name)
+        for i in range(total_methods):
+            attr.TestMethodAttr(suite_attr, f"test_{i}")
+    return [package_attr]
+
+
+def _make_history(tmp_path, selected_tests, durations) -> SuiteHistory:
+    history = SuiteHistory(str(tmp_path / "suite_durations.json"))
+    history.update({get_suite_key(suite_attr): durations[suite_attr.suite_name]
+                    for suite_attr in selected_tests[0].suite_attr_list if suite_attr.suite_name in durations})
+    return history
+
+
+@pytest.mark.parametrize("shard, expected", [("1/1", (1, 1)), ("2/4", (2, 4)), ("4/4", (4, 4))])
+def test_parse_shard(shard, expected):
+    assert parse_shard(shard) == expected
+
+
+@pytest.mark.parametrize("shard", ["0/4", "5/4", "2", "a/b", "1/2/3"])
+def test_parse_invalid_shard(shard):
+    with pytest.raises(ValueError, match="Invalid shard"):
+        parse_shard(shard)
+
+
+def test_longest_suites_first_to_the_shortest_shard(tmp_path):
+    durations = dict(SuiteA=5.0, SuiteB=4.0, SuiteC=3.0, SuiteD=3.0, SuiteE=2.0, SuiteF=1.0)
+    selected_tests = _make_selected_tests([(suite_name, 1) for suite_name in durations])
+
+    shards = get_shards(selected_tests, 2, _make_history(tmp_path, selected_tests, durations))
+
+    assert [[ss.suite_attr.suite_name for ss in shard] for shard in shards] == [["SuiteA", "SuiteD", "SuiteF"], ["SuiteB", "SuiteC", "SuiteE"]]
+    assert [sum(ss.expected_duration for ss in shard) for shard in shards] == [9.0, 9.0]
+
+
+# suites that never ran are expected to take as long as a test of the recorded suites, for each of their tests
+def test_suites_without_history_by_their_tests(tmp_path):
+    selected_tests = _make_selected_tests([("SuiteA", 2), ("SuiteNew", 3)])
+
+    shards = get_shards(selected_tests, 2, _make_history(tmp_path, selected_tests, dict(SuiteA=4.0)))
+
+    expected = {ss.suite_attr.suite_name: (ss.expected_duration, ss.from_history) for shard in shards for ss in shard}
+    assert expected == dict(SuiteA=(4.0, True), SuiteNew=(6.0, False))
+
+
+def test_all_shards_have_all_suites_once(tmp_path):
+    suites = [(f"Suite{i}", i % 4 + 1) for i in range(20)]
+    history = _make_history(tmp_path, _make_selected_tests(suites), {f"Suite{i}": float(i % 7 + 1) for i in range(0, 20, 2)})
+
+    selected = []
+    for shard_index in range(1, 4):
+        for package_attr in select_shard(_make_selected_tests(suites), shard_index, 3, history):
+            selected += [suite_attr.suite_name for suite_attr in package_attr.suite_attr_list]
+
+    assert sorted(selected) == sorted(suite_name for suite_name, _ in suites)
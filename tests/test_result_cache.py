@@ -0,0 +1,129 @@
+import os
+import sys
+import subprocess
+import importlib.util
+
+from conftest import REPO_FOLDER, write_tests
+from testipy.models import attr
+from testipy.engine.result_cache import ResultCache
+from testipy.engine.suite_history import get_method_key
+
+
+SUITE_CACHED = """
+    from testipy.helpers import load_config
+
+
+    class SuiteCached:
+
+        def test_login(self, sd, rm, ncycles=1, param=None):
+            if param in {"admin", "user", "guest", "root", "nobody"}:
+                load_config("users.yaml")
+
+        def test_setup(self, sd, rm, ncycles=1, param=None):
+            \"\"\"
+            @TAG SETUP
+            \"\"\"
+"""
+
+# prints the fingerprint of test_login, on its own process (to have its own PYTHONHASHSEED)
+FINGERPRINT_SCRIPT = """
+import sys
+sys.path.insert(0, sys.argv[2])
+from test_result_cache import get_test_method_attr
+from testipy.engine.result_cache import ResultCache
+print(ResultCache(sys.argv[3], "dev").get_fingerprint(get_test_method_attr(sys.argv[1], "test_login")))
+"""
+
+
+# returns TestMethodAttr, of the suite file imported on its own (the tests folder is not on sys.path)
+def get_test_method_attr(full_path_filename: str, method_name: str, param=None, tags=()) -> attr.TestMethodAttr:
+    spec = importlib.util.spec_from_file_location(f"suite_cached_{abs(hash(full_path_filename))}", full_path_filename)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    package_attr = attr.PackageAttr("qa.pkg")
+    suite_attr = attr.SuiteAttr(package_attr, "suite_cached.py", "SuiteCached", suite_obj=module.SuiteCached,
+                                full_path_filename=full_path_filename)
+    return attr.TestMethodAttr(suite_attr, method_name, param=param, tags=set(tags))
+
+
+def _write_suite(tmp_path, suite_source: str = SUITE_CACHED, users: str = "admin: 1\n") -> str:
+    tests_folder = write_tests(str(tmp_path / "tests"), {"qa/pkg/suite_cached.py": suite_source, "qa/pkg/users.yaml": users})
+    return os.path.join(tests_folder, "qa", "pkg", "suite_cached.py")
+
+
+# returns str, with the fingerprint of the test method on a new result cache (not to reuse the file hashes read)
+def _fingerprint(tmp_path, full_path_filename: str, method_name: str = "test_login", param=None, environment_name: str = "dev") -> str:
+    result_cache = ResultCache(str(tmp_path / "cache" / "results.json"), environment_name)
+    return result_cache.get_fingerprint(get_test_method_attr(full_path_filename, method_name, param))
+
+
+def test_fingerprint_same_on_rerun(tmp_path):
+    full_path_filename = _write_suite(tmp_path)
+    fingerprint = _fingerprint(tmp_path, full_path_filename)
+
+    assert fingerprint
+    assert _fingerprint(tmp_path, full_path_filename) == fingerprint
+
+
+# the set literal of test_login is a frozenset constant, that has another order with each PYTHONHASHSEED
+def test_fingerprint_same_with_any_hash_seed(tmp_path):
+    full_path_filename = _write_suite(tmp_path)
+
+    fingerprints = set()
+    for hash_seed in ("1", "2", "3"):
+        env = dict(os.environ, PYTHONHASHSEED=hash_seed, PYTHONPATH=REPO_FOLDER)
+        result = subprocess.run([sys.executable, "-c", FINGERPRINT_SCRIPT, full_path_filename, os.path.dirname(__file__), str(tmp_path / "results.json")],
+                                env=env, capture_output=True, text=True, timeout=60)
+        assert result.returncode == 0, result.stderr
+        fingerprints.add(result.stdout.strip())
+
+    assert len(fingerprints) == 1 and "" not in fingerprints
+
+
+def test_fingerprint_changes(tmp_path):
+    full_path_filename = _write_suite(tmp_path)
+    fingerprint = _fingerprint(tmp_path, full_path_filename)
+
+    assert _fingerprint(tmp_path, full_path_filename, param="admin") != fingerprint
+    assert _fingerprint(tmp_path, full_path_filename, environment_name="qa") != fingerprint
+
+    _write_suite(tmp_path, users="admin: 2\n")
+    data_changed = _fingerprint(tmp_path, full_path_filename)
+    assert data_changed != fingerprint
+
+    _write_suite(tmp_path, SUITE_CACHED + "\n    # a comment\n", users="admin: 2\n")
+    assert _fingerprint(tmp_path, full_path_filename) not in (fingerprint, data_changed)
+
+
+def test_passed_on_one_cycle_and_failed_on_other_is_not_cached(tmp_path):
+    full_path_filename = _write_suite(tmp_path)
+    cache_filename = str(tmp_path / "cache" / "results.json")
+    test_method_attr = get_test_method_attr(full_path_filename, "test_login")
+
+    result_cache = ResultCache(cache_filename, "dev")
+    result_cache.add_result(test_method_attr, True)
+    result_cache.save()
+    assert ResultCache(cache_filename, "dev").get_passed(test_method_attr)
+
+    result_cache = ResultCache(cache_filename, "dev")
+    result_cache.add_result(test_method_attr, True)
+    result_cache.add_changes({get_method_key(test_method_attr): None})
+    result_cache.add_result(test_method_attr, True)
+    assert result_cache.changes == {get_method_key(test_method_attr): None}
+    result_cache.save()
+
+    assert not ResultCache(cache_filename, "dev").get_passed(test_method_attr)
+
+
+def test_never_cached_tags(tmp_path):
+    full_path_filename = _write_suite(tmp_path)
+    cache_filename = str(tmp_path / "cache" / "results.json")
+    test_method_attr = get_test_method_attr(full_path_filename, "test_setup", tags=["SETUP"])
+
+    result_cache = ResultCache(cache_filename, "dev")
+    result_cache.add_result(test_method_attr, True)
+    result_cache.save()
+
+    assert ResultCache(cache_filename, "dev")._entries
+    assert not ResultCache(cache_filename, "dev").get_passed(test_method_attr)
@@ -0,0 +1,79 @@
+import os
+import glob
+
+from conftest import write_tests, get_totals
+from testipy.engine.run_journal import ResumedRun, get_journal_filename
+
+
+# test_first ends, then the run is killed on test_second (only the first time), after the journal was synced
+SUITE_KILLED_ONCE = """
+    import os
+    import time
+
+
+    class SuiteKilledOnce:
+
+        def test_first(self, sd, rm, ncycles=1, param=None):
+            \"\"\"
+            @PRIO 1
+            \"\"\"
+            with open(os.path.join(sd.get_package_folder(), "calls.txt"), "a") as f:
+                f.write("first\\n")
+            current_test = rm.startTest(sd)
+            rm.test_info(current_test, "some info")
+            rm.testPassed(current_test, "first ok")
+
+        def test_second(self, sd, rm, ncycles=1, param=None):
+            \"\"\"
+            @PRIO 2
+            \"\"\"
+            marker = os.path.join(sd.get_package_folder(), "killed.txt")
+            if not os.path.exists(marker):
+                open(marker, "w").close()
+                time.sleep(1.5)
+                os._exit(9)
+            current_test = rm.startTest(sd)
+            rm.testPassed(current_test, "second ok")
+"""
+
+
+def test_resume_continues_a_killed_run(tmp_path, run_testipy):
+    tests_folder = write_tests(str(tmp_path / "tests"), {"qa/pkg/suite_killed_once.py": SUITE_KILLED_ONCE})
+
+    killed = run_testipy(tests_folder, "--journal", timeout=60)
+    assert killed.returncode == 9, killed.stdout + killed.stderr
+    results_folder, = glob.glob(str(tmp_path / "results" / "*" / "*"))
+
+    resumed_run = ResumedRun(results_folder)
+    assert len(resumed_run) == 1
+    assert os.path.isfile(get_journal_filename(results_folder))
+
+    resumed = run_testipy(tests_folder, "-resume", results_folder, timeout=60)
+
+    assert get_totals(resumed.stdout) == dict(FAIL=0, FAIL_BUG=0, SKIP=0, PASS=2, Total=2), resumed.stdout + resumed.stderr
+    with open(os.path.join(tests_folder, "qa", "pkg", "calls.txt")) as f:
+        assert f.read().splitlines() == ["first"]
+
+
+def test_journal_cut_by_a_crash_is_read_until_the_cut(tmp_path, run_testipy):
+    tests_folder = write_tests(str(tmp_path / "tests"), {"qa/pkg/suite_killed_once.py": SUITE_KILLED_ONCE})
+    run_testipy(tests_folder, "--journal", timeout=60)
+    results_folder, = glob.glob(str(tmp_path / "results" / "*" / "*"))
+
+    # half of a record, as written by a process killed while writing it
+    with open(get_journal_filename(results_folder), "ab") as f:
+        f.write(b"\x00\x00\x10\x00partial")
+
+    assert len(ResumedRun(results_folder)) == 1
+
+
+def test_no_journal_by_default(tmp_path, run_testipy):
+    tests_folder = write_tests(str(tmp_path / "tests"), {"qa/pkg/suite_killed_once.py": SUITE_KILLED_ONCE})
+    run_testipy(tests_folder, timeout=60)
+    results_folder, = glob.glob(str(tmp_path / "results" / "*" / "*"))
+
+    assert not os.path.exists(get_journal_filename(results_folder))
+
+    resumed = run_testipy(tests_folder, "-resume", results_folder, timeout=60)
+    assert resumed.returncode != 0
+    assert "only a run started with --journal can be resumed" in resumed.stdout + resumed.stderr
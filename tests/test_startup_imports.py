@@ -0,0 +1,28 @@
+import os
+import sys
+import json
+import subprocess
+
+from conftest import REPO_FOLDER
+
+
+# heavy dependencies, only imported by the reporters when they are used
+LAZY_MODULES = ("pandas", "playwright", "mss", "tabulate", "http.server")
+
+IMPORT_SCRIPT = """
+import sys
+import json
+import testipy.run
+print(json.dumps(sorted(sys.modules)))
+"""
+
+
+def test_import_run_without_heavy_dependencies(tmp_path):
+    env = dict(os.environ, HOME=str(tmp_path / "home"), PYTHONPATH=REPO_FOLDER)
+    result = subprocess.run([sys.executable, "-c", IMPORT_SCRIPT], env=env, cwd=str(tmp_path),
+                            capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr
+
+    modules = set(json.loads(result.stdout.splitlines()[-1]))
+    assert "testipy.run" in modules
+    assert [module_name for module_name in LAZY_MODULES if module_name in modules] == []
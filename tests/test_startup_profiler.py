@@ -0,0 +1,51 @@
+import time
+import threading
+
+from testipy.lib_modules.startup_profiler import StartupProfiler
+
+
+# imports measured on several threads at the same time are nested only with the ones of their own thread
+def test_imports_nested_by_thread():
+    profiler = StartupProfiler()
+    profiler.start()
+    both_started = threading.Barrier(2)
+
+    def _load(name: str):
+        with profiler.measure_import(name):
+            both_started.wait()
+            with profiler.measure_import(f"{name}.child"):
+                time.sleep(0.05)
+
+    try:
+        threads = [threading.Thread(target=_load, args=(name,)) for name in ("suite_a", "suite_b")]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        profiler.stop()
+
+    imports = {imp.module_name: imp for imp in profiler._imports}
+    for name in ("suite_a", "suite_b"):
+        assert imports[name].depth == 0
+        assert imports[f"{name}.child"].depth == 1
+        assert imports[name].self_time < imports[f"{name}.child"].cumulative_time
+
+
+def test_imports_measured_after_startup_until_stop():
+    profiler = StartupProfiler()
+    profiler.start()
+    try:
+        profiler.end_startup()
+        startup_time = profiler.get_total_time()
+        with profiler.measure_import("suite_lazy"):
+            time.sleep(0.01)
+    finally:
+        profiler.stop()
+
+    assert [imp.module_name for imp in profiler._imports] == ["suite_lazy"]
+    assert profiler.get_total_time() == startup_time
+
+    with profiler.measure_import("suite_after_stop"):
+        pass
+    assert len(profiler._imports) == 1
@@ -0,0 +1,33 @@
+import os
+
+from testipy.configs import default_config
+from testipy.engine.suite_history import SuiteHistory, get_suite_history_filename
+
+
+def test_history_on_the_cache_folder_unless_on_the_tests_folder(tmp_path, monkeypatch):
+    monkeypatch.setattr(default_config, "default_cache_folder", str(tmp_path / "cache"))
+    tests_folder = str(tmp_path / "tests")
+
+    filename = get_suite_history_filename(tests_folder)
+    assert os.path.dirname(filename) == str(tmp_path / "cache")
+    assert filename != get_suite_history_filename(str(tmp_path / "other_tests"))
+
+    os.makedirs(tests_folder)
+    open(os.path.join(tests_folder, default_config.suite_history_filename), "w").close()
+    assert get_suite_history_filename(tests_folder) == os.path.join(tests_folder, default_config.suite_history_filename)
+
+    monkeypatch.setattr(default_config, "suite_history_folder", str(tmp_path / "shared"))
+    assert get_suite_history_filename(tests_folder) == os.path.join(str(tmp_path / "shared"), default_config.suite_history_filename)
+
+
+def test_save_replaces_the_file(tmp_path):
+    filename = str(tmp_path / "cache" / "suite_durations.json")
+
+    history = SuiteHistory(filename)
+    history.update({"qa.pkg/suite_a.py/SuiteA": 2.0})
+    history.save()
+    history.update({"qa.pkg/suite_a.py/SuiteA": 4.0})
+    history.save()
+
+    assert os.listdir(os.path.dirname(filename)) == ["suite_durations.json"]
+    assert SuiteHistory(filename).get("qa.pkg/suite_a.py/SuiteA") == 3.0
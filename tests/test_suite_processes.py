@@ -0,0 +1,153 @@
+import sys
+import glob
+import textwrap
+
+import pytest
+
+from conftest import write_tests, get_totals
+from testipy.engine.run_journal import ResumedRun
+
+
+SUITE_FINE = """
+    class SuiteFine:
+
+        def test_fine(self, sd, rm, ncycles=1, param=None):
+            current_test = rm.startTest(sd)
+            rm.testPassed(current_test, "ok")
+"""
+
+SUITE_KILLED = """
+    import os
+    import signal
+
+
+    class SuiteKilled:
+
+        def test_killed(self, sd, rm, ncycles=1, param=None):
+            current_test = rm.startTest(sd)
+            os.kill(os.getpid(), signal.SIGKILL)
+"""
+
+# the signal can land on another thread of the process, so the test waits for it
+SUITE_STOPPED = """
+    import os
+    import time
+    import signal
+
+
+    class SuiteStopped:
+
+        def test_stopped(self, sd, rm, ncycles=1, param=None):
+            \"\"\"
+            @TIMEOUT 0.5
+            \"\"\"
+            current_test = rm.startTest(sd)
+            os.kill(os.getpid(), signal.SIGSTOP)
+            time.sleep(60)
+"""
+
+# keeps allocating memory, until its process is killed
+SUITE_LEAKING = """
+    import time
+
+
+    class SuiteLeaking:
+
+        def test_leaking(self, sd, rm, ncycles=1, param=None):
+            current_test = rm.startTest(sd)
+            leaked = []
+            for _ in range(100):
+                leaked.append(b"x" * (10 * 1024 * 1024))
+                time.sleep(0.02)
+            rm.testPassed(current_test, "not killed")
+"""
+
+SUITES_STOPPED_BY_MAXFAIL = {
+    "qa/pkg/suite_fails.py": '''
+        class SuiteFails:
+            """
+            @PRIO 1
+            """
+
+            def test_fails(self, sd, rm, ncycles=1, param=None):
+                rm.testFailed(rm.startTest(sd), "failed")
+    ''',
+    "qa/pkg/suite_slow.py": '''
+        import time
+
+
+        class SuiteSlow:
+            """
+            @PRIO 2
+            """
+
+            def test_slow(self, sd, rm, ncycles=1, param=None):
+                time.sleep(1)
+                rm.testPassed(rm.startTest(sd), "ok")
+    ''',
+    "qa/pkg/suite_later.py": '''
+        class SuiteLater:
+            """
+            @PRIO 3
+            """
+
+            def test_first(self, sd, rm, ncycles=1, param=None):
+                rm.testPassed(rm.startTest(sd), "ok")
+
+            def test_second(self, sd, rm, ncycles=1, param=None):
+                rm.testPassed(rm.startTest(sd), "ok")
+    ''',
+}
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="needs SIGKILL and SIGSTOP")
+
+
+# returns str, the execution log of the (only) run on the results folder
+def read_exec_log(results_folder) -> str:
+    filenames = glob.glob(f"{results_folder}/*/*/testipy_exe.log")
+    assert len(filenames) == 1, filenames
+    with open(filenames[0]) as f:
+        return f.read()
+
+
+def test_killed_worker_fails_only_its_suite(tmp_path, run_testipy):
+    tests_folder = write_tests(str(tmp_path / "tests"), {"qa/pkg/suite_killed.py": SUITE_KILLED, "qa/pkg/suite_fine.py": SUITE_FINE})
+
+    result = run_testipy(tests_folder, "-sp", "2", timeout=60)
+
+    assert get_totals(result.stdout) == dict(FAIL=1, FAIL_BUG=0, SKIP=0, PASS=1, Total=2), result.stdout + result.stderr
+    assert "Suite Killed process crashed" in read_exec_log(tmp_path / "results")
+
+
+def test_stopped_worker_is_killed_after_its_timeout(tmp_path, run_testipy):
+    tests_folder = write_tests(str(tmp_path / "tests"), {"qa/pkg/suite_stopped.py": SUITE_STOPPED, "qa/pkg/suite_fine.py": SUITE_FINE})
+
+    result = run_testipy(tests_folder, "-sp", "2", timeout=60)
+
+    assert get_totals(result.stdout) == dict(FAIL=1, FAIL_BUG=0, SKIP=0, PASS=1, Total=2), result.stdout + result.stderr
+    assert "Suite Stopped didn't stop after its timeout" in read_exec_log(tmp_path / "results")
+
+
+# the memory is checked while the suite runs, not only after it
+def test_leaking_worker_is_killed_over_max_rss(tmp_path, run_testipy):
+    tests_folder = write_tests(str(tmp_path / "tests"), {"qa/pkg/suite_leaking.py": SUITE_LEAKING, "qa/pkg/suite_fine.py": SUITE_FINE})
+
+    result = run_testipy(tests_folder, "-sp", "2", "-sp-max-rss", "300", timeout=60)
+
+    assert get_totals(result.stdout) == dict(FAIL=1, FAIL_BUG=0, SKIP=0, PASS=1, Total=2), result.stdout + result.stderr
+    assert "over -sp-max-rss 300MB, killing its process" in read_exec_log(tmp_path / "results")
+
+
+# the suite not sent to a worker is skipped, and its test methods are on the progress and the journal as the others
+def test_suites_skipped_by_maxfail_are_on_the_progress_and_journal(tmp_path, run_testipy):
+    tests_folder = write_tests(str(tmp_path / "tests"), {filename: textwrap.dedent(source) for filename, source in SUITES_STOPPED_BY_MAXFAIL.items()})
+
+    result = run_testipy(tests_folder, "-sp", "2", "-maxfail", "1", "--journal", timeout=60)
+
+    # SuiteSlow may be stopped before its test method is called
+    totals = get_totals(result.stdout)
+    assert (totals["FAIL"], totals["SKIP"] + totals["PASS"], totals["Total"]) == (1, 3, 4), result.stdout + result.stderr
+    assert "suite_later.py - second(4) | Not run" in result.stdout
+    assert "100%" in read_exec_log(tmp_path / "results")
+    results_folder, = glob.glob(str(tmp_path / "results" / "*" / "*"))
+    assert len(ResumedRun(results_folder)) == 4
@@ -0,0 +1,87 @@
+import os
+
+from testipy.models import attr
+from testipy.engine.suite_history import get_method_key, get_suite_key
+from testipy.engine.test_impact import ImpactRecorder, load_test_impact, select_affected_tests
+
+
+# returns list of PackageAttr, with one package of three suites (only their attrs, the suites are not imported)
+def _get_selected_tests() -> list:
+    package_attr = attr.PackageAttr("qa.shop")
+
+    suite_cart = attr.SuiteAttr(package_attr, "suite_cart.py", "SuiteCart")
+    attr.TestMethodAttr(suite_cart, "test_setup", prio=1, tags={"SETUP"})
+    attr.TestMethodAttr(suite_cart, "test_add", prio=2)
+    attr.TestMethodAttr(suite_cart, "test_pay", prio=3, depends={2})
+    attr.TestMethodAttr(suite_cart, "test_list", prio=4)
+
+    suite_users = attr.SuiteAttr(package_attr, "suite_users.py", "SuiteUsers")
+    attr.TestMethodAttr(suite_users, "test_login", prio=1)
+    attr.TestMethodAttr(suite_users, "test_new", prio=2)
+
+    suite_stock = attr.SuiteAttr(package_attr, "suite_stock.py", "SuiteStock")
+    attr.TestMethodAttr(suite_stock, "test_stock", prio=1)
+
+    return [package_attr]
+
+
+# returns dict, with the names of the test methods left on each suite
+def _get_method_names(selected_tests) -> dict:
+    return {sa.suite_name: [ma.method_name for ma in sa.test_method_attr_list] for pa in selected_tests for sa in pa.suite_attr_list}
+
+
+def test_select_affected_tests(tmp_path):
+    selected_tests = _get_selected_tests()
+    suite_users = selected_tests[0].suite_attr_list[1]
+    cart, pay, users, helpers, stock = (str(tmp_path / fn) for fn in ("cart.py", "pay.py", "users.py", "helpers.py", "stock.py"))
+
+    methods = {ma.method_name: ma for sa in selected_tests[0].suite_attr_list for ma in sa.test_method_attr_list}
+    footprints = {
+        get_method_key(methods["test_setup"]): {cart},
+        get_method_key(methods["test_add"]): {cart},
+        get_method_key(methods["test_pay"]): {cart, pay},
+        get_method_key(methods["test_list"]): {cart},
+        get_method_key(methods["test_login"]): {users},
+        get_suite_key(suite_users): {helpers},
+        get_method_key(methods["test_stock"]): {stock},
+    }
+
+    selected_tests = select_affected_tests(selected_tests, footprints, {pay, helpers})
+
+    # test_pay changed, with its dependency and SETUP; SuiteUsers changed outside its test methods; test_new has no footprint
+    assert _get_method_names(selected_tests) == {
+        "SuiteCart": ["test_setup", "test_add", "test_pay"],
+        "SuiteUsers": ["test_login", "test_new"],
+    }
+
+
+def test_nothing_changed_only_runs_tests_with_no_footprint(tmp_path):
+    selected_tests = _get_selected_tests()
+    footprints = {get_method_key(ma): {str(tmp_path / "cart.py")}
+                  for sa in selected_tests[0].suite_attr_list for ma in sa.test_method_attr_list if ma.method_name != "test_new"}
+
+    assert _get_method_names(select_affected_tests(selected_tests, footprints, set())) == {"SuiteUsers": ["test_new"]}
+
+
+def test_footprints_saved_relative_to_the_tests_folder(tmp_path):
+    tests_folder = tmp_path / "tests"
+    (tests_folder / "qa" / "shop").mkdir(parents=True)
+    suite_filename = str(tests_folder / "qa" / "shop" / "suite_cart.py")
+    other_filename = str(tmp_path / "lib" / "cart.py")
+
+    recorder = ImpactRecorder(str(tests_folder))
+    recorder.add_footprints({"qa.shop/suite_cart.py/SuiteCart/test_add": {
+        os.path.join("qa", "shop", "suite_cart.py"): {"SuiteCart.test_add"},
+        other_filename: {"add"},
+    }})
+    recorder.save(str(tmp_path / "test_impact.json"))
+
+    # loaded on a tests folder somewhere else, the files under it follow
+    moved_folder = tmp_path / "moved"
+    os.rename(str(tests_folder), str(moved_folder))
+    footprints = load_test_impact(str(tmp_path / "test_impact.json"), str(moved_folder))
+
+    assert footprints == {"qa.shop/suite_cart.py/SuiteCart/test_add": {
+        os.path.realpath(suite_filename.replace(str(tests_folder), str(moved_folder))),
+        os.path.realpath(other_filename),
+    }}
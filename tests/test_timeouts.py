@@ -0,0 +1,108 @@
+import os
+import sys
+import subprocess
+
+from conftest import REPO_FOLDER, write_tests, get_totals
+
+
+SUITE_TIMEOUT = """
+    import time
+
+
+    class SuiteTimeout:
+
+        def test_slow(self, sd, rm, ncycles=1, param=None):
+            \"\"\"
+            @TIMEOUT 0.5
+            \"\"\"
+            current_test = rm.startTest(sd)
+            for _ in range(100):
+                time.sleep(0.05)
+            rm.testPassed(current_test, "late")
+
+        def test_after(self, sd, rm, ncycles=1, param=None):
+            current_test = rm.startTest(sd)
+            rm.testPassed(current_test, "ok")
+"""
+
+
+# each test_race ends just as its timeout fires, so the watchdog and leave() race, the test_next after it must not get
+# the TestTimeoutError (they run one by one, on the same thread)
+SUITE_RACE = """
+    import os
+    import time
+
+
+    class SuiteRace:
+"""
+RACE_METHODS = """
+        def test_race_{i}(self, sd, rm, ncycles=1, param=None):
+            \"\"\"
+            @PRIO {race_prio}
+            @TIMEOUT 0.05
+            \"\"\"
+            time.sleep(0.05)
+
+        def test_next_{i}(self, sd, rm, ncycles=1, param=None):
+            \"\"\"
+            @PRIO {next_prio}
+            \"\"\"
+            current_test = rm.startTest(sd)
+            for _ in range(100000):
+                pass
+            with open(os.path.join(sd.get_package_folder(), "next.txt"), "a") as f:
+                f.write("ok\\n")
+            rm.testPassed(current_test, "ok")
+"""
+
+CLEAR_SCRIPT = """
+import sys
+import threading
+from testipy.lib_modules.watchdog import clear_raised_in_this_thread
+
+sys.settrace(lambda frame, event, arg: None)
+clear_raised_in_this_thread()
+thread = threading.Thread(target=sum, args=(range(1000),))
+thread.start()
+thread.join()
+print("ended")
+"""
+
+
+def test_timeout_ends(tmp_path, run_testipy):
+    tests_folder = write_tests(str(tmp_path / "tests"), {"qa/pkg/suite_timeout.py": SUITE_TIMEOUT})
+
+    result = run_testipy(tests_folder, timeout=60)
+
+    assert get_totals(result.stdout) == dict(FAIL=1, FAIL_BUG=0, SKIP=0, PASS=1, Total=2), result.stdout + result.stderr
+    assert "Timeout after 0.5s" in result.stdout
+
+
+# sys.settrace (--record-impact, coverage, debuggers) must not keep the run from ending after a timeout
+def test_timeout_with_record_impact_ends(tmp_path, run_testipy):
+    tests_folder = write_tests(str(tmp_path / "tests"), {"qa/pkg/suite_timeout.py": SUITE_TIMEOUT})
+
+    result = run_testipy(tests_folder, "--record-impact", timeout=60)
+
+    assert get_totals(result.stdout) == dict(FAIL=1, FAIL_BUG=0, SKIP=0, PASS=1, Total=2), result.stdout + result.stderr
+
+
+def test_timeout_just_as_the_method_returns(tmp_path, run_testipy):
+    suite_race = SUITE_RACE + "".join(RACE_METHODS.format(i=i, race_prio=2 * i, next_prio=2 * i + 1) for i in range(30))
+    tests_folder = write_tests(str(tmp_path / "tests"), {"qa/pkg/suite_race.py": suite_race})
+
+    result = run_testipy(tests_folder, timeout=120)
+
+    totals = get_totals(result.stdout)
+    assert totals["Total"] == 60 and totals["FAIL"] + totals["PASS"] == 60, result.stdout + result.stderr
+    with open(os.path.join(tests_folder, "qa", "pkg", "next.txt")) as f:
+        assert f.read().splitlines() == ["ok"] * 30
+
+
+# with nothing raised, clearing must leave the interpreter as it was (clearing with NULL hangs with sys.settrace)
+def test_clear_with_nothing_raised():
+    env = dict(os.environ, PYTHONPATH=REPO_FOLDER)
+
+    result = subprocess.run([sys.executable, "-c", CLEAR_SCRIPT], env=env, capture_output=True, text=True, timeout=30)
+
+    assert result.stdout.strip() == "ended", result.stderr